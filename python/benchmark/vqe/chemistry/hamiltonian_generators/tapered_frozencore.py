@@ -2,8 +2,8 @@ from pelix.ipopo.decorators import ComponentFactory, Property, Requires, Provide
     Validate, Invalidate, Instantiate
 
 from frozencore import FrozenCoreHamiltonian
+import ast
 import xacc
-from xacc import PauliOperator
 
 @ComponentFactory("taperedfrozencore_hamiltonian_generator_factory")
 @Provides("hamiltonian_generator")
@@ -19,13 +19,19 @@ class TaperedFrozenCoreHamiltonian(FrozenCoreHamiltonian):
             geometry | ('0 1\nNa  0.000000   0.0      0.0\nH   0.0        0.0  1.914388\nsymmetry c1')
             frozen-spin-orbitals | [0, 1, 2, 3, 4, 10, 11, 12, 13, 14]
             active-spin-orbitals | [5, 9, 15, 19]
+
+        Optional input configurations | (example):
+            reference | ([1, 1, 0, 0]) qubit basis state fixing the symmetry sector
     """
 
     def generate(self, inputParams):
         op = super().generate(inputParams)
-        t = xacc.getIRTransformation('qubit-tapering')
-        i = op.toXACCIR()
-        i = t.transform(i)
-        op2 = PauliOperator()
-        op2.fromXACCIR(i)
-        return op2
+        options = {}
+        if 'reference' in inputParams:
+            reference = inputParams['reference']
+            # Read from a config file it is a string, e.g. '[1, 1, 0, 0]'
+            if isinstance(reference, str):
+                reference = ast.literal_eval(reference)
+            options['reference'] = [int(b) for b in reference]
+        t = xacc.getObservableTransform('taper')
+        return t.transform(op, options)
@@ -2,6 +2,112 @@ import xacc
 from pelix.ipopo.decorators import ComponentFactory, Property, Requires, Provides, \
     Validate, Invalidate, Instantiate
 
+# XACC gate name to (QuantumCircuit method, number of parameters)
+qiskit_gates = {'H': ('h', 0), 'X': ('x', 0), 'Y': ('y', 0), 'Z': ('z', 0),
+                'S': ('s', 0), 'Sdg': ('sdg', 0), 'T': ('t', 0), 'Tdg': ('tdg', 0),
+                'Rx': ('rx', 1), 'Ry': ('ry', 1), 'Rz': ('rz', 1), 'U': ('u3', 3),
+                'CNOT': ('cx', 0), 'CY': ('cy', 0), 'CZ': ('cz', 0), 'CH': ('ch', 0),
+                'Swap': ('swap', 0), 'CPhase': ('cu1', 1), 'CRZ': ('crz', 1)}
+
+def to_qiskit(program, n_qubits, name=None):
+    """Build a qiskit QuantumCircuit from a CompositeInstruction (or a
+    list of Instructions). Qubit q is measured to clbit q, so counts come
+    back as n_qubits wide bit strings in XACC's qubit order."""
+    from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
+    if isinstance(program, list):
+        instructions = program
+    else:
+        name = program.name() if name is None else name
+        instructions = []
+        it = xacc.InstructionIterator(program)
+        while it.hasNext():
+            inst = it.next()
+            if not inst.isComposite():
+                instructions.append(inst)
+
+    q = QuantumRegister(n_qubits, 'q')
+    c = ClassicalRegister(n_qubits, 'c')
+    circuit = QuantumCircuit(q, c, name=name)
+    for inst in instructions:
+        if not inst.isEnabled() or inst.name() == 'I':
+            continue
+        bits = [q[b] for b in inst.bits()]
+        if inst.name() == 'Measure':
+            circuit.measure(bits[0], c[inst.bits()[0]])
+            continue
+        if inst.name() not in qiskit_gates:
+            xacc.error('aer: ' + inst.name() + ' is not supported.')
+        gate, n_params = qiskit_gates[inst.name()]
+        params = [inst.getParameter(i) for i in range(n_params)]
+        if any(isinstance(p, str) for p in params):
+            xacc.error('aer: ' + inst.toString() + ' has unevaluated parameters.')
+        getattr(circuit, gate)(*(params + bits))
+    return circuit
+
+class NoiseModelCache:
+    """Device noise models, keyed by backend, a hash of its properties JSON
+    and the readout/thermal/gate flags. Backend properties are kept for
+    expiry seconds, in memory and for the disk cache under ~/.xacc, so
+    repeated initializations skip both the remote fetch and the build."""
+    def __init__(self):
+        self.properties = {}
+        self.models = {}
+
+    def directory(self):
+        import os
+        d = os.path.join(os.path.expanduser('~'), '.xacc', 'aer_noise_models')
+        os.makedirs(d, exist_ok=True)
+        return d
+
+    def backend_properties(self, backend, cache, expiry):
+        import json, os, time
+        now = time.time()
+        path = os.path.join(self.directory(), backend + '_properties.json') if cache == 'disk' else None
+        if cache != 'none' and backend in self.properties and now - self.properties[backend][0] < expiry:
+            fetched, jsonStr = self.properties[backend]
+        elif path is not None and os.path.exists(path):
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            fetched, jsonStr = cached['time'], cached['properties']
+        else:
+            fetched, jsonStr = 0, None
+
+        if now - fetched >= expiry:
+            fetched, jsonStr = now, xacc.getAccelerator('ibm:'+backend).getProperties()['total-json']
+        if cache != 'none':
+            self.properties[backend] = (fetched, jsonStr)
+        if path is not None and (fetched == now or not os.path.exists(path)):
+            with open(path, 'w') as f:
+                json.dump({'time': fetched, 'properties': jsonStr}, f)
+        return jsonStr
+
+    def get(self, backend, ro_error, rel, ge, cache='memory', expiry=86400):
+        import hashlib, json, os
+        from qiskit.providers.models.backendproperties import BackendProperties
+        from qiskit.providers.aer import noise
+        jsonStr = self.backend_properties(backend, cache, expiry)
+        key = '_'.join([backend, hashlib.sha256(jsonStr.encode('utf-8')).hexdigest()[:16],
+                        str(int(ro_error)), str(int(rel)), str(int(ge))])
+        path = os.path.join(self.directory(), key + '.json') if cache == 'disk' else None
+        if cache != 'none' and key in self.models:
+            model = self.models[key]
+        elif path is not None and os.path.exists(path):
+            with open(path, 'r') as f:
+                model = noise.NoiseModel.from_dict(json.load(f))
+        else:
+            properties = BackendProperties.from_dict(json.loads(jsonStr))
+            model = noise.device.basic_device_noise_model(properties, readout_error=ro_error, thermal_relaxation=rel, gate_error=ge)
+
+        if path is not None and not os.path.exists(path):
+            with open(path, 'w') as f:
+                json.dump(model.to_dict(serializable=True), f)
+
+        if cache != 'none':
+            self.models[key] = model
+        return model
+
+noise_model_cache = NoiseModelCache()
+
 @ComponentFactory("aer_accelerator_factory")
 @Provides("accelerator")
 @Property("_accelerator", "accelerator", "aer")
@@ -14,59 +120,49 @@ class AerAccelerator(xacc.Accelerator):
         self.backend = None
         self.noise_model = None
         self.modeled_qpu = None
+        self.sim_type = 'qasm'
 
     def getProperties(self):
         if self.backend is not None:
+            if self.modeled_qpu is None:
+                self.modeled_qpu = xacc.getAccelerator('ibm:'+self.backend)
             return self.modeled_qpu.getProperties()
 
     def initialize(self, options):
-        self.qobj_compiler = xacc.getCompiler('qobj')
         if 'shots' in options:
             self.shots = options['shots']
 
+        # statevector computes exact expectation values, no shots
+        if 'sim-type' in options:
+            if options['sim-type'] not in ['qasm', 'statevector']:
+                xacc.error('Invalid aer sim-type ' + options['sim-type'] + ', valid options are qasm and statevector.')
+            self.sim_type = options['sim-type']
+
         if 'backend' in options:
             self.backend = options['backend']
-            import json
-            from qiskit.providers.models.backendproperties import BackendProperties
-            from qiskit.providers.aer import noise
-            self.modeled_qpu = xacc.getAccelerator('ibm:'+self.backend)
-            props = self.modeled_qpu.getProperties()
-            jsonStr = props['total-json']
-            properties = BackendProperties.from_dict(json.loads(jsonStr))
+            self.modeled_qpu = None
             ro_error = True if 'readout_error' in options and options['readout_error'] else False
             rel = True if 'thermal_relaxation' in options and options['thermal_relaxation'] else False
             ge = True if 'gate_error' in options and options['gate_error'] else False
-            self.noise_model = noise.device.basic_device_noise_model(properties, readout_error=ro_error, thermal_relaxation=rel, gate_error=ge)
+            # memory (the default), disk (also under ~/.xacc) or none
+            cache = options['noise-model-cache'] if 'noise-model-cache' in options else 'memory'
+            if cache not in ['memory', 'disk', 'none']:
+                xacc.error('Invalid aer noise-model-cache ' + cache + ', valid options are memory, disk and none.')
+            expiry = options['noise-model-expiry'] if 'noise-model-expiry' in options else 86400
+            self.noise_model = noise_model_cache.get(self.backend, ro_error, rel, ge, cache, expiry)
 
     def name(self):
         return 'aer'
 
-    def execute_one_qasm(self, buffer, program):
-        qobjStr = self.qobj_compiler.translate(program)
-        import json
-        from qiskit import Aer
-        from qiskit.qobj import (QasmQobj, QobjHeader,
-                         QasmQobjInstruction,
-                         QasmQobjExperiment, QasmQobjExperimentConfig, QobjExperimentHeader, QasmQobjConfig)
-        qobj_json = json.loads(qobjStr)
-
-        # Create the Experiments using qiskit data structures
-        exps = [QasmQobjExperiment(config=QasmQobjExperimentConfig(memory_slots=e['config']['memory_slots'], n_qubits=e['config']['n_qubits']),
-                    header=QobjExperimentHeader(clbit_labels=e['header']['clbit_labels'],creg_sizes=e['header']['creg_sizes'],
-                                                memory_slots=e['header']['memory_slots'],n_qubits=e['header']['n_qubits'],
-                                                name=e['header']['name'], qreg_sizes=e['header']['qreg_sizes'],
-                                                qubit_labels=e['header']['qubit_labels']),
-                    instructions=[QasmQobjInstruction(name=i['name'], qubits=i['qubits'], params=(i['params'] if 'params' in i else [])) if i['name'] != 'measure'
-                                    else QasmQobjInstruction(name=i['name'], qubits=i['qubits'], memory=i['memory']) for i in e['instructions']]) for e in qobj_json['qObject']['experiments']]
-
-        qobj = QasmQobj(qobj_id=qobj_json['qObject']['qobj_id'],
-                        header=QobjHeader(), config=QasmQobjConfig(shots=self.shots, memory_slots=qobj_json['qObject']['config']['memory_slots']), experiments=exps, shots=self.shots)
-
-        measures = {}
-        for i in exps[0].instructions:
-            if i.name == "measure":
-                measures[i.memory[0]] =i.qubits[0]
-
+    def execute_qasm(self, buffers, programs):
+        # Run every program as one experiment of a single job
+        import numpy as np
+        from qiskit import Aer, assemble, transpile
+        circuits = [to_qiskit(p, b.size()) for b, p in zip(buffers, programs)]
+        if self.noise_model is not None:
+            # Device noise is defined on its basis gates
+            circuits = transpile(circuits, basis_gates=self.noise_model.basis_gates, optimization_level=0)
+        qobj = assemble(circuits, shots=self.shots)
         backend = Aer.get_backend('qasm_simulator')
 
         if self.noise_model is not None:
@@ -76,27 +172,118 @@ class AerAccelerator(xacc.Accelerator):
 
         sim_result = job_sim.result()
 
+        # Clbit q holds qubit q, so bit q of the raw hex outcomes
+        # is already qubit q and they can be packed as they are. Results
+        # are looked up by position, programs may share a name.
+        for i, b in enumerate(buffers):
+            counts = sim_result.data(i)['counts']
+            n_words = (b.size() + 63) // 64
+            outcomes = np.array([[(int(k, 16) >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(n_words)]
+                                 for k in counts], dtype=np.uint64).reshape(len(counts), n_words)
+            b.set_counts_arrays(outcomes, np.array(list(counts.values()), dtype=np.int64))
+
+    def split_measured_basis(self, program):
+        # Split off the measurements and the basis change before them,
+        # H (X) or Rx(pi/2) (Y) on a measured qubit, returning the state
+        # preparation and the measured Pauli {qubit: 'X'|'Y'|'Z'}
+        import math
+        instructions = []
+        it = xacc.InstructionIterator(program)
+        while it.hasNext():
+            inst = it.next()
+            if not inst.isComposite():
+                instructions.append(inst)
+        measured = [i.bits()[0] for i in instructions if i.name() == 'Measure']
+        prep = [i for i in instructions if i.name() != 'Measure']
+        pauli = {}
+        while prep:
+            inst = prep[-1]
+            if len(inst.bits()) != 1:
+                break
+            q = inst.bits()[0]
+            if q not in measured or q in pauli:
+                break
+            if inst.name() == 'H':
+                pauli[q] = 'X'
+            elif inst.name() == 'Rx' and not isinstance(inst.getParameter(0), str) and abs(inst.getParameter(0) - math.pi / 2.) < 1e-12:
+                pauli[q] = 'Y'
+            else:
+                break
+            prep.pop()
+        for q in measured:
+            pauli.setdefault(q, 'Z')
+        return prep, pauli
+
+    def pauli_expectation(self, state, pauli):
+        # <state|P|state>, P = i^nY X^x Z^z, with qubit q bit q of the index
+        import numpy as np
+        n = int(np.log2(len(state)))
+        x, z, nY = 0, 0, 0
+        for q, p in pauli.items():
+            if q >= n:
+                # Beyond the simulated qubits, still in |0>
+                if p != 'Z':
+                    return 0.0
+                continue
+            if p in ['X', 'Y']:
+                x |= 1 << q
+            if p in ['Z', 'Y']:
+                z |= 1 << q
+            nY += p == 'Y'
+        idx = np.arange(len(state))
+        masked = (idx ^ x) & z
+        parity = np.zeros(len(state), dtype=np.int64)
+        while masked.any():
+            parity ^= masked & 1
+            masked >>= 1
+        signs = 1 - 2 * parity
+        value = (1j ** nY) * np.vdot(state, signs * state[idx ^ x])
+        return float(np.real(value))
 
-        for b,c in sim_result.get_counts().items():
-            bitstring = b
-            if len(b) < buffer.size():
-                tmp = ['0' for i in range(buffer.size())]
-                for bit_loc, qubit in measures.items():
-                    tmp[len(tmp)-1-qubit] = list(b)[bit_loc]
-                bitstring = ''.join(tmp)
-            buffer.appendMeasurement(bitstring,c)
+    def execute_statevector(self, buffer, programs):
+        # Simulate each distinct state preparation once, then take
+        # every measured Pauli's expectation value from its state
+        import numpy as np
+        from qiskit import Aer, assemble
+        split = [self.split_measured_basis(p) for p in programs]
+        preps = {}
+        for prep, pauli in split:
+            key = tuple(i.toString() for i in prep)
+            if prep and key not in preps:
+                preps[key] = to_qiskit(prep, buffer.size(), 'prep_' + str(len(preps)))
+
+        states = {}
+        if preps:
+            backend = Aer.get_backend('statevector_simulator')
+            result = backend.run(assemble(list(preps.values()))).result()
+            states = {k: result.get_statevector(c) for k, c in preps.items()}
+
+        results = []
+        for prep, pauli in split:
+            key = tuple(i.toString() for i in prep)
+            state = states[key] if prep else np.array([1.])
+            results.append(self.pauli_expectation(state, pauli) if pauli else 1.0)
+        return results
 
     def execute(self, buffer, programs):
+        if not isinstance(programs, list):
+            if self.sim_type == 'statevector':
+                buffer.addExtraInfo('exp-val-z', self.execute_statevector(buffer, [programs])[0])
+            else:
+                self.execute_qasm([buffer], [programs])
+            return
+
+        buffers = []
+        for p in programs:
+            tmpBuffer = xacc.qalloc(buffer.size())
+            tmpBuffer.setName(p.name())
+            buffers.append(tmpBuffer)
 
-        # Translate IR to a Qobj Json String
-        if isinstance(programs, list) and len(programs) > 1:
-            for p in programs:
-                tmpBuffer = xacc.qalloc(buffer.size())
-                tmpBuffer.setName(p.name())
-                self.execute_one_qasm(tmpBuffer, p)
-                buffer.appendChild(p.name(),tmpBuffer)
+        if self.sim_type == 'statevector':
+            for b, e in zip(buffers, self.execute_statevector(buffer, programs)):
+                b.addExtraInfo('exp-val-z', e)
         else:
-            if isinstance(programs, list):
-                programs = programs[0]
-            self.execute_one_qasm(buffer, programs)
+            self.execute_qasm(buffers, programs)
 
+        for p, b in zip(programs, buffers):
+            buffer.appendChild(p.name(), b)
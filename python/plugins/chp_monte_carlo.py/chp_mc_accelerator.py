@@ -2,6 +2,213 @@ import xacc
 from pelix.ipopo.decorators import ComponentFactory, Property, Requires, Provides, \
     Validate, Invalidate, Instantiate
 
+def popcount(words):
+    """Number of set bits in each row of a uint64 array."""
+    import numpy as np
+    return np.unpackbits(words.view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+def random_words(rng, shape):
+    import numpy as np
+    return np.frombuffer(rng.bytes(8 * int(np.prod(shape))), dtype=np.uint64).reshape(shape).copy()
+
+def to_clifford(program):
+    """Flatten a CompositeInstruction into ('h'|'s'|'sdg'|'x'|'y'|'z', q),
+    ('cx'|'cz'|'swap', a, b) and ('m', q) operations. Rotations must
+    be by multiples of pi/2."""
+    import math
+    def quarter_turns(inst):
+        angle = inst.getParameter(0)
+        if isinstance(angle, str):
+            xacc.error('chp-mc: ' + inst.toString() + ' has unevaluated parameters.')
+        k = angle / (math.pi / 2.)
+        if abs(k - round(k)) > 1e-8:
+            xacc.error('chp-mc: ' + inst.toString() + ' is not a Clifford rotation.')
+        return int(round(k)) % 4
+
+    rz = {0: [], 1: ['s'], 2: ['z'], 3: ['sdg']}
+    ops = []
+    it = xacc.InstructionIterator(program)
+    while it.hasNext():
+        inst = it.next()
+        if inst.isComposite() or not inst.isEnabled():
+            continue
+        name, bits = inst.name(), inst.bits()
+        if name in ['H', 'S', 'Sdg', 'X', 'Y', 'Z']:
+            ops.append((name.lower(), bits[0]))
+        elif name == 'I':
+            continue
+        elif name == 'T' or name == 'Tdg':
+            xacc.error('chp-mc: ' + name + ' is not a Clifford gate.')
+        elif name == 'Rz':
+            ops += [(g, bits[0]) for g in rz[quarter_turns(inst)]]
+        elif name == 'Rx':
+            turns = rz[quarter_turns(inst)]
+            if turns:
+                ops += [('h', bits[0])] + [(g, bits[0]) for g in turns] + [('h', bits[0])]
+        elif name == 'Ry':
+            # Ry = S Rx Sdg
+            turns = rz[quarter_turns(inst)]
+            if turns:
+                ops += [('sdg', bits[0]), ('h', bits[0])] + [(g, bits[0]) for g in turns] + \
+                       [('h', bits[0]), ('s', bits[0])]
+        elif name == 'CNOT':
+            ops.append(('cx', bits[0], bits[1]))
+        elif name == 'CZ':
+            ops.append(('cz', bits[0], bits[1]))
+        elif name == 'CY':
+            ops += [('sdg', bits[1]), ('cx', bits[0], bits[1]), ('s', bits[1])]
+        elif name == 'Swap':
+            ops.append(('swap', bits[0], bits[1]))
+        elif name == 'Measure':
+            ops.append(('m', bits[0]))
+        else:
+            xacc.error('chp-mc: ' + name + ' is not supported.')
+    return ops
+
+class Tableau:
+    """Aaronson-Gottesman stabilizer tableau, with the x and z bits of
+    each of the 2n generators (destabilizers then stabilizers, plus a
+    scratch row) packed 64 qubits to a uint64 word."""
+    def __init__(self, n_qubits):
+        import numpy as np
+        self.n = n_qubits
+        words = (n_qubits + 63) // 64
+        self.x = np.zeros((2 * n_qubits + 1, words), dtype=np.uint64)
+        self.z = np.zeros((2 * n_qubits + 1, words), dtype=np.uint64)
+        self.r = np.zeros(2 * n_qubits + 1, dtype=np.uint8)
+        for q in range(n_qubits):
+            w, b = q // 64, np.uint64(1 << (q % 64))
+            self.x[q, w] |= b
+            self.z[n_qubits + q, w] |= b
+
+    def column(self, bits, q):
+        import numpy as np
+        return ((bits[:, q // 64] >> np.uint64(q % 64)) & np.uint64(1)).astype(np.uint8)
+
+    def toggle(self, bits, q, col):
+        import numpy as np
+        bits[:, q // 64] ^= col.astype(np.uint64) << np.uint64(q % 64)
+
+    def h(self, q):
+        xq, zq = self.column(self.x, q), self.column(self.z, q)
+        self.r ^= xq & zq
+        self.toggle(self.x, q, xq ^ zq)
+        self.toggle(self.z, q, xq ^ zq)
+
+    def s(self, q):
+        xq, zq = self.column(self.x, q), self.column(self.z, q)
+        self.r ^= xq & zq
+        self.toggle(self.z, q, xq)
+
+    def sdg(self, q):
+        xq, zq = self.column(self.x, q), self.column(self.z, q)
+        self.r ^= xq & (zq ^ 1)
+        self.toggle(self.z, q, xq)
+
+    def x_(self, q):
+        self.r ^= self.column(self.z, q)
+
+    def y(self, q):
+        self.r ^= self.column(self.x, q) ^ self.column(self.z, q)
+
+    def z_(self, q):
+        self.r ^= self.column(self.x, q)
+
+    def cx(self, a, b):
+        xa, za = self.column(self.x, a), self.column(self.z, a)
+        xb, zb = self.column(self.x, b), self.column(self.z, b)
+        self.r ^= xa & zb & (xb ^ za ^ 1)
+        self.toggle(self.x, b, xa)
+        self.toggle(self.z, a, zb)
+
+    def cz(self, a, b):
+        self.h(b)
+        self.cx(a, b)
+        self.h(b)
+
+    def swap(self, a, b):
+        for bits in [self.x, self.z]:
+            diff = self.column(bits, a) ^ self.column(bits, b)
+            self.toggle(bits, a, diff)
+            self.toggle(bits, b, diff)
+
+    def rowsum(self, rows, i):
+        """Replace generators rows by generator i times them."""
+        import numpy as np
+        x1, z1, x2, z2 = self.x[i], self.z[i], self.x[rows], self.z[rows]
+        y1, xo1, zo1 = x1 & z1, x1 & ~z1, ~x1 & z1
+        plus = (y1 & z2 & ~x2) | (xo1 & z2 & x2) | (zo1 & x2 & ~z2)
+        minus = (y1 & x2 & ~z2) | (xo1 & z2 & ~x2) | (zo1 & x2 & z2)
+        phase = 2 * self.r[rows].astype(np.int64) + 2 * int(self.r[i]) + \
+                popcount(plus) - popcount(minus)
+        self.r[rows] = (np.mod(phase, 4) == 2).astype(np.uint8)
+        self.x[rows] ^= x1
+        self.z[rows] ^= z1
+
+    def measure(self, q):
+        """Measure qubit q, returning (outcome, deterministic). Random
+        outcomes are taken to be 0."""
+        import numpy as np
+        n = self.n
+        xq = self.column(self.x, q)
+        stabilizers = np.nonzero(xq[n:2 * n])[0]
+        if len(stabilizers):
+            p = n + stabilizers[0]
+            rows = np.nonzero(xq[:2 * n])[0]
+            rows = rows[rows != p]
+            if len(rows):
+                self.rowsum(rows, p)
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p] = 0
+            self.z[p] = 0
+            self.z[p, q // 64] = np.uint64(1 << (q % 64))
+            self.r[p] = 0
+            return 0, False
+
+        scratch = 2 * n
+        self.x[scratch] = 0
+        self.z[scratch] = 0
+        self.r[scratch] = 0
+        for i in np.nonzero(xq[:n])[0]:
+            self.rowsum(np.array([scratch]), i + n)
+        return int(self.r[scratch]), True
+
+class PauliFrames:
+    """Pauli frames of many shots, with the x and z bits of each qubit
+    packed 64 shots to a uint64 word, propagated against a reference
+    sample. Every qubit starts, and is left after each measurement, with
+    a random Z frame, which makes the random outcomes random."""
+    def __init__(self, n_qubits, shots, rng):
+        import numpy as np
+        self.rng = rng
+        self.words = (shots + 63) // 64
+        self.x = np.zeros((n_qubits, self.words), dtype=np.uint64)
+        self.z = random_words(rng, (n_qubits, self.words))
+
+    def h(self, q):
+        self.x[q], self.z[q] = self.z[q].copy(), self.x[q].copy()
+
+    def s(self, q):
+        self.z[q] ^= self.x[q]
+
+    def cx(self, a, b):
+        self.x[b] ^= self.x[a]
+        self.z[a] ^= self.z[b]
+
+    def cz(self, a, b):
+        self.z[a] ^= self.x[b]
+        self.z[b] ^= self.x[a]
+
+    def swap(self, a, b):
+        self.x[[a, b]] = self.x[[b, a]]
+        self.z[[a, b]] = self.z[[b, a]]
+
+    def measure(self, q, reference):
+        import numpy as np
+        flips = self.x[q].copy()
+        self.z[q] ^= random_words(self.rng, self.words)
+        return ~flips if reference else flips
+
 @ComponentFactory("chp_mc_accelerator_factory")
 @Provides("accelerator")
 @Property("_accelerator", "accelerator", "chp-mc")
@@ -11,13 +218,98 @@ class CHPMCAccelerator(xacc.Accelerator):
     def __init__(self):
         xacc.Accelerator.__init__(self)
         self.shots = 1024
+        self.p01 = 0.0
+        self.p10 = 0.0
+        self.seed = None
 
     def initialize(self, options):
         if 'shots' in options:
             self.shots = options['shots']
+        # Readout errors, the probabilities of reading 0 for 1 and 1 for 0
+        if 'p01' in options:
+            self.p01 = options['p01']
+        if 'p10' in options:
+            self.p10 = options['p10']
+        if 'seed' in options:
+            self.seed = options['seed']
+
+    def updateConfiguration(self, options):
+        self.initialize(options)
+
+    def configurationKeys(self):
+        return ['shots', 'p01', 'p10', 'seed']
 
     def name(self):
         return 'chp-mc'
 
+    def sample(self, n_qubits, ops, rng):
+        """Sample self.shots runs of ops, returning the measured qubits
+        and a shots x len(qubits) array of their last measured values."""
+        import numpy as np
+
+        # One tableau pass for a reference sample
+        tableau = Tableau(n_qubits)
+        reference = []
+        for op in ops:
+            if op[0] == 'm':
+                reference.append(tableau.measure(op[1])[0])
+            else:
+                getattr(tableau, op[0] + '_' if op[0] in ['x', 'z'] else op[0])(*op[1:])
+
+        # Then propagate the frames of all shots at once, Paulis
+        # only change the sign and so leave the frames alone
+        frames = PauliFrames(n_qubits, self.shots, rng)
+        results = {}
+        m = 0
+        for op in ops:
+            if op[0] == 'm':
+                results[op[1]] = frames.measure(op[1], reference[m])
+                m += 1
+            elif op[0] == 'sdg':
+                frames.s(op[1])
+            elif op[0] not in ['x', 'y', 'z']:
+                getattr(frames, op[0])(*op[1:])
+
+        qubits = sorted(results)
+        if not qubits:
+            return qubits, np.zeros((self.shots, 0), dtype=np.uint8)
+        packed = np.stack([results[q] for q in qubits])
+        bits = np.unpackbits(packed.view(np.uint8).reshape(len(qubits), -1), axis=1,
+                             bitorder='little')[:, :self.shots].T.copy()
+
+        if self.p01 > 0 or self.p10 > 0:
+            u = rng.random(bits.shape)
+            flip = np.where(bits == 1, u < self.p01, u < self.p10)
+            bits ^= flip.astype(np.uint8)
+        return qubits, bits
+
+    def execute_one(self, buffer, program, rng):
+        import numpy as np
+        ops = to_clifford(program)
+        n_qubits = max([buffer.size()] + [max(op[1:]) + 1 for op in ops])
+        qubits, bits = self.sample(n_qubits, ops, rng)
+        if not qubits:
+            return
+
+        # Count the distinct outcomes, then build only their bit strings
+        # with qubit q at position size - 1 - q
+        outcomes, counts = np.unique(bits, axis=0, return_counts=True)
+        for outcome, count in zip(outcomes, counts):
+            bitstring = ['0'] * buffer.size()
+            for q, b in zip(qubits, outcome):
+                if b and q < buffer.size():
+                    bitstring[buffer.size() - 1 - q] = '1'
+            buffer.appendMeasurement(''.join(bitstring), int(count))
+
     def execute(self, buffer, programs):
+        import numpy as np
+        rng = np.random.default_rng(self.seed)
+        if not isinstance(programs, list):
+            self.execute_one(buffer, programs, rng)
+            return
 
+        for p in programs:
+            tmpBuffer = xacc.qalloc(buffer.size())
+            tmpBuffer.setName(p.name())
+            self.execute_one(tmpBuffer, p, rng)
+            buffer.appendChild(p.name(), tmpBuffer)
@@ -22,7 +22,7 @@ class DwaveNealAccelerator(xacc.Accelerator):
     def execute(self, buffer, program):
 
         import neal
-        from collections import Counter
+        import numpy as np
 
         counter = 0
         h = {}
@@ -36,23 +36,21 @@ class DwaveNealAccelerator(xacc.Accelerator):
 
         sampler = neal.SimulatedAnnealingSampler()
         response = sampler.sample_ising(h, J, num_reads=self.shots)
-        energies = [d.energy for d in response.data(['energy'])]
-        counts_list = []
+        record = response.record
+        spins = record.sample
+        n = spins.shape[1]
+
+        # Variable j is character j of the bit string, so it
+        # goes to bit n - 1 - j of the packed outcome
+        outcomes = np.zeros((len(spins), max((n + 63) // 64, 1)), dtype=np.uint64)
+        for j in range(n):
+            b = n - 1 - j
+            outcomes[:, b // 64] |= (spins[:, j] == 1).astype(np.uint64) << np.uint64(b % 64)
+        buffer.set_counts_arrays(outcomes, record.num_occurrences.astype(np.int64), n)
+
         unique_config_to_energy = {}
-        for i, sample in enumerate(response):
-            l = list(sample.values())
-            st = ''
-            for li in l:
-                st += '1' if li == 1 else '0'
-            counts_list.append(st)
-            if not st in unique_config_to_energy:
-                unique_config_to_energy[st] = energies[i]
-
-
-        counts = Counter(counts_list)
-        buffer.setMeasurements(counts)
+        configs, first = np.unique(spins, axis=0, return_index=True)
+        for config, i in zip(configs, first):
+            st = ''.join('1' if s == 1 else '0' for s in config)
+            unique_config_to_energy[st] = record.energy[i]
         buffer.addExtraInfo('unique-configurations', unique_config_to_energy)
-
-
-
-
@@ -0,0 +1,321 @@
+import xacc
+from pelix.ipopo.decorators import ComponentFactory, Property, Requires, Provides, \
+    Validate, Invalidate, Instantiate
+
+def gate_matrix(name, params):
+    """The unitary of a one qubit gate, or of a two qubit gate in the
+    basis |b0 b1> of its bits, b0 the most significant."""
+    import numpy as np
+    theta = params[0] if params else 0.
+    c, s = np.cos(theta / 2.), np.sin(theta / 2.)
+    one = {'H': np.array([[1, 1], [1, -1]]) / np.sqrt(2.),
+           'X': np.array([[0, 1], [1, 0]]),
+           'Y': np.array([[0, -1j], [1j, 0]]),
+           'Z': np.diag([1, -1]),
+           'S': np.diag([1, 1j]),
+           'Sdg': np.diag([1, -1j]),
+           'T': np.diag([1, np.exp(1j * np.pi / 4)]),
+           'Tdg': np.diag([1, np.exp(-1j * np.pi / 4)])}
+    if name in one:
+        return one[name].astype(complex)
+    if name == 'Rx':
+        return np.array([[c, -1j * s], [-1j * s, c]])
+    if name == 'Ry':
+        return np.array([[c, -s], [s, c]], dtype=complex)
+    rz = np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+    if name == 'Rz':
+        return rz
+    if name == 'U':
+        phi, lam = params[1], params[2]
+        return np.array([[c, -np.exp(1j * lam) * s],
+                         [np.exp(1j * phi) * s, np.exp(1j * (phi + lam)) * c]])
+    if name == 'Swap':
+        return np.eye(4, dtype=complex)[[0, 2, 1, 3]]
+
+    # Controlled gates, block diag(I, U)
+    targets = {'CNOT': 'X', 'CY': 'Y', 'CZ': 'Z', 'CH': 'H'}
+    if name in targets:
+        u = one[targets[name]]
+    elif name == 'CRZ':
+        u = rz
+    elif name == 'CPhase':
+        u = np.diag([1, np.exp(1j * theta)])
+    else:
+        xacc.error('mps: ' + name + ' is not supported.')
+    m = np.eye(4, dtype=complex)
+    m[2:, 2:] = u
+    return m
+
+def to_ops(program):
+    """Flatten a CompositeInstruction into (name, bits, params) tuples."""
+    ops = []
+    it = xacc.InstructionIterator(program)
+    while it.hasNext():
+        inst = it.next()
+        if inst.isComposite() or not inst.isEnabled() or inst.name() == 'I':
+            continue
+        params = [inst.getParameter(i) for i in range(inst.nParameters())] \
+            if inst.name() != 'Measure' else []
+        if any(isinstance(p, str) for p in params):
+            xacc.error('mps: ' + inst.toString() + ' has unevaluated parameters.')
+        ops.append((inst.name(), tuple(inst.bits()), tuple(params)))
+    return ops
+
+def split_measured(ops):
+    """Split ops into the state preparation, the trailing one qubit gates
+    on measured qubits (a basis change) and the measured qubits."""
+    measured = []
+    for name, bits, _ in ops:
+        if name == 'Measure':
+            if bits[0] not in measured:
+                measured.append(bits[0])
+        elif any(b in measured for b in bits):
+            xacc.error('mps: qubit ' + str(bits) + ' is acted on after being measured, '
+                       'mid-circuit measurements are not supported.')
+    prep = [op for op in ops if op[0] != 'Measure']
+    tail = []
+    while prep and len(prep[-1][1]) == 1 and prep[-1][1][0] in measured:
+        tail.insert(0, prep.pop())
+    return prep, tail, measured
+
+class MPS:
+    """A matrix product state, one (left bond, 2, right bond) tensor per
+    site, kept in mixed canonical form around site self.center so that
+    truncating an SVD of two neighbouring sites is optimal. Logical
+    qubits are permuted across sites by the SWAPs that bring the qubits
+    of a distant two qubit gate together, site_of maps qubit to site."""
+    def __init__(self, n_qubits, max_bond, cutoff):
+        import numpy as np
+        self.n = n_qubits
+        self.max_bond = max_bond
+        self.cutoff = cutoff
+        self.tensors = [np.array([1., 0.], dtype=complex).reshape(1, 2, 1) for _ in range(n_qubits)]
+        self.site_of = list(range(n_qubits))
+        self.qubit_at = list(range(n_qubits))
+        self.center = 0
+        # Total discarded weight, bounding the infidelity
+        self.truncation_error = 0.0
+
+    def copy(self):
+        import copy
+        return copy.deepcopy(self)
+
+    def bond_dimension(self):
+        return max(t.shape[2] for t in self.tensors)
+
+    def move_center(self, site):
+        import numpy as np
+        A = self.tensors
+        while self.center < site:
+            c = self.center
+            l, _, r = A[c].shape
+            q, R = np.linalg.qr(A[c].reshape(l * 2, r))
+            A[c] = q.reshape(l, 2, q.shape[1])
+            A[c + 1] = np.einsum('kr,rsb->ksb', R, A[c + 1])
+            self.center += 1
+        while self.center > site:
+            c = self.center
+            l, _, r = A[c].shape
+            q, R = np.linalg.qr(A[c].reshape(l, 2 * r).T)
+            A[c] = q.T.reshape(q.shape[1], 2, r)
+            A[c - 1] = np.einsum('asl,lk->ask', A[c - 1], R.T)
+            self.center -= 1
+
+    def apply_1q(self, q, u):
+        # A unitary on the physical index keeps the canonical form
+        import numpy as np
+        s = self.site_of[q]
+        self.tensors[s] = np.einsum('ij,ajb->aib', u, self.tensors[s])
+
+    def apply_sites(self, s, u):
+        """Apply u (2, 2, 2, 2), acting on sites s and s + 1, and split
+        the result back into two sites by a truncated SVD."""
+        import numpy as np
+        self.move_center(s)
+        A = self.tensors
+        l, r = A[s].shape[0], A[s + 1].shape[2]
+        theta = np.einsum('asm,mtb->astb', A[s], A[s + 1])
+        theta = np.einsum('ABst,astb->aABb', u, theta).reshape(l * 2, 2 * r)
+        U, S, Vh = np.linalg.svd(theta, full_matrices=False)
+
+        # Keep the fewest singular values whose discarded weight is
+        # within the cutoff, and no more than max_bond
+        weights = S ** 2 / np.sum(S ** 2)
+        tail = np.cumsum(weights[::-1])[::-1]
+        keep = max(1, int(np.sum(tail > self.cutoff)))
+        keep = min(keep, self.max_bond) if self.max_bond else keep
+        self.truncation_error += float(np.sum(weights[keep:]))
+        S = S[:keep] / np.linalg.norm(S[:keep])
+
+        A[s] = U[:, :keep].reshape(l, 2, keep)
+        A[s + 1] = (S[:, None] * Vh[:keep]).reshape(keep, 2, r)
+        self.center = s + 1
+
+    def apply_2q(self, a, b, u):
+        # SWAP b's site next to a's, the qubits stay where they end up
+        swap = gate_matrix('Swap', []).reshape(2, 2, 2, 2)
+        while abs(self.site_of[a] - self.site_of[b]) > 1:
+            s = self.site_of[b]
+            t = s - 1 if s > self.site_of[a] else s + 1
+            self.apply_sites(min(s, t), swap)
+            qs, qt = self.qubit_at[s], self.qubit_at[t]
+            self.qubit_at[s], self.qubit_at[t] = qt, qs
+            self.site_of[qs], self.site_of[qt] = t, s
+
+        u = u.reshape(2, 2, 2, 2)
+        if self.site_of[a] > self.site_of[b]:
+            u = u.transpose(1, 0, 3, 2)
+        self.apply_sites(min(self.site_of[a], self.site_of[b]), u)
+
+    def apply(self, ops):
+        for name, bits, params in ops:
+            m = gate_matrix(name, list(params))
+            if len(bits) == 1:
+                self.apply_1q(bits[0], m)
+            else:
+                self.apply_2q(bits[0], bits[1], m)
+
+    def expectation(self, pauli):
+        """<P> for P = {qubit: 'X'|'Y'|'Z'}. Sites outside of both the
+        support of P and the canonical center contract to identities."""
+        import numpy as np
+        if not pauli:
+            return 1.0
+        ops = {self.site_of[q]: gate_matrix(p, []) for q, p in pauli.items()}
+        lo = min(min(ops), self.center)
+        hi = max(max(ops), self.center)
+        E = np.eye(self.tensors[lo].shape[0], dtype=complex)
+        for s in range(lo, hi + 1):
+            A = self.tensors[s]
+            OA = np.einsum('st,atb->asb', ops[s], A) if s in ops else A
+            E = np.einsum('ab,asc,bsd->cd', E, A.conj(), OA)
+        return float(np.real(np.trace(E)))
+
+    def sample(self, shots, rng):
+        """Sample every qubit shots times, returning a shots x n array
+        of bits indexed by qubit."""
+        import numpy as np
+        self.move_center(0)
+        # The sites right of the center are right isometries, so the
+        # squared norm of each conditioned left environment is the
+        # probability of the outcomes so far
+        L = np.ones((shots, 1), dtype=complex)
+        bits = np.zeros((shots, self.n), dtype=np.uint8)
+        for s in range(self.n):
+            v = np.einsum('ka,asb->ksb', L, self.tensors[s])
+            p = np.sum(np.abs(v) ** 2, axis=2)
+            p1 = p[:, 1] / np.sum(p, axis=1)
+            b = (rng.random(shots) < p1).astype(np.uint8)
+            bits[:, self.qubit_at[s]] = b
+            L = v[np.arange(shots), b]
+            L /= np.linalg.norm(L, axis=1)[:, None]
+        return bits
+
+@ComponentFactory("mps_accelerator_factory")
+@Provides("accelerator")
+@Property("_accelerator", "accelerator", "mps")
+@Property("_name", "name", "mps")
+@Instantiate("mps_accelerator_instance")
+class MPSAccelerator(xacc.Accelerator):
+    def __init__(self):
+        xacc.Accelerator.__init__(self)
+        self.shots = 1024
+        self.vqe_mode = False
+        self.max_bond = 64
+        self.cutoff = 1e-12
+        self.seed = None
+
+    def initialize(self, options):
+        if 'shots' in options:
+            self.shots = options['shots']
+        # Exact exp-val-z of each circuit, no sampling
+        if 'vqe-mode' in options:
+            self.vqe_mode = options['vqe-mode']
+        # 0 leaves the bond dimension unbounded
+        if 'max-bond-dimension' in options:
+            self.max_bond = options['max-bond-dimension']
+        # Singular values are dropped while their total weight is below this
+        if 'truncation-error' in options:
+            self.cutoff = options['truncation-error']
+        if 'seed' in options:
+            self.seed = options['seed']
+
+    def updateConfiguration(self, options):
+        self.initialize(options)
+
+    def configurationKeys(self):
+        return ['shots', 'vqe-mode', 'max-bond-dimension', 'truncation-error', 'seed']
+
+    def name(self):
+        return 'mps'
+
+    def read_pauli(self, tail, measured):
+        # A basis change of H (X) or Rx(pi/2) (Y), or None if tail is
+        # anything else
+        import math
+        pauli = {q: 'Z' for q in measured}
+        for name, bits, params in tail:
+            if pauli[bits[0]] != 'Z':
+                return None
+            if name == 'H':
+                pauli[bits[0]] = 'X'
+            elif name == 'Rx' and abs(params[0] - math.pi / 2.) < 1e-12:
+                pauli[bits[0]] = 'Y'
+            else:
+                return None
+        return pauli
+
+    def execute_one(self, buffer, program, preps, rng):
+        import numpy as np
+        ops = to_ops(program)
+        prep, tail, measured = split_measured(ops)
+        n_qubits = max([buffer.size()] + [max(op[1]) + 1 for op in ops])
+
+        # Circuits sharing a state preparation, like the measurements
+        # of one observable, simulate it once
+        key = (n_qubits, tuple(prep))
+        if key not in preps:
+            mps = MPS(n_qubits, self.max_bond, self.cutoff)
+            mps.apply(prep)
+            preps[key] = mps
+        mps = preps[key]
+        buffer.addExtraInfo('mps-truncation-error', mps.truncation_error)
+        buffer.addExtraInfo('mps-bond-dimension', mps.bond_dimension())
+
+        if self.vqe_mode:
+            pauli = self.read_pauli(tail, measured)
+            if pauli is None:
+                mps = mps.copy()
+                mps.apply(tail)
+                pauli = {q: 'Z' for q in measured}
+            buffer.addExtraInfo('exp-val-z', mps.expectation(pauli))
+            return
+
+        if not measured:
+            return
+        if tail:
+            mps = mps.copy()
+            mps.apply(tail)
+        bits = mps.sample(self.shots, rng)
+        measured = sorted(measured)
+        outcomes, counts = np.unique(bits[:, measured], axis=0, return_counts=True)
+        for outcome, count in zip(outcomes, counts):
+            bitstring = ['0'] * buffer.size()
+            for q, b in zip(measured, outcome):
+                if b and q < buffer.size():
+                    bitstring[buffer.size() - 1 - q] = '1'
+            buffer.appendMeasurement(''.join(bitstring), int(count))
+
+    def execute(self, buffer, programs):
+        import numpy as np
+        rng = np.random.default_rng(self.seed)
+        preps = {}
+        if not isinstance(programs, list):
+            self.execute_one(buffer, programs, preps, rng)
+            return
+
+        for p in programs:
+            tmpBuffer = xacc.qalloc(buffer.size())
+            tmpBuffer.setName(p.name())
+            self.execute_one(tmpBuffer, p, preps, rng)
+            buffer.appendChild(p.name(), tmpBuffer)
@@ -84,6 +84,95 @@ void bind_accelerator(py::module &m) {
       .def("getMeasurementCounts",
            &xacc::AcceleratorBuffer::getMeasurementCounts,
            "Return the mapping of measure bit strings to their counts.")
+      .def(
+          "getMarginalCounts",
+          [](AcceleratorBuffer &b, const std::vector<int> &bits) {
+            std::map<std::string, int> counts;
+            for (auto &kv : b.getMarginalCounts(bits)) {
+              counts.insert({kv.first.toString(), kv.second});
+            }
+            return counts;
+          },
+          "Return the counts marginalized onto the given bits, bit k of a "
+          "marginal outcome is bits[k].")
+      .def("getExpectationValuesZ",
+           &xacc::AcceleratorBuffer::getExpectationValuesZ,
+           "Return the expectation value of each Z string, given as lists of "
+           "bits, from one pass over the counts.")
+      .def(
+          "getProbabilities",
+          [](AcceleratorBuffer &b) {
+            auto probs = b.getProbabilities();
+            return py::array_t<double>(probs.size(), probs.data());
+          },
+          "Return the dense outcome probability vector, for buffers of at "
+          "most 24 bits.")
+      .def(
+          "counts_arrays",
+          [](AcceleratorBuffer &b) {
+            // One row per outcome holding its packed words, bit q of
+            // a full width outcome is qubit q
+            auto &packed = b.getPackedMeasurementCounts();
+            std::size_t nWords = std::max((b.size() + 63) / 64, 1);
+            for (auto &kv : packed) {
+              nWords = std::max(nWords, kv.first.data().size());
+            }
+
+            std::size_t nOutcomes = packed.size();
+            py::array_t<std::uint64_t> outcomes({nOutcomes, nWords});
+            py::array_t<std::int64_t> counts(nOutcomes);
+            auto os = outcomes.mutable_unchecked<2>();
+            auto cs = counts.mutable_unchecked<1>();
+            std::size_t row = 0;
+            for (auto &kv : packed) {
+              auto &words = kv.first.data();
+              for (std::size_t w = 0; w < nWords; w++) {
+                os(row, w) = w < words.size() ? words[w] : 0;
+              }
+              cs(row) = kv.second;
+              row++;
+            }
+            return py::make_tuple(outcomes, counts);
+          },
+          "Return (outcomes, counts) where outcomes is an (n, nWords) uint64 "
+          "array of packed bit strings and counts an (n,) int64 array.")
+      .def(
+          "set_counts_arrays",
+          [](AcceleratorBuffer &b,
+             py::array_t<std::uint64_t,
+                         py::array::c_style | py::array::forcecast>
+                 outcomes,
+             py::array_t<std::int64_t,
+                         py::array::c_style | py::array::forcecast>
+                 counts,
+             int nBits) {
+            if (outcomes.ndim() < 1 || outcomes.ndim() > 2 ||
+                counts.ndim() != 1 || outcomes.shape(0) != counts.shape(0)) {
+              xacc::error("AcceleratorBuffer.set_counts_arrays: expected "
+                          "outcomes of shape (n,) or (n, nWords) and counts "
+                          "of shape (n,).");
+            }
+            if (nBits < 0) {
+              nBits = b.size();
+            }
+            auto nWords = outcomes.ndim() == 2 ? outcomes.shape(1) : 1;
+            auto os = outcomes.data();
+            auto cs = counts.unchecked<1>();
+
+            // Repeated outcomes are summed
+            PackedCounts packed;
+            std::vector<std::uint64_t> words(nWords);
+            for (py::ssize_t row = 0; row < counts.shape(0); row++) {
+              std::copy(os + row * nWords, os + (row + 1) * nWords,
+                        words.begin());
+              packed[PackedBitString(words, nBits)] += cs(row);
+            }
+            b.setPackedMeasurements(packed);
+          },
+          py::arg("outcomes"), py::arg("counts"), py::arg("n_bits") = -1,
+          "Set the measurement counts from arrays laid out as returned by "
+          "counts_arrays, outcomes may also be a flat uint64 array. Bit "
+          "strings are n_bits wide, the buffer size by default.")
       .def("getChildren",
            (std::vector<std::shared_ptr<AcceleratorBuffer>>(
                xacc::AcceleratorBuffer::*)(const std::string)) &
@@ -116,6 +205,9 @@ void bind_accelerator(py::module &m) {
                xacc::AcceleratorBuffer::getInformation,
            "")
       .def("appendChild", &xacc::AcceleratorBuffer::appendChild, "")
+      .def("clone", &xacc::AcceleratorBuffer::clone,
+           py::arg("with_children") = true,
+           "Return a deep copy of this buffer, optionally without children")
       .def("hasExtraInfoKey", &xacc::AcceleratorBuffer::hasExtraInfoKey, "")
       .def("name", &xacc::AcceleratorBuffer::name, "")
       .def("getAllUnique", &xacc::AcceleratorBuffer::getAllUnique,
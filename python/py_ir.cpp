@@ -63,6 +63,14 @@ void bind_ir(py::module &m) {
       .def("duration", &xacc::Instruction::duration, "")
       .def("start", &xacc::Instruction::start, "");
 
+  py::class_<xacc::BoundCompositeInstruction,
+             std::shared_ptr<xacc::BoundCompositeInstruction>>(
+      m, "BoundCompositeInstruction",
+      "A CompositeInstruction bound for repeated evaluation. The returned "
+      "CompositeInstruction is updated in place by every call to eval.")
+      .def("eval", &xacc::BoundCompositeInstruction::operator(), "")
+      .def("__call__", &xacc::BoundCompositeInstruction::operator(), "");
+
   py::class_<xacc::CompositeInstruction,
              std::shared_ptr<xacc::CompositeInstruction>>(
       m, "CompositeInstruction", "")
@@ -90,7 +98,10 @@ void bind_ir(py::module &m) {
            "")
       .def("getVariables", &xacc::CompositeInstruction::getVariables, "")
       .def("expand", &xacc::CompositeInstruction::expand, "")
-      .def("eval", &xacc::CompositeInstruction::operator(), "")
+      .def("eval", &xacc::CompositeInstruction::evaluateCached,
+           "Evaluate with the given parameters, reusing a cached binding. "
+           "The result may be updated in place by the next call.")
+      .def("bind", &xacc::CompositeInstruction::bind, "")
       .def("name", &xacc::CompositeInstruction::name, "")
       .def("description", &xacc::CompositeInstruction::description, "")
       .def("toString", &xacc::CompositeInstruction::toString, "")
@@ -13,6 +13,7 @@
 #include "py_observable.hpp"
 #include "PauliOperator.hpp"
 #include "FermionOperator.hpp"
+#include "ObservableTransform.hpp"
 #include "xacc_service.hpp"
 #include "py_heterogeneous_map.hpp"
 
@@ -42,7 +43,9 @@ void bind_observable(py::module &m) {
                xacc::Observable::fromString,
            "");
 
-  py::class_<Term>(m, "Term").def("coeff", &Term::coeff).def("ops", &Term::ops);
+  py::class_<Term>(m, "Term")
+      .def("coeff", (std::complex<double> & (Term::*)()) & Term::coeff)
+      .def("ops", &Term::ops);
   py::class_<PauliOperator, xacc::Observable, std::shared_ptr<PauliOperator>>(
       m, "PauliOperator")
       .def(py::init<>())
@@ -79,10 +82,108 @@ void bind_observable(py::module &m) {
       .def("computeActionOnBra", &PauliOperator::computeActionOnBra)
       .def(
           "__iter__",
-          [](PauliOperator &op) {
+          [](const PauliOperator &op) {
             return py::make_iterator(op.begin(), op.end());
           },
-          py::keep_alive<0, 1>());
+          py::keep_alive<0, 1>())
+      .def(
+          "to_arrays",
+          [](const PauliOperator &op) {
+            // One row per term, each row holding the packed X or Z words
+            std::size_t nWords = 0, nTerms = 0;
+            for (auto &kv : op) {
+              if (!kv.second.var().empty()) {
+                xacc::error("PauliOperator.to_arrays does not support "
+                            "variable coefficients (" +
+                            kv.second.var() + ").");
+              }
+              nWords = std::max(nWords, kv.second.mask().x.size());
+              nTerms++;
+            }
+            nWords = std::max(nWords, std::size_t(1));
+
+            py::array_t<std::complex<double>> coeffs(nTerms);
+            py::array_t<std::uint64_t> x({nTerms, nWords}), z({nTerms, nWords});
+            auto c = coeffs.mutable_unchecked<1>();
+            auto xs = x.mutable_unchecked<2>();
+            auto zs = z.mutable_unchecked<2>();
+            std::size_t row = 0;
+            for (auto &kv : op) {
+              auto &mask = kv.second.mask();
+              c(row) = kv.second.coeff();
+              for (std::size_t w = 0; w < nWords; w++) {
+                xs(row, w) = w < mask.x.size() ? mask.x[w] : 0;
+                zs(row, w) = w < mask.z.size() ? mask.z[w] : 0;
+              }
+              row++;
+            }
+            return py::make_tuple(coeffs, x, z);
+          },
+          "Return (coefficients, x, z) where x and z are (nTerms, nWords) "
+          "uint64 arrays, bit q of a row set if the term has an X (Z) "
+          "component on qubit q.")
+      .def_static(
+          "from_arrays",
+          [](py::array_t<std::complex<double>, py::array::c_style |
+                                                   py::array::forcecast>
+                 coeffs,
+             py::array_t<std::uint64_t,
+                         py::array::c_style | py::array::forcecast>
+                 x,
+             py::array_t<std::uint64_t,
+                         py::array::c_style | py::array::forcecast>
+                 z) {
+            if (coeffs.ndim() != 1 || x.ndim() != 2 || z.ndim() != 2 ||
+                x.shape(0) != coeffs.shape(0) ||
+                z.shape(0) != coeffs.shape(0) || x.shape(1) != z.shape(1)) {
+              xacc::error("PauliOperator.from_arrays: expected coefficients "
+                          "of shape (n,) and x, z masks of shape (n, nWords).");
+            }
+            auto c = coeffs.unchecked<1>();
+            auto xs = x.unchecked<2>();
+            auto zs = z.unchecked<2>();
+            auto nWords = x.shape(1);
+
+            PauliOperator op;
+            PauliMask mask;
+            mask.x.resize(nWords);
+            mask.z.resize(nWords);
+            for (py::ssize_t row = 0; row < coeffs.shape(0); row++) {
+              for (py::ssize_t w = 0; w < nWords; w++) {
+                mask.x[w] = xs(row, w);
+                mask.z[w] = zs(row, w);
+              }
+              op += Term(c(row), mask);
+            }
+            return op;
+          },
+          "Build a PauliOperator from the arrays returned by to_arrays.");
+  py::class_<xacc::ObservableTransform,
+             std::shared_ptr<xacc::ObservableTransform>>(
+      m, "ObservableTransform", "")
+      .def("name", &xacc::ObservableTransform::name, "")
+      .def("description", &xacc::ObservableTransform::description, "")
+      .def(
+          "transform",
+          [](xacc::ObservableTransform &t, std::shared_ptr<Observable> obs,
+             const PyHeterogeneousMap &options) {
+            HeterogeneousMap m;
+            for (auto &item : options) {
+              PyHeterogeneousMap2HeterogeneousMap vis(m, item.first);
+              mpark::visit(vis, item.second);
+            }
+            return t.transform(obs, m);
+          },
+          py::arg("obs"), py::arg("options") = PyHeterogeneousMap(), "");
+
+  m.def(
+      "getObservableTransform",
+      [](const std::string &name) {
+        return xacc::getService<xacc::ObservableTransform>(name);
+      },
+      "Return the ObservableTransform with the given name, "
+      "e.g. jw, bk, parity or taper.");
+
   m.def("getObservable",
         [](const std::string &type,
            const std::string representation) -> std::shared_ptr<Observable> {
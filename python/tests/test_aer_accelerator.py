@@ -0,0 +1,33 @@
+import unittest as test
+import xacc
+
+def accelerator(options):
+    # The accelerator is shared, so always set every option tested
+    config = {'shots': 1024, 'sim-type': 'qasm'}
+    config.update(options)
+    return xacc.getAccelerator('aer', config)
+
+def program(name, ops):
+    f = xacc.gate.createComposite(name)
+    for op in ops:
+        f.addInstruction(xacc.gate.create(*op))
+    return f
+
+class TestAerAccelerator(test.TestCase):
+
+    def test_shared_names(self):
+        # Each program gets its own counts, even with the same name
+        qpu = accelerator({'shots': 100})
+        buffer = xacc.qalloc(1)
+        qpu.execute(buffer, [program('f', [('X', [0]), ('Measure', [0])]),
+                             program('f', [('Measure', [0])])])
+        children = buffer.getChildren()
+        self.assertEqual(len(children), 2)
+        self.assertEqual(children[0].getMeasurementCounts(), {'1': 100})
+        self.assertEqual(children[1].getMeasurementCounts(), {'0': 100})
+
+
+if __name__ == '__main__':
+    xacc.Initialize()
+    test.main()
+    xacc.Finalize()
@@ -0,0 +1,79 @@
+import unittest as test
+import numpy as np
+import xacc
+
+def accelerator(options):
+    # The accelerator is shared, so always set every option tested
+    config = {'shots': 1024, 'p01': 0.0, 'p10': 0.0, 'seed': 5}
+    config.update(options)
+    return xacc.getAccelerator('chp-mc', config)
+
+def program(name, ops):
+    f = xacc.gate.createComposite(name)
+    for op in ops:
+        f.addInstruction(xacc.gate.create(*op))
+    return f
+
+def run(qpu, n_qubits, ops):
+    buffer = xacc.qalloc(n_qubits)
+    qpu.execute(buffer, program('f', ops))
+    return buffer.getMeasurementCounts()
+
+class TestCHPMonteCarloAccelerator(test.TestCase):
+
+    def test_bell(self):
+        shots = 4000
+        counts = run(accelerator({'shots': shots}), 2,
+                     [('H', [0]), ('CNOT', [0, 1]),
+                      ('Measure', [0]), ('Measure', [1])])
+        self.assertEqual(sorted(counts), ['00', '11'])
+        self.assertEqual(counts['00'] + counts['11'], shots)
+        self.assertLess(abs(counts['00'] / shots - 0.5), 0.05)
+
+    def test_ghz(self):
+        n = 70
+        ops = [('H', [0])] + [('CNOT', [q, q + 1]) for q in range(n - 1)]
+        ops += [('Measure', [q]) for q in range(n)]
+        counts = run(accelerator({'shots': 500}), n, ops)
+        self.assertEqual(sorted(counts), ['0' * n, '1' * n])
+
+    def test_clifford_identities(self):
+        qpu = accelerator({'shots': 100})
+        # H S S H = X
+        self.assertEqual(run(qpu, 1, [('H', [0]), ('S', [0]), ('S', [0]),
+                                      ('H', [0]), ('Measure', [0])]),
+                         {'1': 100})
+        # S Sdg = I, and H Ry(pi/2) = I on |0>
+        self.assertEqual(run(qpu, 1, [('S', [0]), ('Sdg', [0]),
+                                      ('Ry', [0], [np.pi / 2]), ('H', [0]),
+                                      ('Measure', [0])]),
+                         {'0': 100})
+        # H CZ H = CNOT, and Swap moves the excitation, qubit q
+        # being at position size - 1 - q of the bit strings
+        self.assertEqual(run(qpu, 3, [('Rx', [0], [np.pi]), ('H', [1]),
+                                      ('CZ', [0, 1]), ('H', [1]),
+                                      ('Swap', [1, 2]), ('Measure', [0]),
+                                      ('Measure', [1]), ('Measure', [2])]),
+                         {'101': 100})
+
+    def test_readout_flips(self):
+        shots = 20000
+        counts = run(accelerator({'shots': shots, 'p01': 0.1, 'p10': 0.2}), 2,
+                     [('X', [0]), ('Measure', [0]), ('Measure', [1])])
+        # Qubit 0 is prepared in 1 and read as 0 with p01,
+        # qubit 1 is prepared in 0 and read as 1 with p10
+        read0 = sum(c for b, c in counts.items() if b[1] == '0') / shots
+        read1 = sum(c for b, c in counts.items() if b[0] == '1') / shots
+        self.assertLess(abs(read0 - 0.1), 0.01)
+        self.assertLess(abs(read1 - 0.2), 0.015)
+
+        # The same seed gives the same counts
+        again = run(accelerator({'shots': shots, 'p01': 0.1, 'p10': 0.2}), 2,
+                    [('X', [0]), ('Measure', [0]), ('Measure', [1])])
+        self.assertEqual(counts, again)
+
+
+if __name__ == '__main__':
+    xacc.Initialize()
+    test.main()
+    xacc.Finalize()
@@ -0,0 +1,120 @@
+import unittest as test
+import numpy as np
+import xacc
+
+# Reference gates for a dense simulation, two qubit gates
+# in the basis |b0 b1> of their bits, b0 the most significant
+H = np.array([[1, 1], [1, -1]]) / np.sqrt(2.)
+CNOT = np.eye(4)[[0, 1, 3, 2]]
+CZ = np.diag([1., 1., 1., -1.])
+
+def rotation(name, theta):
+    c, s = np.cos(theta / 2.), np.sin(theta / 2.)
+    if name == 'Rx':
+        return np.array([[c, -1j * s], [-1j * s, c]])
+    if name == 'Ry':
+        return np.array([[c, -s], [s, c]])
+    return np.diag([np.exp(-0.5j * theta), np.exp(0.5j * theta)])
+
+def gate(name, bits, params):
+    if name in ['Rx', 'Ry', 'Rz']:
+        return rotation(name, params[0])
+    return {'H': H, 'CNOT': CNOT, 'CZ': CZ}[name]
+
+def accelerator(options):
+    # The accelerator is shared, so always set every option tested
+    config = {'vqe-mode': False, 'max-bond-dimension': 64, 'shots': 1024}
+    config.update(options)
+    return xacc.getAccelerator('mps', config)
+
+def program(name, ops):
+    f = xacc.gate.createComposite(name)
+    for op in ops:
+        f.addInstruction(xacc.gate.create(*op))
+    return f
+
+def dense_probabilities(n, ops):
+    # Axis q of psi is qubit q
+    psi = np.zeros([2] * n, dtype=complex)
+    psi[(0,) * n] = 1.
+    for op in ops:
+        name, bits = op[0], op[1]
+        if name == 'Measure':
+            continue
+        u = gate(name, bits, op[2] if len(op) > 2 else [])
+        u = u.reshape([2] * (2 * len(bits)))
+        axes = list(range(len(bits), 2 * len(bits)))
+        psi = np.moveaxis(np.tensordot(u, psi, axes=(axes, bits)),
+                          list(range(len(bits))), bits)
+    return np.abs(psi) ** 2
+
+def dense_expectation(n, ops, measured):
+    probs = dense_probabilities(n, ops)
+    exp = 0.
+    for index in np.ndindex(*probs.shape):
+        parity = sum(index[q] for q in measured) % 2
+        exp += (-1) ** parity * probs[index]
+    return exp
+
+# Entangles distant qubits, so the simulator has to swap them together
+circuit = [('H', [0]), ('Ry', [1], [0.7]), ('CNOT', [0, 4]),
+           ('Rx', [2], [1.3]), ('CNOT', [1, 3]), ('CZ', [4, 2]),
+           ('Rz', [3], [0.4]), ('CNOT', [3, 0]), ('Ry', [4], [-0.9])]
+
+class TestMPSAccelerator(test.TestCase):
+
+    def test_expectation(self):
+        qpu = accelerator({'vqe-mode': True})
+        for basis in ['Z', 'X', 'Y']:
+            change = {'Z': [],
+                      'X': [('H', [2]), ('H', [4])],
+                      'Y': [('Rx', [2], [np.pi / 2]),
+                            ('Rx', [4], [np.pi / 2])]}[basis]
+            ops = circuit + change + [('Measure', [2]), ('Measure', [4])]
+            buffer = xacc.qalloc(5)
+            qpu.execute(buffer, program('exp_' + basis, ops))
+            self.assertAlmostEqual(buffer.getExpectationValueZ(),
+                                   dense_expectation(5, ops, [2, 4]),
+                                   places=10)
+
+    def test_sampling(self):
+        shots = 20000
+        qpu = accelerator({'shots': shots, 'seed': 7})
+        ops = circuit + [('Measure', [q]) for q in range(5)]
+        buffer = xacc.qalloc(5)
+        qpu.execute(buffer, program('sample', ops))
+
+        # Qubit q is at position 4 - q of the bit strings
+        probs = dense_probabilities(5, ops)
+        counts = buffer.getMeasurementCounts()
+        self.assertEqual(sum(counts.values()), shots)
+        distance = 0.
+        for index in np.ndindex(*probs.shape):
+            bits = ''.join(str(b) for b in reversed(index))
+            distance += abs(counts.get(bits, 0) / shots - probs[index])
+        self.assertLess(distance / 2, 0.02)
+
+    def test_max_bond_dimension(self):
+        # Bell pairs (0, 2) and (1, 3) across the middle of the
+        # chain need bond dimension 4 there
+        ops = [('H', [0]), ('CNOT', [0, 1]), ('H', [2]), ('CNOT', [2, 3]),
+               ('Swap', [1, 2]), ('Measure', [0]), ('Measure', [2])]
+
+        exact = accelerator({'vqe-mode': True})
+        buffer = xacc.qalloc(4)
+        exact.execute(buffer, program('exact', ops))
+        self.assertEqual(buffer['mps-bond-dimension'], 4)
+        self.assertLess(buffer['mps-truncation-error'], 1e-12)
+        self.assertAlmostEqual(buffer.getExpectationValueZ(), 1.0, places=10)
+
+        truncated = accelerator({'vqe-mode': True, 'max-bond-dimension': 2})
+        buffer = xacc.qalloc(4)
+        truncated.execute(buffer, program('truncated', ops))
+        self.assertEqual(buffer['mps-bond-dimension'], 2)
+        self.assertGreater(buffer['mps-truncation-error'], 0.4)
+
+
+if __name__ == '__main__':
+    xacc.Initialize()
+    test.main()
+    xacc.Finalize()
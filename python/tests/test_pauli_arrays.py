@@ -0,0 +1,43 @@
+import unittest as test
+import numpy as np
+import xacc
+from xacc import PauliOperator
+
+class TestPauliArrays(test.TestCase):
+
+    def test_round_trip(self):
+        op = PauliOperator('0.5 X0 Y70 + (0.25,-1) X3 Z129 + 1.5')
+        coeffs, x, z = op.to_arrays()
+
+        # 130 qubits need three 64 bit words per term
+        self.assertEqual(coeffs.shape, (3,))
+        self.assertEqual(x.shape, (3, 3))
+        self.assertEqual(z.shape, (3, 3))
+        self.assertEqual(x.dtype, np.uint64)
+
+        rows = {complex(c): i for i, c in enumerate(coeffs)}
+        xy = rows[0.5 + 0j]
+        self.assertEqual(int(x[xy, 0]), 1)
+        self.assertEqual(int(x[xy, 1]), 1 << 6)
+        self.assertEqual(int(z[xy, 1]), 1 << 6)
+        xz = rows[0.25 - 1j]
+        self.assertEqual(int(x[xz, 0]), 1 << 3)
+        self.assertEqual(int(z[xz, 2]), 1 << 1)
+        identity = rows[1.5 + 0j]
+        self.assertFalse(x[identity].any() or z[identity].any())
+
+        op2 = PauliOperator.from_arrays(coeffs, x, z)
+        self.assertEqual(op2.nTerms(), 3)
+        self.assertTrue(op.isClose(op2))
+
+    def test_from_arrays_adds_duplicates(self):
+        x = np.array([[1], [1]], dtype=np.uint64)
+        z = np.zeros((2, 1), dtype=np.uint64)
+        op = PauliOperator.from_arrays(np.array([0.5, 0.25]), x, z)
+        self.assertTrue(op.isClose(PauliOperator('0.75 X0')))
+
+
+if __name__ == '__main__':
+    xacc.Initialize()
+    test.main()
+    xacc.Finalize()
@@ -0,0 +1,32 @@
+import os
+import sys
+import unittest as test
+from unittest import mock
+import xacc
+from xacc import PauliOperator
+
+benchmark = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmark', 'vqe')
+sys.path.append(benchmark)
+sys.path.append(os.path.join(benchmark, 'chemistry', 'hamiltonian_generators'))
+from frozencore import FrozenCoreHamiltonian
+from tapered_frozencore import TaperedFrozenCoreHamiltonian
+
+class TestTaperedFrozenCore(test.TestCase):
+
+    def test_reference_string(self):
+        # Z0 Z1 is a symmetry, the reference fixes its sector
+        op = PauliOperator('0.5 Z0 + 0.25 Z1 + 0.1 X0 X1')
+        expected = xacc.getObservableTransform('taper').transform(op, {'reference': [1, 1]})
+
+        # The frozen core Hamiltonian itself needs psi4
+        with mock.patch.object(FrozenCoreHamiltonian, 'generate', return_value=op):
+            generator = TaperedFrozenCoreHamiltonian()
+            for reference in ['[1, 1]', [1, 1]]:
+                tapered = generator.generate({'reference': reference})
+                self.assertEqual(tapered.toString(), expected.toString())
+
+
+if __name__ == '__main__':
+    xacc.Initialize()
+    test.main()
+    xacc.Finalize()
@@ -195,6 +195,8 @@ class DecoratorFunction(ABC):
                     self.qpu = getAccelerator(self.kwargs['accelerator'])
             elif hasAccelerator('tnqvm'):
                 self.qpu = getAccelerator('tnqvm')
+            elif hasAccelerator('statevector'):
+                self.qpu = getAccelerator('statevector')
             else:
                 print(
                     '\033[1;31mError, no Accelerators installed. We suggest installing TNQVM.\033[0;0m')
@@ -21,6 +21,39 @@ using namespace rapidjson;
 #include "IRProvider.hpp"
 #include "IRToGraphVisitor.hpp"
 
+#include <regex>
+
+namespace {
+// Exact comparison, InstructionParameter::operator== compares
+// the string forms, which round doubles
+bool sameParameters(const std::vector<xacc::InstructionParameter> &a,
+                    const std::vector<xacc::InstructionParameter> &b) {
+  if (a.size() != b.size()) {
+    return false;
+  }
+  for (std::size_t i = 0; i < a.size(); i++) {
+    if (a[i].which() != b[i].which()) {
+      return false;
+    }
+    bool same = true;
+    switch (a[i].which()) {
+    case 0:
+      same = mpark::get<int>(a[i]) == mpark::get<int>(b[i]);
+      break;
+    case 1:
+      same = mpark::get<double>(a[i]) == mpark::get<double>(b[i]);
+      break;
+    default:
+      same = mpark::get<std::string>(a[i]) == mpark::get<std::string>(b[i]);
+    }
+    if (!same) {
+      return false;
+    }
+  }
+  return true;
+}
+} // namespace
+
 namespace xacc {
 namespace quantum {
 void Circuit::throwIfInvalidInstructionParameter(InstPtr instruction) {
@@ -70,6 +103,28 @@ void Circuit::throwIfInvalidInstructionParameter(InstPtr instruction) {
   }
 }
 
+double Circuit::evaluateParameter(const std::string &expr,
+                                  const std::vector<double> &params) {
+  if (compiledExpressions) {
+    auto it = compiledHandles.find(expr);
+    int handle = -1;
+    if (it != compiledHandles.end()) {
+      handle = it->second;
+    } else {
+      handle = compiledExpressions->compile(expr);
+      compiledHandles.insert({expr, handle});
+    }
+    if (handle >= 0) {
+      return compiledExpressions->evaluate(handle);
+    }
+  }
+
+  // Fall back to parsing the expression directly
+  double val;
+  parsingUtil->evaluate(expr, variables, params, val);
+  return val;
+}
+
 std::shared_ptr<CompositeInstruction>
 Circuit::operator()(const std::vector<double> &params) {
   if (params.size() != variables.size()) {
@@ -80,6 +135,18 @@ Circuit::operator()(const std::vector<double> &params) {
     exit(0);
   }
 
+  if (!parsingUtil) {
+    parsingUtil = xacc::getService<ExpressionParsingUtil>("exprtk");
+  }
+  if (!compiledExpressions || compiledVariables != variables) {
+    compiledHandles.clear();
+    compiledExpressions = parsingUtil->compile(variables);
+    compiledVariables = variables;
+  }
+  if (compiledExpressions) {
+    compiledExpressions->setValues(params);
+  }
+
   std::vector<InstPtr> flatten;
   InstructionIterator iter(shared_from_this());
   while (iter.hasNext()) {
@@ -98,9 +165,7 @@ Circuit::operator()(const std::vector<double> &params) {
       for (int i = 0; i < inst->nParameters(); i++) {
         if (inst->getParameter(i).isVariable()) {
           InstructionParameter p = inst->getParameter(i);
-          std::stringstream s;
-          double val;
-          parsingUtil->evaluate(p.toString(), variables, params, val);
+          double val = evaluateParameter(p.toString(), params);
           updatedInst->setParameter(i, val);
         } else {
           auto a = inst->getParameter(i);
@@ -116,6 +181,178 @@ Circuit::operator()(const std::vector<double> &params) {
   return evaluatedCircuit;
 }
 
+std::shared_ptr<BoundCompositeInstruction> Circuit::bind() {
+  return std::make_shared<BoundCircuit>(shared_from_this());
+}
+
+std::shared_ptr<CompositeInstruction>
+Circuit::evaluateCached(const std::vector<double> &params) {
+  if (!cachedBinding || !cachedBinding->isCurrent(shared_from_this())) {
+    cachedBinding = std::make_shared<BoundCircuit>(shared_from_this());
+  }
+  return (*cachedBinding)(params);
+}
+
+BoundCircuit::BoundCircuit(std::shared_ptr<Circuit> circuit)
+    : variables(circuit->variables), parsingUtil(circuit->parsingUtil),
+      dependentSlots(circuit->variables.size()) {
+  if (!parsingUtil) {
+    parsingUtil = xacc::getService<ExpressionParsingUtil>("exprtk");
+  }
+  compiledExpressions = parsingUtil->compile(variables);
+
+  std::map<std::string, std::size_t> variableIdx;
+  for (std::size_t i = 0; i < variables.size(); i++) {
+    variableIdx.insert({variables[i], i});
+  }
+
+  evaluated = std::make_shared<Circuit>("evaled_" + circuit->name());
+  evaluated->parsingUtil = parsingUtil;
+
+  // Flatten once, cloning only the instructions we will rebind
+  std::regex identifier("[A-Za-z_][A-Za-z0-9_]*");
+  InstructionIterator iter(circuit);
+  while (iter.hasNext()) {
+    auto inst = iter.next();
+    if (inst->isComposite()) {
+      if (auto c = std::dynamic_pointer_cast<Circuit>(inst)) {
+        circuits.push_back({c, c->structureVersion});
+      }
+      continue;
+    }
+
+    if (!inst->isParameterized()) {
+      evaluated->instructions.push_back(inst);
+      continue;
+    }
+
+    sources.push_back({inst, inst->bits(), inst->getParameters()});
+    auto updatedInst = inst->clone();
+    updatedInst->setBits(inst->bits());
+    for (int i = 0; i < inst->nParameters(); i++) {
+      auto p = inst->getParameter(i);
+      if (!p.isVariable()) {
+        updatedInst->setParameter(i, p);
+        continue;
+      }
+
+      ParameterSlot slot{updatedInst, (std::size_t)i, p.toString(), -1};
+      if (compiledExpressions) {
+        slot.handle = compiledExpressions->compile(slot.expression);
+      }
+
+      auto slotIdx = slots.size();
+      std::set<std::size_t> deps;
+      for (std::sregex_iterator it(slot.expression.begin(),
+                                   slot.expression.end(), identifier),
+           end;
+           it != end; ++it) {
+        auto v = variableIdx.find(it->str());
+        if (v != variableIdx.end()) {
+          deps.insert(v->second);
+        }
+      }
+      for (auto d : deps) {
+        dependentSlots[d].push_back(slotIdx);
+      }
+
+      slots.push_back(slot);
+    }
+    evaluated->instructions.push_back(updatedInst);
+  }
+
+  dirtySlots.resize(slots.size(), true);
+}
+
+std::shared_ptr<CompositeInstruction>
+BoundCircuit::operator()(const std::vector<double> &params) {
+  if (params.size() != variables.size()) {
+    xacc::XACCLogger::instance()->error("Invalid Circuit evaluation: number "
+                                        "of parameters don't match. " +
+                                        std::to_string(params.size()) + ", " +
+                                        std::to_string(variables.size()));
+    exit(0);
+  }
+
+  if (!evaluatedOnce) {
+    std::fill(dirtySlots.begin(), dirtySlots.end(), true);
+  } else {
+    for (std::size_t i = 0; i < params.size(); i++) {
+      if (params[i] != currentParams[i]) {
+        for (auto s : dependentSlots[i]) {
+          dirtySlots[s] = true;
+        }
+      }
+    }
+  }
+
+  if (compiledExpressions) {
+    compiledExpressions->setValues(params);
+  }
+
+  for (std::size_t s = 0; s < slots.size(); s++) {
+    if (!dirtySlots[s]) {
+      continue;
+    }
+    auto &slot = slots[s];
+    double val;
+    if (slot.handle >= 0) {
+      val = compiledExpressions->evaluate(slot.handle);
+    } else {
+      parsingUtil->evaluate(slot.expression, variables, params, val);
+    }
+    slot.instruction->setParameter(slot.parameterIdx, val);
+    dirtySlots[s] = false;
+  }
+
+  currentParams = params;
+  evaluatedOnce = true;
+  return evaluated;
+}
+
+bool BoundCircuit::isCurrent(std::shared_ptr<Circuit> circuit) {
+  if (circuit->variables != variables) {
+    return false;
+  }
+  // Outer circuits come first, so a circuit is only looked at
+  // while the ones containing it are unchanged
+  for (auto &c : circuits) {
+    auto locked = c.first.lock();
+    if (!locked || locked->structureVersion != c.second) {
+      return false;
+    }
+  }
+  for (auto &source : sources) {
+    if (source.bits != source.instruction->bits() ||
+        !sameParameters(source.parameters,
+                        source.instruction->getParameters())) {
+      return false;
+    }
+  }
+  return true;
+}
+
+std::shared_ptr<Circuit> BoundCircuit::snapshot() const {
+  auto copy = std::make_shared<Circuit>(evaluated->name());
+  copy->parsingUtil = parsingUtil;
+  copy->instructions.reserve(evaluated->instructions.size());
+  for (auto &inst : evaluated->instructions) {
+    if (!inst->isParameterized()) {
+      copy->instructions.push_back(inst);
+      continue;
+    }
+    // clone() does not carry over bits or parameters
+    auto instCopy = inst->clone();
+    instCopy->setBits(inst->bits());
+    for (int i = 0; i < inst->nParameters(); i++) {
+      auto p = inst->getParameter(i);
+      instCopy->setParameter(i, p);
+    }
+    copy->instructions.push_back(instCopy);
+  }
+  return copy;
+}
+
 void Circuit::persist(std::ostream &outStream) {
   JsonVisitor<PrettyWriter<StringBuffer>, StringBuffer> visitor(
       shared_from_this());
@@ -132,6 +369,7 @@ void Circuit::load(std::istream &inStream) {
 
   variables.clear();
   instructions.clear();
+  invalidateCompiledExpressions();
 
   auto provider = xacc::getService<IRProvider>("quantum");
   std::string json(std::istreambuf_iterator<char>(inStream), {});
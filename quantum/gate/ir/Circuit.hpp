@@ -27,9 +27,13 @@
 namespace xacc {
 namespace quantum {
 
+class BoundCircuit;
+
 class Circuit : public CompositeInstruction,
                 public std::enable_shared_from_this<Circuit> {
 
+  friend class BoundCircuit;
+
 private:
   void throwIfInvalidInstructionParameter(InstPtr instruction);
 
@@ -70,6 +74,29 @@ protected:
 
   std::shared_ptr<ExpressionParsingUtil> parsingUtil;
 
+  // Cache of compiled variable parameter expressions used
+  // by operator(), keyed by expression string and compiled
+  // against compiledVariables. Invalidated when instructions
+  // or variables change.
+  std::shared_ptr<CompiledExpressions> compiledExpressions;
+  std::vector<std::string> compiledVariables{};
+  std::map<std::string, int> compiledHandles{};
+  // Binding used by evaluateCached(), rebuilt when out of date
+  std::shared_ptr<BoundCircuit> cachedBinding;
+  // Incremented by every modification made through the methods
+  // below, so bindings of circuits containing this one notice it
+  std::uint64_t structureVersion = 0;
+
+  void invalidateCompiledExpressions() {
+    structureVersion++;
+    cachedBinding.reset();
+    compiledExpressions.reset();
+    compiledVariables.clear();
+    compiledHandles.clear();
+  }
+  double evaluateParameter(const std::string &expr,
+                           const std::vector<double> &params);
+
   std::complex<double> coefficient = 1.0;
   std::string acc_signature = "";
 
@@ -82,7 +109,8 @@ public:
 
   Circuit(const Circuit &other)
       : circuitName(other.circuitName), variables(other.variables),
-        instructions(other.instructions), parsingUtil(other.parsingUtil) {}
+        instructions(other.instructions), parsingUtil(other.parsingUtil),
+        coefficient(other.coefficient) {}
 
   const std::string name() const override { return circuitName; }
   const std::string description() const override { return ""; }
@@ -180,22 +208,26 @@ public:
   void removeInstruction(const std::size_t idx) override {
     validateInstructionIndex(idx);
     instructions.erase(instructions.begin() + idx);
+    invalidateCompiledExpressions();
   }
   void replaceInstruction(const std::size_t idx, InstPtr newInst) override {
     validateInstructionIndex(idx);
     throwIfInvalidInstructionParameter(newInst);
     instructions[idx] = newInst;
+    invalidateCompiledExpressions();
   }
   void insertInstruction(const std::size_t idx, InstPtr newInst) override {
     validateInstructionIndex(idx);
     throwIfInvalidInstructionParameter(newInst);
     instructions.insert(instructions.begin() + idx, newInst);
+    invalidateCompiledExpressions();
   }
 
   void addInstruction(InstPtr instruction) override {
     throwIfInvalidInstructionParameter(instruction);
     validateInstructionPtr(instruction);
     instructions.push_back(instruction);
+    invalidateCompiledExpressions();
   }
   void addInstructions(std::vector<InstPtr> &insts) override {
     for (auto &i : insts)
@@ -207,6 +239,7 @@ public:
   }
   void clear() override {
       instructions.clear();
+      invalidateCompiledExpressions();
   }
 
   bool hasChildren() const override { return !instructions.empty(); }
@@ -228,9 +261,11 @@ public:
 
   void addVariable(const std::string variableName) override {
     variables.push_back(variableName);
+    invalidateCompiledExpressions();
   }
   void addVariables(const std::vector<std::string> &vars) override {
     variables.insert(variables.end(), vars.begin(), vars.end());
+    invalidateCompiledExpressions();
   }
   const std::vector<std::string> getVariables() override {
     // return this guys variables + all sub-node variables
@@ -251,6 +286,7 @@ public:
     std::replace_if(
         variables.begin(), variables.end(),
         [&](const std::string var) { return var == variable; }, newVariable);
+    invalidateCompiledExpressions();
   }
 
   const std::size_t nVariables() override { return getVariables().size(); }
@@ -342,6 +378,10 @@ public:
   std::shared_ptr<CompositeInstruction>
   operator()(const std::vector<double> &params) override;
 
+  std::shared_ptr<BoundCompositeInstruction> bind() override;
+  std::shared_ptr<CompositeInstruction>
+  evaluateCached(const std::vector<double> &params) override;
+
   const std::string accelerator_signature() override { return acc_signature; }
   void set_accelerator_signature(const std::string signature) override {
     acc_signature = signature;
@@ -355,6 +395,70 @@ public:
   virtual ~Circuit() {}
 };
 
+// BoundCircuit flattens a Circuit once and keeps an evaluated copy whose
+// variable parameters are overwritten in place on each call. Only the
+// parameter slots that depend on a changed variable are re-evaluated.
+// Changes made to the source Circuit after binding are not reflected.
+//
+// Every call returns the same evaluated Circuit object, so a result is
+// only valid until the next call on the same binding. Callers that keep
+// a result past that point (e.g. to execute it asynchronously) must take
+// a snapshot() or use one binding per result they hold.
+class BoundCircuit : public BoundCompositeInstruction {
+protected:
+  // The circuits flattened into this binding with their structureVersion,
+  // and the parameterized instructions with the bits and parameters they
+  // had at bind time, checked by isCurrent()
+  std::vector<std::pair<std::weak_ptr<Circuit>, std::uint64_t>> circuits;
+  struct SourceRecord {
+    InstPtr instruction;
+    std::vector<std::size_t> bits;
+    std::vector<InstructionParameter> parameters;
+  };
+  std::vector<SourceRecord> sources;
+
+  struct ParameterSlot {
+    InstPtr instruction;
+    std::size_t parameterIdx;
+    std::string expression;
+    int handle;
+  };
+
+  std::vector<std::string> variables;
+  std::shared_ptr<ExpressionParsingUtil> parsingUtil;
+  std::shared_ptr<CompiledExpressions> compiledExpressions;
+
+  std::shared_ptr<Circuit> evaluated;
+  std::vector<ParameterSlot> slots;
+
+  // For each variable, the slots whose expression references it
+  std::vector<std::vector<std::size_t>> dependentSlots;
+
+  std::vector<double> currentParams;
+  std::vector<bool> dirtySlots;
+  bool evaluatedOnce = false;
+
+public:
+  BoundCircuit(std::shared_ptr<Circuit> circuit);
+
+  std::shared_ptr<CompositeInstruction>
+  operator()(const std::vector<double> &params) override;
+
+  // True if no circuit flattened into this binding was modified since,
+  // and its parameterized instructions keep their bits and parameters.
+  // Costs one check per circuit and parameterized instruction.
+  bool isCurrent(std::shared_ptr<Circuit> circuit);
+
+  // Copy of the current evaluation that later calls do not modify
+  std::shared_ptr<Circuit> snapshot() const;
+
+  const std::size_t nSlots() const { return slots.size(); }
+  const std::vector<std::size_t> &
+  getDependentSlots(const std::size_t variableIdx) const {
+    return dependentSlots[variableIdx];
+  }
+};
+
 } // namespace quantum
 } // namespace xacc
 #endif
\ No newline at end of file
@@ -130,6 +130,123 @@ TEST(GateTester, checkBasicGatesAndCircuits) {
 
 }
 
+TEST(GateTester, checkRepeatedEvaluation) {
+  auto circuit = std::make_shared<Circuit>(
+      "foo", std::vector<std::string>{"t0", "t1"});
+  circuit->addInstruction(std::make_shared<Ry>(0, "t0"));
+  circuit->addInstruction(std::make_shared<Rz>(1, "2*t0 + t1"));
+
+  auto evaled = circuit->operator()({.1, .2});
+  EXPECT_NEAR(.1, evaled->getInstruction(0)->getParameter(0).as<double>(),
+              1e-12);
+  EXPECT_NEAR(.4, evaled->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+
+  evaled = circuit->operator()({.3, .5});
+  EXPECT_NEAR(.3, evaled->getInstruction(0)->getParameter(0).as<double>(),
+              1e-12);
+  EXPECT_NEAR(1.1, evaled->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+
+  // Changing variables and instructions must not reuse stale expressions
+  circuit->addVariable("t2");
+  circuit->replaceInstruction(0, std::make_shared<Ry>(0, "t2 - t0"));
+  evaled = circuit->operator()({.3, .5, 1.});
+  EXPECT_NEAR(.7, evaled->getInstruction(0)->getParameter(0).as<double>(),
+              1e-12);
+  EXPECT_NEAR(1.1, evaled->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+}
+
+TEST(GateTester, checkBind) {
+  auto inner = std::make_shared<Circuit>(
+      "inner", std::vector<std::string>{"t0", "t1"});
+  inner->addInstruction(std::make_shared<Rz>(1, "2*t0 + t1"));
+
+  auto circuit = std::make_shared<Circuit>(
+      "foo", std::vector<std::string>{"t0", "t1"});
+  circuit->addInstruction(std::make_shared<Hadamard>(0));
+  circuit->addInstruction(std::make_shared<Ry>(0, "t0"));
+  circuit->addInstruction(inner);
+  circuit->addInstruction(std::make_shared<Rx>(1, 0.5));
+
+  auto bound = std::dynamic_pointer_cast<BoundCircuit>(circuit->bind());
+  EXPECT_TRUE(bound != nullptr);
+  EXPECT_EQ(2, bound->nSlots());
+  EXPECT_EQ(std::vector<std::size_t>({0, 1}), bound->getDependentSlots(0));
+  EXPECT_EQ(std::vector<std::size_t>({1}), bound->getDependentSlots(1));
+
+  auto evaled = bound->operator()({.1, .2});
+  EXPECT_EQ("evaled_foo", evaled->name());
+  EXPECT_EQ(4, evaled->nInstructions());
+  EXPECT_NEAR(.1, evaled->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+  EXPECT_NEAR(.4, evaled->getInstruction(2)->getParameter(0).as<double>(),
+              1e-12);
+  EXPECT_NEAR(.5, evaled->getInstruction(3)->getParameter(0).as<double>(),
+              1e-12);
+
+  // Rebinding updates the same instructions in place
+  auto evaled2 = bound->operator()({.1, .5});
+  EXPECT_EQ(evaled, evaled2);
+  EXPECT_NEAR(.1, evaled->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+  EXPECT_NEAR(.7, evaled->getInstruction(2)->getParameter(0).as<double>(),
+              1e-12);
+
+  // The source circuit is untouched
+  EXPECT_EQ("t0",
+            circuit->getInstruction(1)->getParameter(0).as<std::string>());
+
+  // A snapshot is not modified by later calls
+  auto snap = bound->snapshot();
+  bound->operator()({.3, .5});
+  EXPECT_NEAR(.7, snap->getInstruction(2)->getParameter(0).as<double>(),
+              1e-12);
+  EXPECT_NEAR(1.1, evaled->getInstruction(2)->getParameter(0).as<double>(),
+              1e-12);
+}
+
+TEST(GateTester, checkEvaluateCached) {
+  auto circuit =
+      std::make_shared<Circuit>("foo", std::vector<std::string>{"t0"});
+  auto rz = std::make_shared<Rz>(0, "t0");
+  circuit->addInstruction(std::make_shared<Hadamard>(0));
+  circuit->addInstruction(rz);
+
+  // A cache hit evaluates into the same circuit, sharing
+  // the instructions that have no variable parameters
+  auto first = circuit->evaluateCached({.1});
+  EXPECT_NEAR(.1, first->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+  auto firstRz = first->getInstruction(1);
+  auto second = circuit->evaluateCached({.2});
+  EXPECT_EQ(first, second);
+  EXPECT_EQ(firstRz, second->getInstruction(1));
+  EXPECT_EQ(circuit->getInstruction(0), second->getInstruction(0));
+  EXPECT_NEAR(.2, second->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+
+  // Changes to the source are picked up
+  xacc::InstructionParameter expr("2*t0");
+  rz->setParameter(0, expr);
+  auto third = circuit->evaluateCached({.2});
+  EXPECT_NEAR(.4, third->getInstruction(1)->getParameter(0).as<double>(),
+              1e-12);
+  circuit->addInstruction(std::make_shared<Rx>(0, "t0"));
+  auto fourth = circuit->evaluateCached({.2});
+  EXPECT_EQ(3, fourth->nInstructions());
+  EXPECT_NEAR(.2, fourth->getInstruction(2)->getParameter(0).as<double>(),
+              1e-12);
+
+  // So are changes to a nested circuit
+  auto inner = std::make_shared<Circuit>("inner");
+  circuit->addInstruction(inner);
+  EXPECT_EQ(3, circuit->evaluateCached({.2})->nInstructions());
+  inner->addInstruction(std::make_shared<Hadamard>(1));
+  EXPECT_EQ(4, circuit->evaluateCached({.2})->nInstructions());
+}
+
 TEST(GateTester, checkTerminatingNode) {
   class sub_circuit : public Circuit {
   public:
@@ -0,0 +1,78 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "CommonGates.hpp"
+#include "Circuit.hpp"
+#include "xacc.hpp"
+#include <chrono>
+#include <functional>
+
+using namespace xacc::quantum;
+
+// Evaluate a 500 parameter hardware-efficient style ansatz 10k times
+// with operator()() and with a bound circuit, and report the timings.
+int main(int argc, char **argv) {
+  xacc::Initialize(argc, argv);
+
+  const int nParams = 500, nQubits = 10, nEvals = 10000;
+
+  std::vector<std::string> vars;
+  for (int i = 0; i < nParams; i++) {
+    vars.push_back("t" + std::to_string(i));
+  }
+
+  auto ansatz = std::make_shared<Circuit>("ansatz", vars);
+  for (int i = 0; i < nParams; i++) {
+    auto q = i % nQubits;
+    if (i % 2) {
+      ansatz->addInstruction(std::make_shared<Ry>(q, "2*" + vars[i]));
+    } else {
+      ansatz->addInstruction(std::make_shared<Rz>(q, vars[i]));
+    }
+    if (q == nQubits - 1) {
+      for (int j = 0; j < nQubits - 1; j++) {
+        ansatz->addInstruction(std::make_shared<CNOT>(j, j + 1));
+      }
+    }
+  }
+
+  auto run = [&](const std::string label,
+                 std::function<void(const std::vector<double> &)> eval) {
+    std::vector<double> params(nParams);
+    auto start = std::chrono::high_resolution_clock::now();
+    for (int k = 0; k < nEvals; k++) {
+      for (int i = 0; i < nParams; i++) {
+        params[i] = 1e-3 * (k + i);
+      }
+      eval(params);
+    }
+    auto end = std::chrono::high_resolution_clock::now();
+
+    auto total =
+        std::chrono::duration_cast<std::chrono::milliseconds>(end - start)
+            .count();
+    std::cout << label << ": evaluated " << nParams << " parameter ansatz "
+              << nEvals << " times in " << total << " ms ("
+              << (double)total / nEvals << " ms per evaluation)\n";
+  };
+
+  run("operator()",
+      [&](const std::vector<double> &params) { auto evaled = (*ansatz)(params); });
+
+  auto bound = ansatz->bind();
+  run("bind()", [&](const std::vector<double> &params) {
+    auto evaled = (*bound)(params);
+  });
+
+  xacc::Finalize();
+  return 0;
+}
@@ -20,6 +20,135 @@
 
 namespace xacc {
 namespace quantum {
+namespace {
+inline bool isSpace(const char ch) {
+  return ch == ' ' || ch == '\t' || ch == '\r' || ch == '\n';
+}
+
+inline bool isDigit(const char ch) { return ch >= '0' && ch <= '9'; }
+
+// Single pass parser for the common "coeff op op ... +/- ..." form of the
+// FermionOperator grammar, where an op is an orbital index optionally
+// followed by ^. It returns false on anything it does not handle
+// (comments, empty terms, malformed input) so the caller can fall
+// back to ANTLR, which also produces the error messages.
+bool parseFermionString(const std::string &str,
+                        std::vector<FermionTerm> &result) {
+  const char *p = str.c_str(), *end = p + str.size();
+  auto skipSpace = [&]() {
+    while (p != end && isSpace(*p)) {
+      p++;
+    }
+  };
+  auto parseReal = [&](double &val) {
+    char *stop;
+    val = std::strtod(p, &stop);
+    if (stop == p) {
+      return false;
+    }
+    p = stop;
+    return true;
+  };
+  // A bare integer is an orbital index, a coefficient needs a '.'
+  auto isRealAhead = [&]() {
+    auto q = p;
+    if (q != end && *q == '-') {
+      q++;
+    }
+    while (q != end && isDigit(*q)) {
+      q++;
+    }
+    return q != end && *q == '.';
+  };
+
+  double sign = 1.0;
+  while (true) {
+    skipSpace();
+    std::complex<double> coeff(1.0, 0.0);
+    bool seen = false;
+
+    if (p != end && *p == '(') {
+      double re, im;
+      p++;
+      skipSpace();
+      if (!parseReal(re)) {
+        return false;
+      }
+      skipSpace();
+      if (p == end || *p != ',') {
+        return false;
+      }
+      p++;
+      skipSpace();
+      if (!parseReal(im)) {
+        return false;
+      }
+      skipSpace();
+      if (p == end || *p != ')') {
+        return false;
+      }
+      p++;
+      coeff = std::complex<double>(re, im);
+      seen = true;
+    } else if (isRealAhead()) {
+      double re;
+      if (!parseReal(re)) {
+        return false;
+      }
+      coeff = std::complex<double>(re, 0.0);
+      seen = true;
+    }
+
+    if (sign < 0) {
+      coeff *= -1.0;
+    }
+
+    Operators ops;
+    while (true) {
+      skipSpace();
+      if (p == end || !isDigit(*p)) {
+        break;
+      }
+      long idx = 0;
+      while (p != end && isDigit(*p)) {
+        idx = 10 * idx + (*p++ - '0');
+        if (idx > 1000000) {
+          return false;
+        }
+      }
+      if (p != end && *p == '.') {
+        return false;
+      }
+      skipSpace();
+      bool creation = p != end && *p == '^';
+      if (creation) {
+        p++;
+      }
+      ops.push_back({(int)idx, creation});
+      seen = true;
+    }
+
+    // The grammar turns an empty term into the identity,
+    // leave that quirk to the ANTLR path
+    if (!seen) {
+      return false;
+    }
+    result.emplace_back(coeff, std::move(ops));
+
+    if (p == end) {
+      return true;
+    }
+    if (*p == '+') {
+      sign = 1.0;
+    } else if (*p == '-') {
+      sign = -1.0;
+    } else {
+      return false;
+    }
+    p++;
+  }
+}
+} // namespace
 
 FermionTerm &FermionTerm::operator*=(const FermionTerm &v) noexcept {
   coeff() *= std::get<0>(v);
@@ -65,7 +194,9 @@ FermionOperator::FermionOperator(double c) {
 
 FermionOperator::FermionOperator(std::string fromStr) { fromString(fromStr); }
 
-FermionOperator::FermionOperator(const FermionOperator &i) : terms(i.terms) {}
+FermionOperator::FermionOperator(const FermionOperator &i)
+    : terms(i.terms), transformName(i.transformName),
+      transformQubits(i.transformQubits) {}
 
 FermionOperator::FermionOperator(Operators operators) {
   terms.emplace(std::make_pair(FermionTerm::id(operators), operators));
@@ -89,12 +220,67 @@ FermionOperator::FermionOperator(Operators operators, double coeff, std::string
                 std::forward_as_tuple(std::complex<double>(coeff,0.0), operators, var));
     }
 
-void FermionOperator::clear() { terms.clear(); }
+void FermionOperator::clear() {
+  terms.clear();
+  invalidateCache();
+}
+
+void FermionOperator::invalidateCache() {
+  transformCache.clear();
+  observedCache.clear();
+  termsVersion = nextVersion();
+}
+
+std::string FermionOperator::transformKey() const {
+  return transformName + ":" + std::to_string(transformQubits);
+}
+
+std::shared_ptr<Observable> FermionOperator::transformed() {
+  auto key = transformKey();
+  auto it = transformCache.find(key);
+  if (it != transformCache.end()) {
+    return it->second;
+  }
+  auto transform = xacc::getService<ObservableTransform>(transformName);
+  auto result = transform->transform(shared_from_this(), transformOptions());
+  transformCache.insert({key, result});
+  return result;
+}
+
+HeterogeneousMap FermionOperator::transformOptions() {
+  HeterogeneousMap options;
+  if (transformQubits > 0) {
+    options.insert("n_qubits", transformQubits);
+  }
+  return options;
+}
 
 std::vector<std::shared_ptr<CompositeInstruction>>
 FermionOperator::observe(std::shared_ptr<CompositeInstruction> function) {
-    auto transform = xacc::getService<ObservableTransform>("jw");
-    return transform->transform(shared_from_this())->observe(function);
+  auto &cached = observedCache[transformKey()];
+  if (cached.circuits.empty() || cached.function.lock() != function ||
+      cached.nInstructions != function->nInstructions() ||
+      cached.variables != function->getVariables()) {
+    cached.circuits = transformed()->observe(function);
+    cached.function = function;
+    cached.nInstructions = function->nInstructions();
+    cached.variables = function->getVariables();
+  }
+
+  // Hand out shallow copies so that renaming or appending to a
+  // returned circuit does not leak into later calls
+  std::vector<std::shared_ptr<CompositeInstruction>> circuits;
+  circuits.reserve(cached.circuits.size());
+  for (auto &c : cached.circuits) {
+    circuits.push_back(
+        std::dynamic_pointer_cast<CompositeInstruction>(c->clone()));
+  }
+  return circuits;
+}
+
+ObservedGroups
+FermionOperator::observeGrouped(std::shared_ptr<CompositeInstruction> function) {
+    return transformed()->observeGrouped(function);
 }
 
 const std::string FermionOperator::toString() {
@@ -134,6 +320,28 @@ const std::string FermionOperator::toString() {
 }
 
 void FermionOperator::fromString(const std::string str) {
+  std::vector<FermionTerm> parsed;
+  if (!parseFermionString(str, parsed)) {
+    fromStringANTLR(str);
+    return;
+  }
+
+  clear();
+  for (auto &t : parsed) {
+    auto termId = t.id();
+    auto it = terms.find(termId);
+    if (it != terms.end()) {
+      it->second.coeff() += t.coeff();
+      if (std::abs(it->second.coeff()) < 1e-12) {
+        terms.erase(it);
+      }
+    } else if (std::abs(t.coeff()) >= 1e-12) {
+      terms.emplace(termId, t);
+    }
+  }
+}
+
+void FermionOperator::fromStringANTLR(const std::string str) {
 
   using namespace antlr4;
   using namespace fermion;
@@ -176,7 +384,7 @@ const int FermionOperator::nBits() {
 
 FermionOperator &
 FermionOperator::operator+=(const FermionOperator &v) noexcept {
-  FermionOperator vv = v;
+  invalidateCache();
   for (auto &kv : v.terms) {
 
     auto termId = kv.first;
@@ -224,6 +432,7 @@ FermionOperator::operator*=(const FermionOperator &v) noexcept {
     }
   }
   terms = newTerms;
+  invalidateCache();
   return *this;
 }
 
@@ -259,6 +468,7 @@ FermionOperator::operator*=(const std::complex<double> v) noexcept {
   for (auto &kv : terms) {
     std::get<0>(kv.second) *= v;
   }
+  invalidateCache();
   return *this;
 }
 
@@ -163,6 +163,30 @@ class FermionOperator
 protected:
   std::unordered_map<std::string, FermionTerm> terms;
 
+  // The ObservableTransform used by observe, and the number
+  // of qubits to encode into (-1 means nBits())
+  std::string transformName = "jw";
+  int transformQubits = -1;
+  HeterogeneousMap transformOptions();
+
+  // The qubit image under each transform (keyed by transform
+  // name and number of qubits) and the circuits last observed with it.
+  // Both are cleared whenever the terms change.
+  struct ObservedCircuits {
+    std::weak_ptr<CompositeInstruction> function;
+    std::vector<std::string> variables;
+    int nInstructions = 0;
+    std::vector<std::shared_ptr<CompositeInstruction>> circuits;
+  };
+  std::unordered_map<std::string, std::shared_ptr<Observable>> transformCache;
+  std::unordered_map<std::string, ObservedCircuits> observedCache;
+  std::string transformKey() const;
+  std::shared_ptr<Observable> transformed();
+  void invalidateCache();
+
+  // Renewed by every modification, see Observable::version()
+  std::uint64_t termsVersion = nextVersion();
+
 public:
   std::shared_ptr<Observable> clone() override {
       return std::make_shared<FermionOperator>();
@@ -177,11 +201,22 @@ public:
   FermionOperator(Operators operators, double coeff);
   FermionOperator(Operators operators, double coeff, std::string var);
 
+  // Repeated calls with the same (unmodified) function return
+  // shallow copies of the same observed circuits. The circuits
+  // themselves may be renamed or extended, but the instructions
+  // they contain are shared and must be treated as read-only.
   std::vector<std::shared_ptr<CompositeInstruction>>
   observe(std::shared_ptr<CompositeInstruction> function) override;
+  ObservedGroups
+  observeGrouped(std::shared_ptr<CompositeInstruction> function) override;
   const std::string toString() override;
   void fromString(const std::string str) override;
+  // Parse with the ANTLR grammar only. fromString tries a hand-written
+  // single pass parser first and falls back to this for unusual input.
+  void fromStringANTLR(const std::string str);
   const int nBits() override;
+  // Also changes with the transform used by observe()
+  std::uint64_t version() override { return termsVersion; }
 
   void clear();
   std::unordered_map<std::string, FermionTerm> getTerms() const { return terms; }
@@ -200,8 +235,14 @@ public:
   const std::string description() const override {
       return "";
   }
-void fromOptions(const HeterogeneousMap& options) override {
-      return;
+  void fromOptions(const HeterogeneousMap& options) override {
+      if (options.stringExists("transform")) {
+          transformName = options.getString("transform");
+      }
+      if (options.keyExists<int>("n_qubits")) {
+          transformQubits = options.get<int>("n_qubits");
+      }
+      termsVersion = nextVersion();
   }
 
 };
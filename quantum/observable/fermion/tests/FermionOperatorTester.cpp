@@ -15,6 +15,7 @@
 #include "xacc.hpp"
 #include "IRProvider.hpp"
 #include "xacc_service.hpp"
+#include "ObservableTransform.hpp"
 
 using namespace xacc::quantum;
 
@@ -61,6 +62,74 @@ TEST(FermionOperatorTester, checkFromStr2) {
     FermionOperator op(src);
     std::cout << op.toString() << "\n";
 }
+TEST(FermionOperatorTester, checkFastParser) {
+    std::vector<std::string> srcs{
+        "3.3 4^ 3^ 2^ 1^ 4 3 2 1",
+        "-159.505\n- 0.714932 0^ 0\n+ 0.101963 0^ 1 + (0.5,-1.0) 1 ^ 0",
+        ".12 0^ 1^ 0 1 - .12 0^ 1^ 1 0 + .12 0^ 1^ 0 1",
+        "0.5 1^ 1 - 0.5 1^ 1"};
+    for (auto &src : srcs) {
+        FermionOperator fast, antlr;
+        fast.fromString(src);
+        antlr.fromStringANTLR(src);
+        auto fastTerms = fast.getTerms();
+        auto antlrTerms = antlr.getTerms();
+        EXPECT_EQ(antlrTerms.size(), fastTerms.size());
+        for (auto &kv : antlrTerms) {
+            EXPECT_EQ(1, fastTerms.count(kv.first));
+            EXPECT_NEAR(0.0, std::abs(fastTerms[kv.first].coeff() - kv.second.coeff()), 1e-12);
+        }
+    }
+}
+TEST(FermionOperatorTester, checkObserveCache) {
+    auto op = std::make_shared<FermionOperator>("0.5 1^ 0 + 0.5 0^ 1 + 0.25 1^ 1");
+    auto provider = xacc::getIRProvider("quantum");
+    auto ansatz = provider->createComposite("ansatz");
+    ansatz->addInstruction(provider->createInstruction("X", {0}));
+
+    // Unchanged operator and function reuse the observed circuits,
+    // handing out copies that callers may modify
+    auto last = [](std::shared_ptr<xacc::CompositeInstruction> c) {
+        return c->getInstruction(c->nChildren() - 1);
+    };
+    auto first = op->observe(ansatz);
+    EXPECT_EQ(4, first.size());
+    auto firstName = first[0]->name();
+    auto firstSize = first[0]->nInstructions();
+    first[0]->setName("renamed");
+    first[0]->addInstruction(provider->createInstruction("H", {0}));
+    auto again = op->observe(ansatz);
+    EXPECT_EQ(4, again.size());
+    EXPECT_EQ(firstName, again[0]->name());
+    EXPECT_EQ(firstSize, again[0]->nInstructions());
+    EXPECT_EQ(last(first[1]), last(again[1]));
+
+    // The copies keep the term coefficients of the uncached circuits
+    auto jw = xacc::getService<xacc::ObservableTransform>("jw");
+    auto uncached = jw->transform(op)->observe(ansatz);
+    std::map<std::string, std::complex<double>> coefficients;
+    for (auto &c : uncached) {
+        coefficients[c->name()] = c->getCoefficient();
+    }
+    for (auto &c : again) {
+        EXPECT_EQ(coefficients[c->name()], c->getCoefficient());
+    }
+
+    // Changing the ansatz rebuilds them
+    ansatz->addInstruction(provider->createInstruction("X", {1}));
+    auto second = op->observe(ansatz);
+    EXPECT_FALSE(last(again[1]) == last(second[1]));
+
+    // Mutating the operator invalidates the cached transform
+    *op += FermionOperator("0.5 2^ 2");
+    auto third = op->observe(ansatz);
+    EXPECT_EQ(5, third.size());
+
+    // Selecting another transform does too
+    op->fromOptions({std::make_pair("transform", "bk")});
+    EXPECT_FALSE(last(third[1]) == last(op->observe(ansatz)[1]));
+}
+
 int main(int argc, char** argv) {
     xacc::Initialize(argc,argv);
    ::testing::InitGoogleTest(&argc, argv);
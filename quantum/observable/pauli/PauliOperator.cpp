@@ -14,6 +14,8 @@
 #include "IRProvider.hpp"
 #include <regex>
 #include <set>
+#include <numeric>
+#include <bitset>
 #include <iostream>
 #include "xacc.hpp"
 #include "xacc_service.hpp"
@@ -25,8 +27,277 @@
 
 namespace xacc {
 namespace quantum {
-// const std::map<std::string, std::pair<c, std::string>> Term:: pauliProducts =
-// Term::create_map();
+namespace {
+constexpr int wordBits = 64;
+
+inline int popcount(std::uint64_t w) { return std::bitset<64>(w).count(); }
+
+inline int lowestBit(std::uint64_t w) {
+  int b = 0;
+  while (!((w >> b) & 1)) {
+    b++;
+  }
+  return b;
+}
+
+// Letters indexed by (x bit) | (z bit) << 1
+const char pauliLetters[] = {'I', 'X', 'Z', 'Y'};
+
+// Call f(qubit, letter) for each X, Y or Z factor in qubit order,
+// for hot loops that should not build Term::ops()
+template <typename F> void forEachFactor(const PauliMask &mask, F f) {
+  for (std::size_t w = 0; w < mask.x.size(); w++) {
+    auto bits = mask.x[w] | mask.z[w];
+    while (bits) {
+      int b = lowestBit(bits);
+      bits &= bits - 1;
+      int letter = ((mask.x[w] >> b) & 1) | (((mask.z[w] >> b) & 1) << 1);
+      f(int(w * wordBits + b), pauliLetters[letter]);
+    }
+  }
+}
+
+// Hash and equality of a Term's operator part, used to
+// merge like terms without building their string ids
+struct TermKeyHash {
+  std::size_t operator()(const Term &t) const {
+    return PauliMaskHash()(t.mask()) ^ (std::hash<std::string>()(t.var()) << 1);
+  }
+};
+struct TermKeyEqual {
+  bool operator()(const Term &a, const Term &b) const { return a == b; }
+};
+
+inline bool isSpace(const char ch) {
+  return ch == ' ' || ch == '\t' || ch == '\r' || ch == '\n';
+}
+
+inline bool isDigit(const char ch) { return ch >= '0' && ch <= '9'; }
+
+// Single pass parser for the common "coeff op op ... +/- ..." form of the
+// PauliOperator grammar. It returns false on anything it does not
+// handle (comments, empty terms, malformed input) so the caller can
+// fall back to ANTLR, which also produces the error messages.
+bool parsePauliString(const std::string &str, std::vector<Term> &result) {
+  const char *p = str.c_str(), *end = p + str.size();
+  auto skipSpace = [&]() {
+    while (p != end && isSpace(*p)) {
+      p++;
+    }
+  };
+  auto parseReal = [&](double &val) {
+    if (p == end || !(isDigit(*p) || *p == '-' || *p == '.')) {
+      return false;
+    }
+    char *stop;
+    val = std::strtod(p, &stop);
+    if (stop == p) {
+      return false;
+    }
+    p = stop;
+    return true;
+  };
+
+  double sign = 1.0;
+  while (true) {
+    skipSpace();
+    std::complex<double> coeff(1.0, 0.0);
+    bool seen = false;
+
+    if (p != end && *p == '(') {
+      double re, im;
+      p++;
+      skipSpace();
+      if (!parseReal(re)) {
+        return false;
+      }
+      skipSpace();
+      if (p == end || *p != ',') {
+        return false;
+      }
+      p++;
+      skipSpace();
+      if (!parseReal(im)) {
+        return false;
+      }
+      skipSpace();
+      if (p == end || *p != ')') {
+        return false;
+      }
+      p++;
+      coeff = std::complex<double>(re, im);
+      seen = true;
+    } else if (p != end && (isDigit(*p) || *p == '.' || *p == '-')) {
+      double re;
+      if (!parseReal(re)) {
+        return false;
+      }
+      coeff = std::complex<double>(re, 0.0);
+      seen = true;
+    }
+
+    if (sign < 0) {
+      coeff *= -1.0;
+    }
+
+    PauliMask mask;
+    while (true) {
+      skipSpace();
+      if (p == end) {
+        break;
+      }
+      if (*p == 'I') {
+        p++;
+        if (p != end && isDigit(*p)) {
+          return false;
+        }
+        seen = true;
+        continue;
+      }
+      if (*p != 'X' && *p != 'Y' && *p != 'Z') {
+        break;
+      }
+      auto letter = *p++;
+      skipSpace();
+      if (p == end || !isDigit(*p)) {
+        return false;
+      }
+      long idx = 0;
+      while (p != end && isDigit(*p)) {
+        idx = 10 * idx + (*p++ - '0');
+        if (idx > 1000000) {
+          return false;
+        }
+      }
+
+      std::size_t word = idx / wordBits;
+      std::uint64_t bit = std::uint64_t(1) << (idx % wordBits);
+      if (word >= mask.x.size()) {
+        mask.x.resize(word + 1, 0);
+        mask.z.resize(word + 1, 0);
+      }
+      bool xBit = letter != 'Z', zBit = letter != 'X';
+      if ((mask.x[word] | mask.z[word]) & bit) {
+        // Repeated qubit, multiply it in to pick up the phase
+        PauliMask single;
+        single.x.assign(word + 1, 0);
+        single.z.assign(word + 1, 0);
+        single.x[word] = xBit ? bit : 0;
+        single.z[word] = zBit ? bit : 0;
+        Term product(coeff, mask);
+        product *= Term(1.0, single);
+        coeff = product.coeff();
+        mask = product.mask();
+      } else {
+        mask.x[word] |= xBit ? bit : 0;
+        mask.z[word] |= zBit ? bit : 0;
+      }
+      seen = true;
+    }
+
+    // The grammar turns an empty term into the identity,
+    // leave that quirk to the ANTLR path
+    if (!seen) {
+      return false;
+    }
+    result.emplace_back(coeff, mask);
+
+    if (p == end) {
+      return true;
+    }
+    if (*p == '+') {
+      sign = 1.0;
+    } else if (*p == '-') {
+      sign = -1.0;
+    } else {
+      return false;
+    }
+    p++;
+  }
+}
+} // namespace
+
+std::size_t PauliMaskHash::operator()(const PauliMask &mask) const {
+  std::size_t seed = mask.x.size();
+  for (std::size_t i = 0; i < mask.x.size(); i++) {
+    seed ^= std::hash<std::uint64_t>()(mask.x[i]) + 0x9e3779b9 + (seed << 6) +
+            (seed >> 2);
+    seed ^= std::hash<std::uint64_t>()(mask.z[i]) + 0x9e3779b9 + (seed << 6) +
+            (seed >> 2);
+  }
+  return seed;
+}
+
+void Term::setOps(const std::map<int, std::string> &ops) {
+  _mask.x.clear();
+  _mask.z.clear();
+  for (auto &kv : ops) {
+    if (kv.second == "I" || kv.second.empty()) {
+      continue;
+    }
+    if (kv.first < 0) {
+      xacc::error("Invalid qubit index for Pauli term: " +
+                  std::to_string(kv.first));
+    }
+    std::size_t word = kv.first / wordBits;
+    std::uint64_t bit = std::uint64_t(1) << (kv.first % wordBits);
+    if (word >= _mask.x.size()) {
+      _mask.x.resize(word + 1, 0);
+      _mask.z.resize(word + 1, 0);
+    }
+    if (kv.second == "X") {
+      _mask.x[word] |= bit;
+    } else if (kv.second == "Z") {
+      _mask.z[word] |= bit;
+    } else if (kv.second == "Y") {
+      _mask.x[word] |= bit;
+      _mask.z[word] |= bit;
+    } else {
+      xacc::error("Invalid Pauli operator: " + kv.second);
+    }
+  }
+  trim();
+}
+
+void Term::trim() {
+  auto n = _mask.x.size();
+  while (n > 0 && _mask.x[n - 1] == 0 && _mask.z[n - 1] == 0) {
+    n--;
+  }
+  _mask.x.resize(n);
+  _mask.z.resize(n);
+}
+
+const std::string Term::id() const {
+  std::string s = _var;
+  forEachFactor(_mask, [&](const int q, const char letter) {
+    s += letter;
+    s += std::to_string(q);
+  });
+
+  if (s.empty()) {
+    return "I";
+  }
+
+  return s;
+}
+
+std::map<int, std::string> Term::ops() const {
+  std::map<int, std::string> ops;
+  forEachFactor(_mask, [&](const int q, const char letter) {
+    ops.emplace_hint(ops.end(), q, std::string(1, letter));
+  });
+  return ops;
+}
+
+bool Term::commutes(const Term &v) const {
+  auto n = std::min(_mask.x.size(), v._mask.x.size());
+  int parity = 0;
+  for (std::size_t w = 0; w < n; w++) {
+    parity ^= popcount((_mask.x[w] & v._mask.z[w]) ^ (_mask.z[w] & v._mask.x[w])) & 1;
+  }
+  return parity == 0;
+}
 
 PauliOperator::PauliOperator() {}
 
@@ -43,7 +314,8 @@ PauliOperator::PauliOperator(std::string fromStr) {
 }
 
 PauliOperator::PauliOperator(std::complex<double> c, std::string var) {
-  terms.emplace(std::piecewise_construct, std::forward_as_tuple("I"),
+  terms.emplace(std::piecewise_construct,
+                std::forward_as_tuple(Term::id({}, var)),
                 std::forward_as_tuple(c, var));
 }
 
@@ -116,14 +388,10 @@ PauliOperator::observe(std::shared_ptr<CompositeInstruction> function) {
     // Loop over all terms in the Spin Instruction
     // and create instructions to run on the Gate QPU.
     std::vector<std::shared_ptr<xacc::Instruction>> measurements;
-    auto termsMap = spinInst.ops();
-
     std::vector<std::pair<int, std::string>> terms;
-    for (auto &kv : termsMap) {
-      if (kv.second != "I" && !kv.second.empty()) {
-        terms.push_back({kv.first, kv.second});
-      }
-    }
+    forEachFactor(spinInst.mask(), [&](const int q, const char letter) {
+      terms.push_back({q, std::string(1, letter)});
+    });
 
     for (int i = terms.size() - 1; i >= 0; i--) {
       auto qbit = terms[i].first;
@@ -160,22 +428,152 @@ PauliOperator::observe(std::shared_ptr<CompositeInstruction> function) {
   return observed;
 }
 
+ObservedGroups
+PauliOperator::observeGrouped(std::shared_ptr<CompositeInstruction> function) {
+  auto gateRegistry = xacc::getService<IRProvider>("quantum");
+  auto pi = 3.141592653589793238;
+
+  // Collect the non-identity part of every term, sorted by id
+  // so the partitioning is deterministic
+  std::vector<std::string> ids;
+  for (auto &kv : terms) {
+    ids.push_back(kv.first);
+  }
+  std::sort(ids.begin(), ids.end());
+
+  std::vector<PauliMask> termMasks;
+  for (auto &id : ids) {
+    termMasks.push_back(terms.at(id).mask());
+  }
+
+  // Two terms qubit-wise commute if they agree on every qubit they
+  // both act on, i.e. no qubit in both supports has different x or z bits
+  auto qwc = [](const PauliMask &a, const PauliMask &b) {
+    auto n = std::min(a.x.size(), b.x.size());
+    for (std::size_t w = 0; w < n; w++) {
+      auto both = (a.x[w] | a.z[w]) & (b.x[w] | b.z[w]);
+      if (both & ((a.x[w] ^ b.x[w]) | (a.z[w] ^ b.z[w]))) {
+        return false;
+      }
+    }
+    return true;
+  };
+
+  // Greedy largest-degree-first coloring of the
+  // qubit-wise anti-commutation graph
+  std::vector<int> degree(ids.size(), 0);
+  for (int i = 0; i < ids.size(); i++) {
+    for (int j = i + 1; j < ids.size(); j++) {
+      if (!qwc(termMasks[i], termMasks[j])) {
+        degree[i]++;
+        degree[j]++;
+      }
+    }
+  }
+  std::vector<int> order(ids.size());
+  std::iota(order.begin(), order.end(), 0);
+  std::stable_sort(order.begin(), order.end(),
+                   [&](int a, int b) { return degree[a] > degree[b]; });
+
+  // Each group is characterized by its measurement basis on each
+  // qubit, the union of its terms' masks
+  std::vector<PauliMask> groupBases;
+  std::vector<int> termToGroup(ids.size(), -1);
+  for (auto i : order) {
+    auto &mask = termMasks[i];
+    if (mask.empty()) {
+      continue;
+    }
+    int g = 0;
+    for (; g < groupBases.size(); g++) {
+      if (qwc(mask, groupBases[g])) {
+        break;
+      }
+    }
+    if (g == groupBases.size()) {
+      groupBases.emplace_back();
+    }
+    auto &basis = groupBases[g];
+    if (basis.x.size() < mask.x.size()) {
+      basis.x.resize(mask.x.size(), 0);
+      basis.z.resize(mask.z.size(), 0);
+    }
+    for (std::size_t w = 0; w < mask.x.size(); w++) {
+      basis.x[w] |= mask.x[w];
+      basis.z[w] |= mask.z[w];
+    }
+    termToGroup[i] = g;
+  }
+
+  ObservedGroups observed;
+  for (auto &mask : groupBases) {
+    std::map<int, std::string> basis;
+    forEachFactor(mask, [&](const int q, const char letter) {
+      basis.emplace_hint(basis.end(), q, std::string(1, letter));
+    });
+    auto gateFunction = gateRegistry->createComposite(
+        Term::id(basis), function->getVariables());
+
+    if (function->hasChildren()) {
+      gateFunction->addInstruction(function);
+    }
+
+    std::vector<std::shared_ptr<xacc::Instruction>> measurements;
+    for (auto it = basis.rbegin(); it != basis.rend(); ++it) {
+      std::size_t qbit = it->first;
+      auto meas = gateRegistry->createInstruction(
+          "Measure", std::vector<std::size_t>{qbit});
+      xacc::InstructionParameter classicalIdx(it->first);
+      meas->setParameter(0, classicalIdx);
+      measurements.push_back(meas);
+
+      if (it->second == "X") {
+        auto hadamard = gateRegistry->createInstruction(
+            "H", std::vector<std::size_t>{qbit});
+        gateFunction->addInstruction(hadamard);
+      } else if (it->second == "Y") {
+        auto rx = gateRegistry->createInstruction(
+            "Rx", std::vector<std::size_t>{qbit});
+        InstructionParameter p(pi / 2.0);
+        rx->setParameter(0, p);
+        gateFunction->addInstruction(rx);
+      }
+    }
+
+    for (auto m : measurements) {
+      gateFunction->addInstruction(m);
+    }
+
+    observed.groups.push_back(gateFunction);
+  }
+
+  for (int i = 0; i < ids.size(); i++) {
+    std::vector<std::size_t> qubits;
+    forEachFactor(termMasks[i], [&](const int q, const char letter) {
+      qubits.push_back(q);
+    });
+    observed.termNames.push_back(ids[i]);
+    observed.coefficients.push_back(terms.at(ids[i]).coeff());
+    observed.termToGroup.push_back(termToGroup[i]);
+    observed.termQubits.push_back(qubits);
+  }
+
+  return observed;
+}
+
 std::pair<std::vector<int>, std::vector<int>>
 Term::toBinaryVector(const int nQubits) {
   // return v,w
   std::vector<int> v(nQubits), w(nQubits);
 
-  for (auto &kv : ops()) {
-    auto site = kv.first;
-    auto pauli = kv.second;
-    if (pauli == "X") {
-      w[site] = 1;
-    } else if (pauli == "Z") {
-      v[site] = 1;
-    } else if (pauli == "Y") {
-      v[site] = 1;
-      w[site] = 1;
+  for (int q = 0; q < nQubits; q++) {
+    std::size_t word = q / wordBits;
+    if (word >= _mask.x.size()) {
+      break;
     }
+    int bit = q % wordBits;
+    v[q] = (_mask.z[word] >> bit) & 1;
+    w[q] = (_mask.x[word] >> bit) & 1;
   }
 
   return {v, w};
@@ -186,9 +584,9 @@ std::vector<Triplet> PauliOperator::getSparseMatrixElements() {
   // Get number of qubits
   std::set<int> distinctSites;
   for (auto &kv : terms) {
-    for (auto &kv2 : kv.second.ops()) {
-      distinctSites.insert(kv2.first);
-    }
+    forEachFactor(kv.second.mask(), [&](const int q, const char) {
+      distinctSites.insert(q);
+    });
   }
 
   auto nQubits = distinctSites.size();
@@ -210,15 +608,12 @@ ActionResult Term::action(const std::string &bitString, ActionType type) {
   auto newBits = bitString;
   c i(0, 1);
 
-  for (auto &t : ops()) {
-    auto idx = t.first;
-    auto gate = t.second;
-
-    if (gate == "Z") {
+  forEachFactor(_mask, [&](const int idx, const char gate) {
+    if (gate == 'Z') {
       _coeff *= newBits[idx] == '1' ? -1 : 1;
-    } else if (gate == "X") {
+    } else if (gate == 'X') {
       newBits[idx] = (newBits[idx] == '1' ? '0' : '1');
-    } else if (gate == "Y") {
+    } else if (gate == 'Y') {
       if (type == ActionType::Bra) {
         _coeff *= newBits[idx] == '1' ? i : -i;
       } else {
@@ -226,7 +621,7 @@ ActionResult Term::action(const std::string &bitString, ActionType type) {
       }
       newBits[idx] = (newBits[idx] == '1' ? '0' : '1');
     }
-  }
+  });
 
   return {newBits, _coeff};
 }
@@ -312,22 +707,17 @@ bool PauliOperator::isClose(PauliOperator &other) {
 const std::string PauliOperator::toString() {
   std::stringstream s;
   for (auto &kv : terms) {
-    std::complex<double> c = std::get<0>(kv.second);
-    std::string v = std::get<1>(kv.second);
-    std::map<int, std::string> ops = std::get<2>(kv.second);
+    std::complex<double> c = kv.second.coeff();
+    std::string v = kv.second.var();
 
     s << c << " ";
     if (!v.empty()) {
       s << v << " ";
     }
 
-    for (auto &kv2 : ops) {
-      if (kv2.second == "I") {
-        s << "I ";
-      } else {
-        s << kv2.second << kv2.first << " ";
-      }
-    }
+    forEachFactor(kv.second.mask(), [&](const int q, const char letter) {
+      s << letter << q << " ";
+    });
 
     s << "+ ";
   }
@@ -338,6 +728,19 @@ const std::string PauliOperator::toString() {
 }
 
 void PauliOperator::fromString(const std::string str) {
+  std::vector<Term> parsed;
+  if (!parsePauliString(str, parsed)) {
+    fromStringANTLR(str);
+    return;
+  }
+
+  clear();
+  for (auto &t : parsed) {
+    operator+=(t);
+  }
+}
+
+void PauliOperator::fromStringANTLR(const std::string str) {
   using namespace antlr4;
   using namespace pauli;
 
@@ -375,12 +778,33 @@ bool PauliOperator::contains(PauliOperator &op) {
 }
 
 bool PauliOperator::commutes(PauliOperator &op) {
+  // Termwise commuting operators commute, otherwise anti-commuting
+  // pairs may still cancel so we fall back to the commutator
+  bool termwise = true;
+  for (auto &kv : terms) {
+    for (auto &vkv : op.terms) {
+      if (!kv.second.commutes(vkv.second)) {
+        termwise = false;
+        break;
+      }
+    }
+    if (!termwise) {
+      break;
+    }
+  }
+  if (termwise) {
+    return true;
+  }
   return (op * (*this) - (*this) * op).nTerms() == 0;
 }
 
-void PauliOperator::clear() { terms.clear(); }
+void PauliOperator::clear() {
+  terms.clear();
+  termsVersion = nextVersion();
+}
 
 PauliOperator &PauliOperator::operator+=(const PauliOperator &v) noexcept {
+  termsVersion = nextVersion();
   for (auto &kv : v.terms) {
 
     auto termId = kv.first;
@@ -400,28 +824,55 @@ PauliOperator &PauliOperator::operator+=(const PauliOperator &v) noexcept {
   return *this;
 }
 
+PauliOperator &PauliOperator::operator+=(const Term &v) noexcept {
+  termsVersion = nextVersion();
+  auto termId = v.id();
+  auto it = terms.find(termId);
+  if (it != terms.end()) {
+    it->second.coeff() += v.coeff();
+    if (std::abs(it->second.coeff()) < 1e-12) {
+      terms.erase(it);
+    }
+  } else if (std::abs(v.coeff()) >= 1e-12) {
+    terms.emplace(termId, v);
+  }
+  return *this;
+}
+
 PauliOperator &PauliOperator::operator-=(const PauliOperator &v) noexcept {
   return operator+=(-1.0 * v);
 }
 
 PauliOperator &PauliOperator::operator*=(const PauliOperator &v) noexcept {
 
-  std::unordered_map<std::string, Term> newTerms;
+  // Accumulate products keyed on the bit masks, and
+  // only build string ids for the surviving terms
+  std::vector<Term> products;
+  std::unordered_map<Term, std::size_t, TermKeyHash, TermKeyEqual> index;
+  products.reserve(terms.size() * v.terms.size());
+  index.reserve(terms.size() * v.terms.size());
   for (auto &kv : terms) {
     for (auto &vkv : v.terms) {
       auto multTerm = kv.second * vkv.second;
-      auto id = multTerm.id();
-
-      if (!newTerms.insert({id, multTerm}).second) {
-        newTerms.at(id).coeff() += multTerm.coeff();
+      auto it = index.find(multTerm);
+      if (it != index.end()) {
+        products[it->second].coeff() += multTerm.coeff();
+      } else {
+        index.emplace(multTerm, products.size());
+        products.push_back(std::move(multTerm));
       }
+    }
+  }
 
-      if (std::abs(newTerms.at(id).coeff()) < 1e-12) {
-        newTerms.erase(id);
-      }
+  std::unordered_map<std::string, Term> newTerms;
+  newTerms.reserve(products.size());
+  for (auto &t : products) {
+    if (std::abs(t.coeff()) >= 1e-12) {
+      newTerms.emplace(t.id(), std::move(t));
     }
   }
-  terms = newTerms;
+  terms = std::move(newTerms);
+  termsVersion = nextVersion();
   return *this;
 }
 
@@ -455,8 +906,9 @@ PauliOperator &PauliOperator::operator*=(const double v) noexcept {
 PauliOperator &
 PauliOperator::operator*=(const std::complex<double> v) noexcept {
   for (auto &kv : terms) {
-    std::get<0>(kv.second) *= v;
+    kv.second.coeff() *= v;
   }
+  termsVersion = nextVersion();
   return *this;
 }
 
@@ -507,7 +959,8 @@ std::vector<Triplet> Term::getSparseMatrixElements(const int nQubits) {
     return allCombinations;
   };
 
-  auto nSites = ops().size();
+  auto termOps = ops();
+  auto nSites = termOps.size();
   auto termCombinations = comb(2 * nSites, nSites);
 
   std::map<std::string, std::vector<std::pair<int, int>>> subterms;
@@ -528,7 +981,7 @@ std::vector<Triplet> Term::getSparseMatrixElements(const int nQubits) {
     std::complex<double> coeff(1, 0), i(0, 1);
     for (auto &c : combo) {
 
-      auto iter = ops().begin();
+      auto iter = termOps.begin();
       std::advance(iter, c / 2);
       auto ithOp = iter->second;
       auto ithOpSite = iter->first;
@@ -567,44 +1020,32 @@ std::vector<Triplet> Term::getSparseMatrixElements(const int nQubits) {
 
 Term &Term::operator*=(const Term &v) noexcept {
 
-  coeff() *= std::get<0>(v);
+  coeff() *= v._coeff;
 
-  std::string ss;
-  std::string myVar = std::get<1>(*this);
-  std::string otherVar = std::get<1>(v);
-  if (!myVar.empty()) {
-    if (!otherVar.empty()) {
-      ss = myVar + " " + otherVar;
-    } else {
-      ss = myVar;
-    }
-  } else {
-    if (!otherVar.empty()) {
-      ss = otherVar;
-    }
+  if (!v._var.empty()) {
+    _var = _var.empty() ? v._var : _var + " " + v._var;
   }
 
-  std::get<1>(*this) = ss;
-
-  auto otherOps = std::get<2>(v);
-  for (auto &kv : otherOps) {
-    auto qubit = kv.first;
-    auto gate = kv.second;
-    if (ops().count(qubit)) {
-      // This means, we have a op on same qubit in both
-      // so we need to check its product
-      auto myGate = ops().at(qubit);
-      auto gate_coeff = pauliProducts.at(myGate + gate);
-      if (gate_coeff.second != "I") {
-        ops().at(kv.first) = gate_coeff.second;
-      } else {
-        ops().erase(kv.first);
-      }
-      coeff() *= gate_coeff.first;
-    } else if (gate != "I") {
-      ops().emplace(std::make_pair(qubit, gate));
-    }
+  // With Y = iXZ, P(x,z) = i^|x&z| X^x Z^z, so the product of two
+  // strings picks up i^(|x1&z1| + |x2&z2| + 2|z1&x2| - |x3&z3|)
+  auto n = std::max(_mask.x.size(), v._mask.x.size());
+  _mask.x.resize(n, 0);
+  _mask.z.resize(n, 0);
+  int phase = 0;
+  for (std::size_t w = 0; w < v._mask.x.size(); w++) {
+    auto x1 = _mask.x[w], z1 = _mask.z[w];
+    auto x2 = v._mask.x[w], z2 = v._mask.z[w];
+    auto x3 = x1 ^ x2, z3 = z1 ^ z2;
+    phase += popcount(x1 & z1) + popcount(x2 & z2) + 2 * popcount(z1 & x2) -
+             popcount(x3 & z3);
+    _mask.x[w] = x3;
+    _mask.z[w] = z3;
   }
+  trim();
+
+  static const std::complex<double> iPowers[] = {
+      {1.0, 0.0}, {0.0, 1.0}, {-1.0, 0.0}, {0.0, -1.0}};
+  coeff() *= iPowers[((phase % 4) + 4) % 4];
 
   return *this;
 }
@@ -650,19 +1091,24 @@ int PauliOperator::nQubits() {
     return 0;
 
   for (auto &kv : terms) {
-    auto ops = kv.second.ops();
-    for (auto &kv2 : ops) {
-      if (maxInt < kv2.first) {
-        maxInt = kv2.first;
-      }
+    auto &mask = kv.second.mask();
+    if (mask.empty()) {
+      continue;
+    }
+    auto w = mask.x.size() - 1;
+    auto top = mask.x[w] | mask.z[w];
+    int b = wordBits - 1;
+    while (!((top >> b) & 1)) {
+      b--;
     }
+    maxInt = std::max(maxInt, int(w * wordBits + b));
   }
   return maxInt + 1;
 }
 
 void PauliOperator::fromXACCIR(std::shared_ptr<IR> ir) {
 
-  terms.clear();
+  clear();
 
   for (auto &kernel : ir->getComposites()) {
     std::map<int, std::string> pauliTerm;
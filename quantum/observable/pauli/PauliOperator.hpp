@@ -16,6 +16,8 @@
 #include <unordered_map>
 #include <complex>
 #include <map>
+#include <vector>
+#include <algorithm>
 #include <stdio.h>
 #include <stdlib.h>
 #include <iostream>
@@ -42,9 +44,6 @@ namespace xacc {
 
 namespace quantum {
 
-// A Term can be a coefficient, a variable coefficient, and the terms themselves
-using TermTuple =
-    std::tuple<std::complex<double>, std::string, std::map<int, std::string>>;
 using c = std::complex<double>;
 using ActionResult = std::pair<std::string, c>;
 enum ActionType { Bra, Ket };
@@ -60,105 +59,71 @@ public:
   const std::complex<double> coeff() { return std::get<2>(*this); }
 };
 
-class Term : public TermTuple,
-             public tao::operators::commutative_multipliable<Term>,
+// Packed symplectic form of a Pauli string. Bit q of x (z) is set
+// when the string acts with X (Z) on qubit q, so Y sets both. Trailing
+// all-zero words are trimmed, so equal strings have equal words.
+struct PauliMask {
+  std::vector<std::uint64_t> x;
+  std::vector<std::uint64_t> z;
+
+  bool empty() const { return x.empty(); }
+  bool operator==(const PauliMask &other) const {
+    return x == other.x && z == other.z;
+  }
+  bool operator!=(const PauliMask &other) const { return !(*this == other); }
+};
+
+struct PauliMaskHash {
+  std::size_t operator()(const PauliMask &mask) const;
+};
+
+class Term : public tao::operators::commutative_multipliable<Term>,
              public tao::operators::equality_comparable<Term> {
 
 protected:
-  // static std::map<std::string, std::pair<c, std::string>>
-  void create_map() {
-    // static std::map<std::string, std::pair<c, std::string>> m;
-    pauliProducts.insert({"II", {c(1.0, 0.0), "I"}});
-    pauliProducts.insert({"IX", {c(1.0, 0.0), "X"}});
-    pauliProducts.insert({"XI", {c(1.0, 0.0), "X"}});
-    pauliProducts.insert({"IY", {c(1.0, 0.0), "Y"}});
-    pauliProducts.insert({"YI", {c(1.0, 0.0), "Y"}});
-    pauliProducts.insert({"ZI", {c(1.0, 0.0), "Z"}});
-    pauliProducts.insert({"IZ", {c(1.0, 0.0), "Z"}});
-    pauliProducts.insert({"XX", {c(1.0, 0.0), "I"}});
-    pauliProducts.insert({"YY", {c(1.0, 0.0), "I"}});
-    pauliProducts.insert({"ZZ", {c(1.0, 0.0), "I"}});
-    pauliProducts.insert({"XY", {c(0.0, 1.0), "Z"}});
-    pauliProducts.insert({"XZ", {c(0.0, -1.0), "Y"}});
-    pauliProducts.insert({"YX", {c(0.0, -1.0), "Z"}});
-    pauliProducts.insert({"YZ", {c(0.0, 1.0), "X"}});
-    pauliProducts.insert({"ZX", {c(0.0, 1.0), "Y"}});
-    pauliProducts.insert({"ZY", {c(0.0, -1.0), "X"}});
-    // return m;
-  }
+  std::complex<double> _coeff;
+  std::string _var;
+  PauliMask _mask;
 
-  std::map<std::string, std::pair<c, std::string>> pauliProducts;
+  void setOps(const std::map<int, std::string> &ops);
+  void trim();
 
 public:
-  Term() {
-    std::get<0>(*this) = std::complex<double>(0, 0);
-    std::get<1>(*this) = "";
-    std::get<2>(*this) = {};
-    create_map();
-  }
+  Term() : _coeff(0, 0) {}
 
-  Term(const Term &t) {
-    std::get<0>(*this) = std::get<0>(t);
-    std::get<1>(*this) = std::get<1>(t);
-    std::get<2>(*this) = std::get<2>(t);
-    create_map();
-  }
+  Term(std::complex<double> c) : _coeff(c) {}
 
-  Term(std::complex<double> c) {
-    std::get<0>(*this) = c;
-    std::get<1>(*this) = "";
-    std::get<2>(*this) = {};
-    create_map();
-  }
-
-  Term(double c) {
-    std::get<0>(*this) = std::complex<double>(c, 0);
-    std::get<1>(*this) = "";
-    std::get<2>(*this) = {};
-    create_map();
-  }
+  Term(double c) : _coeff(c, 0) {}
 
-  Term(std::complex<double> c, std::map<int, std::string> ops) {
-    std::get<0>(*this) = c;
-    std::get<1>(*this) = "";
-    std::get<2>(*this) = ops;
-    create_map();
+  Term(std::complex<double> c, std::map<int, std::string> ops) : _coeff(c) {
+    setOps(ops);
   }
 
-  Term(std::string var) {
-    std::get<0>(*this) = std::complex<double>(1, 0);
-    std::get<1>(*this) = var;
-    std::get<2>(*this) = {};
-    create_map();
-  }
+  Term(std::string var) : _coeff(1, 0), _var(var) {}
 
-  Term(std::complex<double> c, std::string var) {
-    std::get<0>(*this) = c;
-    std::get<1>(*this) = var;
-    std::get<2>(*this) = {};
-    create_map();
-  }
+  Term(std::complex<double> c, std::string var) : _coeff(c), _var(var) {}
 
-  Term(std::string var, std::map<int, std::string> ops) {
-    std::get<0>(*this) = std::complex<double>(1, 0);
-    std::get<1>(*this) = var;
-    std::get<2>(*this) = ops;
-    create_map();
+  Term(std::string var, std::map<int, std::string> ops)
+      : _coeff(1, 0), _var(var) {
+    setOps(ops);
   }
 
   Term(std::complex<double> c, std::string var,
-       std::map<int, std::string> ops) {
-    std::get<0>(*this) = c;
-    std::get<1>(*this) = var;
-    std::get<2>(*this) = ops;
-    create_map();
+       std::map<int, std::string> ops)
+      : _coeff(c), _var(var) {
+    setOps(ops);
   }
 
-  Term(std::map<int, std::string> ops) {
-    std::get<0>(*this) = std::complex<double>(1, 0);
-    std::get<1>(*this) = "";
-    std::get<2>(*this) = ops;
-    create_map();
+  Term(std::map<int, std::string> ops) : _coeff(1, 0) { setOps(ops); }
+
+  Term(std::complex<double> c, const PauliMask &mask, const std::string var = "")
+      : _coeff(c), _var(var), _mask(mask) {
+    if (_mask.x.size() != _mask.z.size()) {
+      auto n = std::max(_mask.x.size(), _mask.z.size());
+      _mask.x.resize(n, 0);
+      _mask.z.resize(n, 0);
+    }
+    trim();
   }
 
   static const std::string id(const std::map<int, std::string> &ops,
@@ -178,42 +143,31 @@ public:
     return s;
   }
 
-  const std::string id() const {
-    std::string s;
-    s = std::get<1>(*this);
-    for (auto &t : std::get<2>(*this)) {
-      if (t.second != "I") {
-        s += t.second + std::to_string(t.first);
-      }
-    }
-
-    if (s.empty()) {
-      return "I";
-    }
+  const std::string id() const;
 
-    return s;
-  }
+  // The Pauli string as a qubit to X, Y, Z map, built from the masks
+  std::map<int, std::string> ops() const;
 
-  std::map<int, std::string> &ops() { return std::get<2>(*this); }
+  const PauliMask &mask() const { return _mask; }
 
-  bool isIdentity() {
-    if (ops().empty() || (ops().size() == 1 && ops().begin()->second == "I")) {
-      return true;
-    } else {
-      return false;
-    }
-  }
+  bool isIdentity() const { return _mask.empty(); }
 
-  std::complex<double> &coeff() { return std::get<0>(*this); }
+  std::complex<double> &coeff() { return _coeff; }
+  const std::complex<double> &coeff() const { return _coeff; }
 
-  std::string &var() { return std::get<1>(*this); }
+  std::string &var() { return _var; }
+  const std::string &var() const { return _var; }
 
   Term &operator*=(const Term &v) noexcept;
 
-  bool operator==(const Term &v) noexcept {
-    return (std::get<1>(*this) == std::get<1>(v) && ops() == std::get<2>(v));
+  bool operator==(const Term &v) const noexcept {
+    return (_var == v._var && _mask == v._mask);
   }
 
+  // True if the two Pauli strings commute, i.e. their
+  // symplectic inner product is even
+  bool commutes(const Term &v) const;
+
   std::vector<Triplet> getSparseMatrixElements(const int nQubits);
 
   ActionResult action(const std::string &bitString, ActionType type);
@@ -232,15 +186,28 @@ class PauliOperator
 protected:
   std::unordered_map<std::string, Term> terms;
 
+  // Renewed by every modification, see Observable::version()
+  std::uint64_t termsVersion = nextVersion();
+
 public:
   std::shared_ptr<Observable> clone() override {
       return std::make_shared<PauliOperator>();
   }
 
+  // Mutable iteration can edit coefficients in place, so it counts
+  // as a modification. Read-only iteration goes through the const
+  // overloads and leaves the version alone.
   std::unordered_map<std::string, Term>::iterator begin() {
+    termsVersion = nextVersion();
     return terms.begin();
   }
   std::unordered_map<std::string, Term>::iterator end() { return terms.end(); }
+  std::unordered_map<std::string, Term>::const_iterator begin() const {
+    return terms.begin();
+  }
+  std::unordered_map<std::string, Term>::const_iterator end() const {
+    return terms.end();
+  }
 
   PauliOperator();
   PauliOperator(std::complex<double> c);
@@ -258,6 +225,8 @@ public:
 
   std::vector<std::shared_ptr<CompositeInstruction>>
   observe(std::shared_ptr<CompositeInstruction> function) override;
+  ObservedGroups
+  observeGrouped(std::shared_ptr<CompositeInstruction> function) override;
 
   const std::vector<std::pair<std::string, std::complex<double>>>
   computeActionOnKet(const std::string &bitString);
@@ -272,13 +241,17 @@ public:
 
   const std::string toString() override;
   void fromString(const std::string str) override;
+  std::uint64_t version() override { return termsVersion; }
+  // Parse with the ANTLR grammar only. fromString tries a hand-written
+  // single pass parser first and falls back to this for unusual input.
+  void fromStringANTLR(const std::string str);
 
   bool contains(PauliOperator &op);
   bool commutes(PauliOperator &op);
 
   void mapQubitSites(std::map<int, int> &siteMap) {
     PauliOperator op;
-    for (auto &termKv : *this) {
+    for (auto &termKv : terms) {
       auto ops = termKv.second.ops();
       std::map<int, std::string> nops;
       for (auto &kv : ops) {
@@ -305,6 +278,7 @@ public:
   const int nBits() override {return nQubits();}
 
   PauliOperator &operator+=(const PauliOperator &v) noexcept;
+  PauliOperator &operator+=(const Term &v) noexcept;
   PauliOperator &operator-=(const PauliOperator &v) noexcept;
   PauliOperator &operator*=(const PauliOperator &v) noexcept;
   bool operator==(const PauliOperator &v) noexcept;
@@ -451,6 +451,147 @@ TEST(PauliOperatorTester,checkCommutes) {
     EXPECT_TRUE(op.commutes(zz));
     EXPECT_FALSE(PauliOperator({{0,"X"}}).commutes(y));
 }
+TEST(PauliOperatorTester,checkObserveGrouped) {
+    PauliOperator op(
+        "(0.174073,0) Z2 Z3 + (0.1202,0) Z1 Z3 + (0.165607,0) Z1 Z2 + "
+        "(0.165607,0) Z0 Z3 + (0.1202,0) Z0 Z2 + (-0.0454063,0) Y0 Y1 X2 X3 + "
+        "(-0.220041,0) Z3 + (-0.106477,0) + (0.17028,0) Z0 + (-0.220041,0) Z2 "
+        "+ (0.17028,0) Z1 + (-0.0454063,0) X0 X1 Y2 Y3 + (0.0454063,0) X0 Y1 "
+        "Y2 X3 + (0.168336,0) Z0 Z1 + (0.0454063,0) Y0 X1 X2 Y3");
+
+    auto provider = xacc::getIRProvider("quantum");
+    auto ansatz = provider->createComposite("ansatz");
+    ansatz->addInstruction(provider->createInstruction("X", {0}));
+
+    auto observed = op.observeGrouped(ansatz);
+    EXPECT_EQ(15, observed.termNames.size());
+    EXPECT_EQ(5, observed.groups.size());
+
+    auto terms = op.getTerms();
+    for (int i = 0; i < observed.termNames.size(); i++) {
+        auto g = observed.termToGroup[i];
+        auto& term = terms.at(observed.termNames[i]);
+        if (term.isIdentity()) {
+            EXPECT_EQ(-1, g);
+            continue;
+        }
+        EXPECT_NEAR(std::real(term.coeff()), std::real(observed.coefficients[i]), 1e-12);
+        EXPECT_EQ(term.ops().size(), observed.termQubits[i].size());
+
+        // Every term must qubit-wise commute with the rest of its group
+        for (int j = 0; j < observed.termNames.size(); j++) {
+            if (i == j || observed.termToGroup[j] != g) continue;
+            for (auto& kv : terms.at(observed.termNames[j]).ops()) {
+                if (term.ops().count(kv.first)) {
+                    EXPECT_EQ(term.ops()[kv.first], kv.second);
+                }
+            }
+        }
+    }
+}
+
+TEST(PauliOperatorTester,checkWideTerms) {
+    // Terms spanning more than one 64 bit word
+    PauliOperator a({{3,"X"},{70,"Y"},{130,"Z"}}, 2.0);
+    PauliOperator b({{3,"Y"},{70,"Y"},{129,"X"}});
+
+    auto prod = a * b;
+    EXPECT_EQ(1, prod.nTerms());
+    EXPECT_EQ(131, prod.nQubits());
+    auto term = prod.getTerms().begin()->second;
+    EXPECT_EQ("Z3X129Z130", term.id());
+    EXPECT_NEAR(0.0, std::real(term.coeff()), 1e-12);
+    EXPECT_NEAR(2.0, std::imag(term.coeff()), 1e-12);
+    EXPECT_FALSE(a.commutes(b));
+
+    auto bv = term.toBinaryVector(131);
+    EXPECT_EQ(1, bv.first[3]);
+    EXPECT_EQ(0, bv.second[3]);
+    EXPECT_EQ(1, bv.second[129]);
+    EXPECT_EQ(1, bv.first[130]);
+    EXPECT_EQ(0, bv.first[70]);
+    EXPECT_EQ(0, bv.second[70]);
+
+    // Squaring a Pauli string gives the identity
+    auto sq = a * a;
+    EXPECT_EQ(1, sq.nTerms());
+    EXPECT_TRUE(sq.getTerms().begin()->second.isIdentity());
+    EXPECT_NEAR(4.0, std::real(sq.getTerms().begin()->second.coeff()), 1e-12);
+}
+
+TEST(PauliOperatorTester,checkAddTermFromMask) {
+    PauliOperator expected("2.0 X0 Y1 + 1.5 Z65");
+
+    // X0 Y1 is x = 0b11, z = 0b10, Z65 lives in the second word
+    PauliMask m1, m2;
+    m1.x = {3};
+    m1.z = {2};
+    m2.x = {0, 0};
+    m2.z = {0, 2};
+
+    PauliOperator op;
+    op += Term(2.0, m1);
+    op += Term(1.5, m2);
+    EXPECT_TRUE(op.isClose(expected));
+
+    op += Term(-1.5, m2);
+    EXPECT_EQ(1, op.nTerms());
+}
+
+TEST(PauliOperatorTester,checkFastParser) {
+    std::vector<std::string> srcs{
+        "(0,3.3) Y3 X4",
+        "-0.5 + 2.0 X0 Y1 - 1.5 Z65 + (0.2, -0.1) X 2 Z3",
+        "X0 Y0 + Z1 Z1 + I",
+        "(-0.5,0) X0X1 - 0.25 Z2 + -0.25 Z2"};
+    for (auto &src : srcs) {
+        PauliOperator fast, antlr;
+        fast.fromString(src);
+        antlr.fromStringANTLR(src);
+        EXPECT_TRUE(fast.isClose(antlr));
+    }
+}
+
+TEST(PauliOperatorTester,checkVersion) {
+    PauliOperator op("X0 Z1 + 0.5 Y2");
+    auto v = op.version();
+    EXPECT_NE(0, v);
+
+    // Reading does not change it
+    op.toString();
+    op.nTerms();
+    op.getTerms();
+    int n = 0;
+    const PauliOperator &constOp = op;
+    for (auto &kv : constOp) {
+        n++;
+    }
+    EXPECT_EQ(2, n);
+    EXPECT_EQ(v, op.version());
+
+    // Mutable iteration may edit coefficients
+    for (auto &kv : op) {
+        kv.second.coeff() *= 2.0;
+    }
+    EXPECT_NE(v, op.version());
+    v = op.version();
+
+    op += PauliOperator("Z3");
+    EXPECT_NE(v, op.version());
+    v = op.version();
+    op *= 2.0;
+    EXPECT_NE(v, op.version());
+    v = op.version();
+    op *= PauliOperator("X0");
+    EXPECT_NE(v, op.version());
+    v = op.version();
+    op.clear();
+    EXPECT_NE(v, op.version());
+
+    // Distinct operators never share a version
+    EXPECT_NE(PauliOperator("X0").version(), PauliOperator("X0").version());
+}
+
 int main(int argc, char** argv) {
     xacc::Initialize(argc,argv);
    ::testing::InitGoogleTest(&argc, argv);
@@ -0,0 +1,101 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "BK.hpp"
+#include "PauliOperator.hpp"
+#include <algorithm>
+#include <iterator>
+#include <set>
+
+namespace xacc {
+namespace quantum {
+
+namespace {
+// Qubits storing a sum that includes mode index
+std::set<int> updateSet(int index, const int nModes) {
+  std::set<int> indices;
+  index += 1;
+  while (index <= nModes) {
+    indices.insert(index - 1);
+    index += index & -index;
+  }
+  return indices;
+}
+
+// Qubits whose parity gives the occupation of mode index
+std::set<int> occupationSet(int index) {
+  std::set<int> indices;
+  index += 1;
+  indices.insert(index - 1);
+  int parent = index & (index - 1);
+  index -= 1;
+  while (index != parent) {
+    indices.insert(index - 1);
+    index &= index - 1;
+  }
+  return indices;
+}
+
+// Qubits whose parity gives the parity of modes 0...index-1
+std::set<int> paritySet(int index) {
+  std::set<int> indices;
+  while (index > 0) {
+    indices.insert(index - 1);
+    index &= index - 1;
+  }
+  return indices;
+}
+
+PauliMask toMask(const std::set<int> &xs, const std::set<int> &zs,
+                 const int nModes) {
+  PauliMask mask;
+  mask.x.assign(nModes / 64 + 1, 0);
+  mask.z.assign(nModes / 64 + 1, 0);
+  for (auto i : xs) {
+    mask.x[i / 64] |= std::uint64_t(1) << (i % 64);
+  }
+  for (auto i : zs) {
+    mask.z[i / 64] |= std::uint64_t(1) << (i % 64);
+  }
+  return mask;
+}
+} // namespace
+
+// a_p^dag (a_p) = 1/2 X_U Z_P -(+) i/2 Y_p X_{U \ p} Z_{(P ^ O) \ p}
+// with U, O, P the update, occupation and parity sets of mode p
+std::vector<Term> BK::ladderImage(const int index, const bool isCreation,
+                                  const int nModes) {
+  auto update = updateSet(index, nModes);
+  auto occupation = occupationSet(index);
+  auto parity = paritySet(index);
+
+  std::set<int> remainder;
+  std::set_symmetric_difference(parity.begin(), parity.end(),
+                                occupation.begin(), occupation.end(),
+                                std::inserter(remainder, remainder.end()));
+
+  auto majorana = toMask(update, parity, nModes);
+
+  update.erase(index);
+  remainder.erase(index);
+  auto difference = toMask(update, remainder, nModes);
+  difference.x[index / 64] |= std::uint64_t(1) << (index % 64);
+  difference.z[index / 64] |= std::uint64_t(1) << (index % 64);
+
+  std::complex<double> ycoeff = isCreation ? std::complex<double>(0, -.5)
+                                           : std::complex<double>(0, .5),
+                       xcoeff(.5, 0);
+  return {Term(xcoeff, majorana), Term(ycoeff, difference)};
+}
+
+} // namespace quantum
+} // namespace xacc
@@ -11,59 +11,31 @@
  *   Alexander J. McCaskey - initial API and implementation
  *******************************************************************************/
 #include "JW.hpp"
-#include <memory>
-#include "FermionOperator.hpp"
 #include "PauliOperator.hpp"
 
 namespace xacc {
 namespace quantum {
 
-std::shared_ptr<Observable>
-JW::transform(std::shared_ptr<Observable> observable) {
-
-  auto fermionObservable =
-      std::dynamic_pointer_cast<FermionOperator>(observable);
-
-  if (!fermionObservable) {
-    XACCLogger::instance()->info(
-        "Cannot execute Jordan Wigner on a non-fermion observable.");
-    return observable;
-  }
-
-  auto result = std::make_shared<PauliOperator>();
-
-  auto terms = fermionObservable->getTerms();
-
-  // Loop over all Fermionic terms...
-  for (auto &kv : terms) {
-
-    auto var = kv.second.var();
-    auto coeff = kv.second.coeff();
-    auto operators = kv.second.ops();
-
-    PauliOperator current(coeff, var);
-    for (auto &kv2 : operators) {
-      std::map<int, std::string> zs;
-      auto isCreation = kv2.second;
-
-      int index = kv2.first;
-
-      std::complex<double> ycoeff = isCreation ? std::complex<double>(0, -.5)
-                                               : std::complex<double>(0, .5),
-                           xcoeff(.5, 0);
-
-      for (int j = 0; j < index; j++)
-        zs.emplace(std::make_pair(j, "Z"));
-
-      current *= PauliOperator(zs) * (PauliOperator({{index, "X"}}, xcoeff) +
-                                      PauliOperator({{index, "Y"}}, ycoeff));
-    }
-
-    result->operator+=(current);
+// a_p^dag = 1/2 (X_p - iY_p) Z_0...Z_{p-1}, a_p = 1/2 (X_p + iY_p) Z_0...Z_{p-1}
+std::vector<Term> JW::ladderImage(const int index, const bool isCreation,
+                                  const int nModes) {
+  std::size_t nWords = index / 64 + 1;
+  PauliMask x, y;
+  x.x.assign(nWords, 0);
+  x.z.assign(nWords, 0);
+  for (int j = 0; j < index; j++) {
+    x.z[j / 64] |= std::uint64_t(1) << (j % 64);
   }
-
-  return result;
+  y = x;
+  x.x[index / 64] |= std::uint64_t(1) << (index % 64);
+  y.x[index / 64] |= std::uint64_t(1) << (index % 64);
+  y.z[index / 64] |= std::uint64_t(1) << (index % 64);
+
+  std::complex<double> ycoeff = isCreation ? std::complex<double>(0, -.5)
+                                           : std::complex<double>(0, .5),
+                       xcoeff(.5, 0);
+  return {Term(xcoeff, x), Term(ycoeff, y)};
 }
 
 } // namespace quantum
-} // namespace xacc
\ No newline at end of file
+} // namespace xacc
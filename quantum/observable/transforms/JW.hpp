@@ -12,17 +12,19 @@
  *******************************************************************************/
 #ifndef XACC_IR_OBSERVABLETRANSFORM_JW_HPP_
 #define XACC_IR_OBSERVABLETRANSFORM_JW_HPP_
-#include "ObservableTransform.hpp"
+#include "LadderOperatorTransform.hpp"
 namespace xacc {
 namespace quantum {
-class JW : public ObservableTransform {
+class JW : public LadderOperatorTransform {
 public:
-  std::shared_ptr<Observable>
-  transform(std::shared_ptr<Observable> obs) override;
   const std::string name() const override { return "jw"; }
 
   const std::string description() const override { return ""; }
+
+protected:
+  std::vector<Term> ladderImage(const int index, const bool isCreation,
+                                const int nModes) override;
 };
 } // namespace quantum
 } // namespace xacc
-#endif
\ No newline at end of file
+#endif
@@ -0,0 +1,112 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "LadderOperatorTransform.hpp"
+#include <memory>
+#include "FermionOperator.hpp"
+#include "PauliOperator.hpp"
+#include "xacc.hpp"
+
+namespace xacc {
+namespace quantum {
+
+std::shared_ptr<Observable>
+LadderOperatorTransform::transform(std::shared_ptr<Observable> observable) {
+  return transform(observable, {});
+}
+
+std::shared_ptr<Observable>
+LadderOperatorTransform::transform(std::shared_ptr<Observable> observable,
+                                   const HeterogeneousMap &options) {
+
+  auto fermionObservable =
+      std::dynamic_pointer_cast<FermionOperator>(observable);
+
+  if (!fermionObservable) {
+    XACCLogger::instance()->info("Cannot execute " + name() +
+                                 " on a non-fermion observable.");
+    return observable;
+  }
+
+  int nModes = fermionObservable->nBits();
+  if (options.keyExists<int>("n_qubits")) {
+    auto n = options.get<int>("n_qubits");
+    if (n < nModes) {
+      xacc::error(name() + " transform: n_qubits = " + std::to_string(n) +
+                  " is smaller than the " + std::to_string(nModes) +
+                  " modes of the FermionOperator.");
+    }
+    nModes = n;
+  }
+
+  // Pauli images of each ladder operator, indexed by 2*p + isCreation
+  std::vector<std::vector<Term>> images;
+  auto image = [&](const int index,
+                   const bool isCreation) -> std::vector<Term> & {
+    std::size_t key = 2 * index + (isCreation ? 1 : 0);
+    if (key >= images.size()) {
+      images.resize(key + 1);
+    }
+    if (images[key].empty()) {
+      images[key] = ladderImage(index, isCreation, nModes);
+    }
+    return images[key];
+  };
+
+  // Accumulate every product directly in a hash table
+  // keyed on the variable and the Pauli bit masks
+  std::unordered_map<std::string,
+                     std::unordered_map<PauliMask, std::complex<double>,
+                                        PauliMaskHash>>
+      accumulated;
+
+  auto terms = fermionObservable->getTerms();
+  std::vector<Term> current, next;
+  for (auto &kv : terms) {
+
+    auto var = kv.second.var();
+    auto coeff = kv.second.coeff();
+    auto &operators = kv.second.ops();
+
+    current.assign(1, Term(coeff));
+    for (auto &kv2 : operators) {
+      auto &factors = image(kv2.first, kv2.second);
+      next.clear();
+      next.reserve(current.size() * factors.size());
+      for (auto &t : current) {
+        for (auto &f : factors) {
+          next.push_back(t * f);
+        }
+      }
+      std::swap(current, next);
+    }
+
+    auto &table = accumulated[var];
+    for (auto &t : current) {
+      table[t.mask()] += t.coeff();
+    }
+  }
+
+  auto result = std::make_shared<PauliOperator>();
+  for (auto &varTable : accumulated) {
+    for (auto &kv : varTable.second) {
+      if (std::abs(kv.second) >= 1e-12) {
+        result->operator+=(Term(kv.second, kv.first, varTable.first));
+      }
+    }
+  }
+
+  return result;
+}
+
+} // namespace quantum
+} // namespace xacc
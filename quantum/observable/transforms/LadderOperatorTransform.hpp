@@ -0,0 +1,40 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#ifndef XACC_IR_OBSERVABLETRANSFORM_LADDEROPERATORTRANSFORM_HPP_
+#define XACC_IR_OBSERVABLETRANSFORM_LADDEROPERATORTRANSFORM_HPP_
+#include "ObservableTransform.hpp"
+namespace xacc {
+namespace quantum {
+class Term;
+
+// Base class for fermion to qubit transforms that map every ladder
+// operator to a sum of Pauli strings. Subclasses provide the image of
+// a_p and a_p^dag, transform() memoizes those images and expands each
+// fermion term over packed Pauli masks.
+class LadderOperatorTransform : public ObservableTransform {
+public:
+  std::shared_ptr<Observable>
+  transform(std::shared_ptr<Observable> obs) override;
+  std::shared_ptr<Observable>
+  transform(std::shared_ptr<Observable> obs,
+            const HeterogeneousMap &options) override;
+
+protected:
+  // The Pauli image of a_index (or a_index^dag) on nModes qubits
+  virtual std::vector<Term> ladderImage(const int index,
+                                        const bool isCreation,
+                                        const int nModes) = 0;
+};
+} // namespace quantum
+} // namespace xacc
+#endif
@@ -11,6 +11,9 @@
  *   Alexander J. McCaskey - initial API and implementation
  *******************************************************************************/
 #include "JW.hpp"
+#include "BK.hpp"
+#include "Parity.hpp"
+#include "Taper.hpp"
 
 #include "cppmicroservices/BundleActivator.h"
 #include "cppmicroservices/BundleContext.h"
@@ -34,7 +37,13 @@ public:
    */
   void Start(BundleContext context) {
     auto c = std::make_shared<xacc::quantum::JW>();
+    auto bk = std::make_shared<xacc::quantum::BK>();
+    auto parity = std::make_shared<xacc::quantum::Parity>();
+    auto taper = std::make_shared<xacc::quantum::Taper>();
     context.RegisterService<xacc::ObservableTransform>(c);
+    context.RegisterService<xacc::ObservableTransform>(bk);
+    context.RegisterService<xacc::ObservableTransform>(parity);
+    context.RegisterService<xacc::ObservableTransform>(taper);
   }
 
   /**
@@ -0,0 +1,44 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "Parity.hpp"
+#include "PauliOperator.hpp"
+
+namespace xacc {
+namespace quantum {
+
+// Qubit j stores the parity of modes 0...j, so
+// a_p^dag = 1/2 (Z_{p-1} X_p - iY_p) X_{p+1}...X_{n-1},
+// a_p = 1/2 (Z_{p-1} X_p + iY_p) X_{p+1}...X_{n-1}
+std::vector<Term> Parity::ladderImage(const int index, const bool isCreation,
+                                      const int nModes) {
+  std::size_t nWords = nModes / 64 + 1;
+  PauliMask x, y;
+  x.x.assign(nWords, 0);
+  x.z.assign(nWords, 0);
+  for (int j = index; j < nModes; j++) {
+    x.x[j / 64] |= std::uint64_t(1) << (j % 64);
+  }
+  y = x;
+  if (index > 0) {
+    x.z[(index - 1) / 64] |= std::uint64_t(1) << ((index - 1) % 64);
+  }
+  y.z[index / 64] |= std::uint64_t(1) << (index % 64);
+
+  std::complex<double> ycoeff = isCreation ? std::complex<double>(0, -.5)
+                                           : std::complex<double>(0, .5),
+                       xcoeff(.5, 0);
+  return {Term(xcoeff, x), Term(ycoeff, y)};
+}
+
+} // namespace quantum
+} // namespace xacc
@@ -0,0 +1,238 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "Taper.hpp"
+#include "xacc.hpp"
+#include <bitset>
+#include <sstream>
+
+namespace xacc {
+namespace quantum {
+
+namespace {
+using Bits = std::vector<std::uint64_t>;
+
+bool testBit(const Bits &b, const int q) {
+  return q / 64 < b.size() && ((b[q / 64] >> (q % 64)) & 1);
+}
+
+void flipBit(Bits &b, const int q) { b[q / 64] ^= std::uint64_t(1) << (q % 64); }
+
+int parity(const Bits &a, const Bits &b) {
+  int count = 0;
+  for (std::size_t w = 0; w < std::min(a.size(), b.size()); w++) {
+    count += std::bitset<64>(a[w] & b[w]).count();
+  }
+  return count % 2;
+}
+} // namespace
+
+std::vector<std::vector<std::uint64_t>>
+Taper::findZ2Symmetries(PauliOperator &op, const int nQubits) {
+  // Z(s) commutes with a term iff x.s = 0 mod 2, so the symmetries
+  // are the GF(2) null space of the matrix of X bits of every term
+  std::size_t nWords = nQubits / 64 + 1;
+  std::vector<Bits> rows;
+  for (auto &kv : op.getTerms()) {
+    Bits row = kv.second.mask().x;
+    row.resize(nWords, 0);
+    rows.push_back(row);
+  }
+
+  // Reduced row echelon form
+  std::vector<int> pivots;
+  std::size_t rank = 0;
+  for (int col = 0; col < nQubits && rank < rows.size(); col++) {
+    std::size_t pivot = rank;
+    while (pivot < rows.size() && !testBit(rows[pivot], col)) {
+      pivot++;
+    }
+    if (pivot == rows.size()) {
+      continue;
+    }
+    std::swap(rows[rank], rows[pivot]);
+    for (std::size_t r = 0; r < rows.size(); r++) {
+      if (r != rank && testBit(rows[r], col)) {
+        for (std::size_t w = 0; w < nWords; w++) {
+          rows[r][w] ^= rows[rank][w];
+        }
+      }
+    }
+    pivots.push_back(col);
+    rank++;
+  }
+
+  // One null space vector per free column
+  std::vector<Bits> symmetries;
+  std::vector<bool> isPivot(nQubits, false);
+  for (auto p : pivots) {
+    isPivot[p] = true;
+  }
+  for (int col = 0; col < nQubits; col++) {
+    if (isPivot[col]) {
+      continue;
+    }
+    Bits s(nWords, 0);
+    flipBit(s, col);
+    for (std::size_t r = 0; r < pivots.size(); r++) {
+      if (testBit(rows[r], col)) {
+        flipBit(s, pivots[r]);
+      }
+    }
+    symmetries.push_back(s);
+  }
+
+  return symmetries;
+}
+
+TaperingResult Taper::taper(std::shared_ptr<PauliOperator> op,
+                            const HeterogeneousMap &options) {
+  TaperingResult result;
+  result.reduced = std::make_shared<PauliOperator>();
+
+  const int nQubits = op->nQubits();
+  auto symmetries = findZ2Symmetries(*op, nQubits);
+
+  // Each symmetry needs a qubit where it alone acts, the free
+  // columns of the elimination above always do
+  std::vector<Term> taus, xs;
+  for (std::size_t i = 0; i < symmetries.size(); i++) {
+    int qubit = -1;
+    for (int q = 0; q < nQubits && qubit < 0; q++) {
+      if (!testBit(symmetries[i], q)) {
+        continue;
+      }
+      bool unique = true;
+      for (std::size_t j = 0; j < symmetries.size(); j++) {
+        if (j != i && testBit(symmetries[j], q)) {
+          unique = false;
+          break;
+        }
+      }
+      if (unique) {
+        qubit = q;
+      }
+    }
+
+    PauliMask tau, x;
+    tau.z = symmetries[i];
+    tau.x.assign(tau.z.size(), 0);
+    x.x.assign(qubit / 64 + 1, 0);
+    x.z.assign(qubit / 64 + 1, 0);
+    flipBit(x.x, qubit);
+    taus.emplace_back(1.0, tau);
+    xs.emplace_back(1.0, x);
+
+    result.symmetries.emplace_back();
+    result.symmetries.back() += taus.back();
+    result.qubits.push_back(qubit);
+  }
+
+  // Pick the symmetry sector
+  if (options.keyExists<std::vector<int>>("sector")) {
+    result.sector = options.get<std::vector<int>>("sector");
+    if (result.sector.size() != symmetries.size()) {
+      xacc::error("taper: sector has " + std::to_string(result.sector.size()) +
+                  " entries but the operator has " +
+                  std::to_string(symmetries.size()) + " Z2 symmetries.");
+    }
+    for (auto l : result.sector) {
+      if (l != 1 && l != -1) {
+        xacc::error("taper: sector entries must be +1 or -1.");
+      }
+    }
+  } else if (options.keyExists<std::vector<int>>("reference")) {
+    auto reference = options.get<std::vector<int>>("reference");
+    Bits occupied(nQubits / 64 + 1, 0);
+    for (int q = 0; q < std::min((int)reference.size(), nQubits); q++) {
+      if (reference[q]) {
+        flipBit(occupied, q);
+      }
+    }
+    for (auto &s : symmetries) {
+      result.sector.push_back(parity(s, occupied) ? -1 : 1);
+    }
+  } else {
+    result.sector.assign(symmetries.size(), 1);
+  }
+
+  // Index of every remaining qubit in the reduced operator
+  std::vector<int> newIndex(nQubits, 0);
+  std::vector<bool> removed(nQubits, false);
+  for (auto q : result.qubits) {
+    removed[q] = true;
+  }
+  for (int q = 0, next = 0; q < nQubits; q++) {
+    newIndex[q] = removed[q] ? -1 : next++;
+  }
+
+  // Apply U_i = (X_q + tau_i) / sqrt(2), which maps a term P that
+  // anticommutes with X_q to X_q tau_i P and leaves the rest alone.
+  // Every term then holds I or X on q, and X is replaced by the sector.
+  for (auto &kv : op->getTerms()) {
+    Term term = kv.second;
+    for (std::size_t i = 0; i < taus.size(); i++) {
+      if (testBit(term.mask().z, result.qubits[i])) {
+        term = xs[i] * taus[i] * term;
+      }
+    }
+
+    std::complex<double> coeff = term.coeff();
+    for (std::size_t i = 0; i < taus.size(); i++) {
+      if (testBit(term.mask().x, result.qubits[i])) {
+        coeff *= result.sector[i];
+      }
+    }
+
+    std::map<int, std::string> ops;
+    for (auto &o : term.ops()) {
+      if (!removed[o.first]) {
+        ops.insert({newIndex[o.first], o.second});
+      }
+    }
+    result.reduced->operator+=(Term(coeff, term.var(), ops));
+  }
+
+  return result;
+}
+
+std::shared_ptr<Observable>
+Taper::transform(std::shared_ptr<Observable> observable) {
+  return transform(observable, {});
+}
+
+std::shared_ptr<Observable>
+Taper::transform(std::shared_ptr<Observable> observable,
+                 const HeterogeneousMap &options) {
+  auto pauli = std::dynamic_pointer_cast<PauliOperator>(observable);
+  if (!pauli) {
+    XACCLogger::instance()->info(
+        "Cannot execute qubit tapering on a non-pauli observable.");
+    return observable;
+  }
+
+  auto result = taper(pauli, options);
+
+  std::stringstream ss;
+  ss << "Tapered " << result.qubits.size() << " qubits [";
+  for (std::size_t i = 0; i < result.qubits.size(); i++) {
+    ss << (i ? ", " : "") << result.qubits[i] << ":"
+       << (result.sector[i] > 0 ? "+" : "-");
+  }
+  ss << "]";
+  xacc::info(ss.str());
+
+  return result.reduced;
+}
+
+} // namespace quantum
+} // namespace xacc
@@ -0,0 +1,59 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#ifndef XACC_IR_OBSERVABLETRANSFORM_TAPER_HPP_
+#define XACC_IR_OBSERVABLETRANSFORM_TAPER_HPP_
+#include "ObservableTransform.hpp"
+#include "PauliOperator.hpp"
+
+namespace xacc {
+namespace quantum {
+
+// The outcome of tapering a PauliOperator. Symmetry i is the
+// Z string symmetries[i], it is rotated onto X_{qubits[i]}, which is
+// then replaced by its eigenvalue sector[i] and removed.
+struct TaperingResult {
+  std::shared_ptr<PauliOperator> reduced;
+  std::vector<PauliOperator> symmetries;
+  std::vector<int> qubits;
+  std::vector<int> sector;
+};
+
+// Remove qubits from a PauliOperator using its Z2 symmetries
+// (Bravyi et al, arXiv:1701.08213). Accepts a "sector" option (one +/-1
+// per symmetry) or a "reference" option (computational basis state,
+// one 0/1 per qubit, e.g. Hartree-Fock) that fixes the sector.
+// Defaults to the +1 sector of every symmetry.
+class Taper : public ObservableTransform {
+public:
+  std::shared_ptr<Observable>
+  transform(std::shared_ptr<Observable> obs) override;
+  std::shared_ptr<Observable>
+  transform(std::shared_ptr<Observable> obs,
+            const HeterogeneousMap &options) override;
+
+  TaperingResult taper(std::shared_ptr<PauliOperator> op,
+                       const HeterogeneousMap &options = {});
+
+  // Z strings, as qubit bit masks, that commute with every term of op
+  static std::vector<std::vector<std::uint64_t>>
+  findZ2Symmetries(PauliOperator &op, const int nQubits);
+
+  const std::string name() const override { return "taper"; }
+
+  const std::string description() const override {
+    return "Remove qubits using the Z2 symmetries of a PauliOperator.";
+  }
+};
+} // namespace quantum
+} // namespace xacc
+#endif
@@ -0,0 +1,95 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include <gtest/gtest.h>
+#include "xacc.hpp"
+#include "BK.hpp"
+#include "Parity.hpp"
+#include "FermionOperator.hpp"
+#include "PauliOperator.hpp"
+
+using namespace xacc::quantum;
+
+namespace {
+// Check {a_i, a_j^dag} = delta_ij and {a_i, a_j} = 0 on nModes qubits
+void checkAnticommutation(xacc::ObservableTransform &t, const int nModes) {
+  std::vector<PauliOperator> a, adag;
+  for (int i = 0; i < nModes; i++) {
+    auto ai = std::make_shared<FermionOperator>(Operators{{i, 0}}, 1.0);
+    auto aidag = std::make_shared<FermionOperator>(Operators{{i, 1}}, 1.0);
+    a.push_back(*std::dynamic_pointer_cast<PauliOperator>(
+        t.transform(ai, {std::make_pair("n_qubits", nModes)})));
+    adag.push_back(*std::dynamic_pointer_cast<PauliOperator>(
+        t.transform(aidag, {std::make_pair("n_qubits", nModes)})));
+  }
+
+  PauliOperator zero;
+  for (int i = 0; i < nModes; i++) {
+    for (int j = 0; j < nModes; j++) {
+      PauliOperator expected = i == j ? PauliOperator(1.0) : PauliOperator();
+      PauliOperator anti = a[i] * adag[j] + adag[j] * a[i];
+      PauliOperator anti2 = a[i] * a[j] + a[j] * a[i];
+      EXPECT_TRUE(anti.isClose(expected));
+      EXPECT_TRUE(anti2.isClose(zero));
+    }
+  }
+}
+} // namespace
+
+TEST(BravyiKitaevTransformationTester, checkNumberOperator) {
+  auto fermion = std::make_shared<FermionOperator>("1^ 1");
+  BK t;
+  auto result = std::dynamic_pointer_cast<PauliOperator>(
+      t.transform(fermion, {std::make_pair("n_qubits", 4)}));
+
+  // Qubit 1 stores the parity of modes 0 and 1
+  PauliOperator expected("0.5 - 0.5 Z0 Z1");
+  EXPECT_TRUE(result->isClose(expected));
+}
+
+TEST(BravyiKitaevTransformationTester, checkAnticommutation) {
+  BK t;
+  checkAnticommutation(t, 6);
+  checkAnticommutation(t, 8);
+}
+
+TEST(ParityTransformationTester, checkNumberOperator) {
+  auto fermion = std::make_shared<FermionOperator>("2^ 2");
+  Parity t;
+  auto result = std::dynamic_pointer_cast<PauliOperator>(t.transform(fermion));
+
+  PauliOperator expected("0.5 - 0.5 Z1 Z2");
+  EXPECT_TRUE(result->isClose(expected));
+}
+
+TEST(ParityTransformationTester, checkAnticommutation) {
+  Parity t;
+  checkAnticommutation(t, 5);
+}
+
+TEST(ParityTransformationTester, checkNQubitsOption) {
+  // The X string extends to the requested number of qubits
+  auto fermion = std::make_shared<FermionOperator>("0^");
+  Parity t;
+  auto result = std::dynamic_pointer_cast<PauliOperator>(
+      t.transform(fermion, {std::make_pair("n_qubits", 3)}));
+  PauliOperator expected("0.5 X0 X1 X2 + (0,-0.5) Y0 X1 X2");
+  EXPECT_TRUE(result->isClose(expected));
+}
+
+int main(int argc, char **argv) {
+  xacc::Initialize(argc, argv);
+  ::testing::InitGoogleTest(&argc, argv);
+  auto ret = RUN_ALL_TESTS();
+  xacc::Finalize();
+  return ret;
+}
@@ -40,6 +40,28 @@ TEST(JordanWignerTransformationTester, checkEasyTransform) {
   EXPECT_TRUE(std::dynamic_pointer_cast<PauliOperator>(result)->operator==(op));
 }
 
+TEST(JordanWignerTransformationTester, checkWideTransform) {
+  // The Z string of a_70^ spans more than one 64 bit word
+  auto fermion = std::make_shared<FermionOperator>("0.5 70^ 0 + 0.5 0^ 70");
+  *fermion += FermionOperator(Operators{{1, 1}, {1, 0}}, 1.0, "t0");
+  JW t;
+  auto result = std::dynamic_pointer_cast<PauliOperator>(t.transform(fermion));
+
+  // 1/4 (X0 X70 + Y0 Y70) Z1...Z69 + t0 1/2 (I - Z1)
+  PauliOperator expected;
+  std::map<int, std::string> xx{{0, "X"}, {70, "X"}}, yy{{0, "Y"}, {70, "Y"}};
+  for (int i = 1; i < 70; i++) {
+    xx.insert({i, "Z"});
+    yy.insert({i, "Z"});
+  }
+  expected += PauliOperator(xx, 0.25) + PauliOperator(yy, 0.25);
+  expected += PauliOperator(std::complex<double>(0.5, 0.0), "t0") +
+              PauliOperator({{1, "Z"}}, std::complex<double>(-0.5, 0.0), "t0");
+
+  EXPECT_EQ(71, result->nQubits());
+  EXPECT_TRUE(result->isClose(expected));
+}
+
 // TEST(JordanWignerTransformationTester,checkH2Transform) {
 
 // 	const std::string code =
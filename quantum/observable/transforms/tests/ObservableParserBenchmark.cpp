@@ -0,0 +1,85 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "JW.hpp"
+#include "xacc.hpp"
+#include "FermionOperator.hpp"
+#include "PauliOperator.hpp"
+#include <chrono>
+#include <fstream>
+#include <functional>
+
+using namespace xacc::quantum;
+
+// Parse the NaH (6 qubit, STO-3G) Hamiltonian from the python benchmark
+// generators, and its Jordan-Wigner transform, with the hand-written
+// parsers and with ANTLR, and report the throughput of each.
+int main(int argc, char **argv) {
+  xacc::Initialize(argc, argv);
+
+  std::string fileName = NAH_HAMILTONIAN_FILE;
+  if (argc > 1) {
+    fileName = argv[1];
+  }
+  std::ifstream stream(fileName);
+  std::string contents((std::istreambuf_iterator<char>(stream)),
+                       std::istreambuf_iterator<char>());
+  auto start = contents.find("src = \"\"\"");
+  auto end = contents.find("\"\"\"", start + 9);
+  if (start == std::string::npos || end == std::string::npos) {
+    xacc::error("Could not find the NaH Hamiltonian in " + fileName);
+  }
+  auto fermionSrc = contents.substr(start + 9, end - start - 9);
+
+  auto fermion = std::make_shared<FermionOperator>(fermionSrc);
+  JW jw;
+  auto pauliSrc = jw.transform(fermion)->toString();
+
+  const int nReps = 50;
+  auto run = [&](const std::string label, const std::string &src,
+                 std::function<void()> parse) {
+    auto start = std::chrono::high_resolution_clock::now();
+    for (int k = 0; k < nReps; k++) {
+      parse();
+    }
+    auto end = std::chrono::high_resolution_clock::now();
+
+    auto total =
+        std::chrono::duration_cast<std::chrono::microseconds>(end - start)
+            .count();
+    std::cout << label << ": " << nReps << " parses in " << total / 1000.
+              << " ms (" << (double)src.size() * nReps / total
+              << " MB/s)\n";
+  };
+
+  FermionOperator fastFermion, antlrFermion;
+  std::cout << "NaH fermion operator, " << fermionSrc.size() << " chars, "
+            << fermion->getTerms().size() << " terms\n";
+  run("  fast ", fermionSrc, [&]() { fastFermion.fromString(fermionSrc); });
+  run("  ANTLR", fermionSrc,
+      [&]() { antlrFermion.fromStringANTLR(fermionSrc); });
+  if (!(fastFermion == antlrFermion)) {
+    xacc::error("Fermion parsers disagree on the NaH Hamiltonian.");
+  }
+
+  PauliOperator fastPauli, antlrPauli;
+  std::cout << "NaH Jordan-Wigner pauli operator, " << pauliSrc.size()
+            << " chars\n";
+  run("  fast ", pauliSrc, [&]() { fastPauli.fromString(pauliSrc); });
+  run("  ANTLR", pauliSrc, [&]() { antlrPauli.fromStringANTLR(pauliSrc); });
+  if (!fastPauli.isClose(antlrPauli)) {
+    xacc::error("Pauli parsers disagree on the NaH Hamiltonian.");
+  }
+
+  xacc::Finalize();
+  return 0;
+}
@@ -0,0 +1,104 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include <gtest/gtest.h>
+#include "xacc.hpp"
+#include "JW.hpp"
+#include "Taper.hpp"
+#include "FermionOperator.hpp"
+#include "PauliOperator.hpp"
+#include <Eigen/Dense>
+
+using namespace xacc::quantum;
+
+namespace {
+const std::string h2 = R"src(0.7080240949826064
+- 1.248846801817026 0^ 0
+- 1.248846801817026 1^ 1
+- 0.4796778151607899 2^ 2
+- 0.4796778151607899 3^ 3
++ 0.33667197218932576 0^ 1^ 1 0
++ 0.0908126658307406 0^ 1^ 3 2
++ 0.09081266583074038 0^ 2^ 0 2
++ 0.331213646878486 0^ 2^ 2 0
++ 0.09081266583074038 0^ 3^ 1 2
++ 0.331213646878486 0^ 3^ 3 0
++ 0.33667197218932576 1^ 0^ 0 1
++ 0.0908126658307406 1^ 0^ 2 3
++ 0.09081266583074038 1^ 2^ 0 3
++ 0.331213646878486 1^ 2^ 2 1
++ 0.09081266583074038 1^ 3^ 1 3
++ 0.331213646878486 1^ 3^ 3 1
++ 0.331213646878486 2^ 0^ 0 2
++ 0.09081266583074052 2^ 0^ 2 0
++ 0.331213646878486 2^ 1^ 1 2
++ 0.09081266583074052 2^ 1^ 3 0
++ 0.09081266583074048 2^ 3^ 1 0
++ 0.34814578469185886 2^ 3^ 3 2
++ 0.331213646878486 3^ 0^ 0 3
++ 0.09081266583074052 3^ 0^ 2 1
++ 0.331213646878486 3^ 1^ 1 3
++ 0.09081266583074052 3^ 1^ 3 1
++ 0.09081266583074048 3^ 2^ 0 1
++ 0.34814578469185886 3^ 2^ 2 3)src";
+
+double groundState(PauliOperator &op, const int nQubits) {
+  auto dense = op.toDenseMatrix(nQubits);
+  int dim = 1 << nQubits;
+  Eigen::MatrixXcd m(dim, dim);
+  for (int i = 0; i < dim; i++) {
+    for (int j = 0; j < dim; j++) {
+      m(i, j) = dense[i * dim + j];
+    }
+  }
+  Eigen::SelfAdjointEigenSolver<Eigen::MatrixXcd> solver(m);
+  return solver.eigenvalues()(0);
+}
+} // namespace
+
+TEST(TaperTester, checkSimple) {
+  // Z0 Z1 is the only symmetry, it is rotated to X0 and replaced by the sector
+  auto op = std::make_shared<PauliOperator>("Z0 Z1 + X0 X1");
+  Taper t;
+
+  auto plus = t.taper(op);
+  EXPECT_EQ(1, plus.qubits.size());
+  EXPECT_EQ(0, plus.qubits[0]);
+  PauliOperator symmetry("Z0 Z1"), expected("1.0 + X0");
+  EXPECT_TRUE(plus.symmetries[0] == symmetry);
+  EXPECT_TRUE(plus.reduced->isClose(expected));
+
+  auto minus = t.taper(op, {std::make_pair("sector", std::vector<int>{-1})});
+  expected *= -1.0;
+  EXPECT_TRUE(minus.reduced->isClose(expected));
+}
+
+TEST(TaperTester, checkH2) {
+  auto fermion = std::make_shared<FermionOperator>(h2);
+  JW jw;
+  auto h = std::dynamic_pointer_cast<PauliOperator>(jw.transform(fermion));
+
+  // The Hartree-Fock state fixes the sector of the ground state
+  Taper t;
+  auto reduced = std::dynamic_pointer_cast<PauliOperator>(t.transform(
+      h, {std::make_pair("reference", std::vector<int>{1, 1, 0, 0})}));
+  EXPECT_EQ(1, reduced->nQubits());
+  EXPECT_NEAR(groundState(*h, 4), groundState(*reduced, 1), 1e-8);
+}
+
+int main(int argc, char **argv) {
+  xacc::Initialize(argc, argv);
+  ::testing::InitGoogleTest(&argc, argv);
+  auto ret = RUN_ALL_TESTS();
+  xacc::Finalize();
+  return ret;
+}
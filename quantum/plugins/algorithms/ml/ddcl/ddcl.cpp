@@ -57,6 +57,8 @@ bool DDCL::initialize(const HeterogeneousMap &parameters) {
     persistBuffer = parameters.get<bool>("persist-buffer");
   }
 
+  history = AlgorithmHistory(parameters, "loss");
+
   _parameters = parameters;
   return true;
 }
@@ -70,19 +72,26 @@ void DDCL::execute(const std::shared_ptr<AcceleratorBuffer> buffer) const {
 
   auto provider = xacc::getIRProvider("quantum");
 
+  // Add measurements to all qubits on a copy of the
+  // kernel and bind it once for the whole optimization
+  auto measured =
+      std::dynamic_pointer_cast<CompositeInstruction>(kernel->clone());
+  std::set<std::size_t> uniqueBits = kernel->uniqueBits();
+  for (auto b : uniqueBits) {
+    auto m =
+        provider->createInstruction("Measure", std::vector<std::size_t>{b});
+    measured->addInstruction(m);
+  }
+  auto boundKernel = measured->bind();
+  auto iterations = history;
+
   // Here we just need to make a lambda kernel
   // to optimize that makes calls to the targeted QPU.
   OptFunction f(
       [&, this](const std::vector<double> &x, std::vector<double> &dx) {
-        // Evaluate and add measurements to all qubits
-        auto evaled = kernel->operator()(x);
-
-        std::set<std::size_t> uniqueBits = kernel->uniqueBits();
-        for (auto b : uniqueBits) {
-          auto m = provider->createInstruction("Measure",
-                                               std::vector<std::size_t>{b});
-          evaled->addInstruction(m);
-        }
+        // Evaluate the measured kernel
+        auto evaled = boundKernel ? boundKernel->operator()(x)
+                                  : measured->operator()(x);
 
         // Start the list of circuits to execute
         std::vector<Circuit> circuits{evaled};
@@ -114,9 +123,10 @@ void DDCL::execute(const std::shared_ptr<AcceleratorBuffer> buffer) const {
         accelerator->execute(tmpBuffer, circuits);
         auto buffers = tmpBuffer->getChildren();
 
+        std::vector<AcceleratorBufferChildPair> children;
         for (auto b : buffers) {
           b->addExtraInfo("parameters", x);
-          buffer->appendChild(b->name(), b);
+          children.push_back({b->name(), b});
         }
 
         // The first child buffer is for the loss function
@@ -153,6 +163,8 @@ void DDCL::execute(const std::shared_ptr<AcceleratorBuffer> buffer) const {
 
           lossBufferPtr->addExtraInfo("gradient", dx);
         }
+        iterations.record(buffer, children, x, loss);
+
         std::stringstream ss;
         ss << x << ") = " << std::setprecision(12) << loss;
         xacc::info("Loss(" + ss.str());
@@ -161,6 +173,7 @@ void DDCL::execute(const std::shared_ptr<AcceleratorBuffer> buffer) const {
       kernel->nVariables());
 
   auto result = optimizer->optimize(f);
+  iterations.flush(buffer);
 
   buffer->addExtraInfo("opt-val", ExtraInfo(result.first));
   buffer->addExtraInfo("opt-params", ExtraInfo(result.second));
@@ -226,11 +239,14 @@ DDCL::execute(const std::shared_ptr<AcceleratorBuffer> buffer,
   auto loss_and_qdist = lossStrategy->compute(counts, target_dist);
   auto loss = loss_and_qdist.first;
   auto qdist = loss_and_qdist.second;
+  std::vector<AcceleratorBufferChildPair> children;
   for (auto b : buffers) {
     b->addExtraInfo("parameters", x);
     b->addExtraInfo("q_dist", qdist);
-    buffer->appendChild(b->name(), b);
+    children.push_back({b->name(), b});
   }
+  history.record(buffer, children, x, loss);
+  history.flush(buffer);
 
   return {loss};
 }
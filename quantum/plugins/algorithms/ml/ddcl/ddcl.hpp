@@ -14,6 +14,7 @@
 #define XACC_ALGORITHM_DDCL_HPP_
 
 #include "Algorithm.hpp"
+#include "AlgorithmHistory.hpp"
 #include <vector>
 
 namespace xacc {
@@ -66,6 +67,8 @@ protected:
   std::string gradient;
   std::string loss;
   bool persistBuffer = false;
+  // What each iteration keeps on the buffer, see AlgorithmHistory
+  AlgorithmHistory history;
 
   HeterogeneousMap _parameters;
 
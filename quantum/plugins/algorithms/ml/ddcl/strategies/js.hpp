@@ -112,25 +112,12 @@ public:
                const std::vector<double> &target_dist) override {
     assert(2 * grad.size() == results.size());
 
-    // Get the number of shosts
-    int shots = 0;
-    for (auto &x : results[0]->getMeasurementCounts()) {
-      shots += x.second;
-    }
-
     // Create q+ and q- vectors
     int counter = 0;
     std::vector<std::vector<double>> qplus_theta, qminus_theta;
     for (int i = 0; i < results.size(); i += 2) {
-      std::vector<double> qp(q_dist.size()), qm(q_dist.size());
-      for (auto &x : results[i]->getMeasurementCounts()) {
-        int idx = std::stoi(x.first, nullptr, 2);
-        qp[idx] = (double)x.second / shots;
-      }
-      for (auto &x : results[i + 1]->getMeasurementCounts()) {
-        int idx = std::stoi(x.first, nullptr, 2);
-        qm[idx] = (double)x.second / shots;
-      }
+      auto qp = results[i]->getProbabilities();
+      auto qm = results[i + 1]->getProbabilities();
 
       std::vector<double> shiftedp = currentParameterSet;
       std::vector<double> shiftedm = currentParameterSet;
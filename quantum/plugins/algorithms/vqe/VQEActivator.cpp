@@ -34,7 +34,9 @@ public:
    */
   void Start(BundleContext context) {
     auto c = std::make_shared<xacc::algorithm::VQE>();
+    auto e = std::make_shared<xacc::algorithm::VQEEnergy>();
     context.RegisterService<xacc::Algorithm>(c);
+    context.RegisterService<xacc::Algorithm>(e);
   }
 
   /**
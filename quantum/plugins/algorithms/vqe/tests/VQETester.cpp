@@ -71,6 +71,228 @@ TEST(VQETester, checkSimple) {
   }
 }
 
+TEST(VQETester, checkParameterShift) {
+  if (xacc::hasAccelerator("tnqvm")) {
+    auto acc = xacc::getAccelerator("tnqvm", {std::make_pair("vqe-mode",true)});
+    auto compiler = xacc::getCompiler("xasm");
+
+    // A negated angle, as the exp and uccsd generators emit, works too
+    auto negated = rucc;
+    negated.replace(negated.find("Rz(q[3], t0)"), 12, "Rz(q[3], -t0)");
+    for (auto &src : {rucc, negated}) {
+      auto buffer = xacc::qalloc(4);
+      auto ir = compiler->compile(src, nullptr);
+      auto ruccsd = ir->getComposite("f");
+
+      // l-bfgs needs the gradient VQE computes by parameter shift
+      auto optimizer = xacc::getOptimizer(
+          "nlopt", {std::make_pair("nlopt-optimizer", "l-bfgs")});
+      std::shared_ptr<Observable> observable = std::make_shared<xacc::quantum::PauliOperator>(
+          "(0.174073,0) Z2 Z3 + (0.1202,0) Z1 Z3 + (0.165607,0) Z1 Z2 + "
+          "(0.165607,0) Z0 Z3 + (0.1202,0) Z0 Z2 + (-0.0454063,0) Y0 Y1 X2 X3 + "
+          "(-0.220041,0) Z3 + (-0.106477,0) + (0.17028,0) Z0 + (-0.220041,0) Z2 "
+          "+ (0.17028,0) Z1 + (-0.0454063,0) X0 X1 Y2 Y3 + (0.0454063,0) X0 Y1 "
+          "Y2 X3 + (0.168336,0) Z0 Z1 + (0.0454063,0) Y0 X1 X2 Y3");
+
+      auto vqe = xacc::getAlgorithm("vqe", {std::make_pair("ansatz", ruccsd),
+                                            std::make_pair("accelerator", acc),
+                                            std::make_pair("observable", observable),
+                                            std::make_pair("optimizer", optimizer),
+                                            std::make_pair("gradient", "parameter-shift")});
+      vqe->execute(buffer);
+      EXPECT_NEAR(-1.13717, mpark::get<double>(buffer->getInformation("opt-val")), 1e-4);
+    }
+  }
+}
+
+TEST(VQETester, checkVQEEnergy) {
+  if (xacc::hasAccelerator("tnqvm")) {
+    auto acc = xacc::getAccelerator("tnqvm", {std::make_pair("vqe-mode",true)});
+    auto compiler = xacc::getCompiler("xasm");
+    auto ir = compiler->compile(rucc, nullptr);
+    auto ruccsd = ir->getComposite("f");
+
+    std::shared_ptr<Observable> observable = std::make_shared<xacc::quantum::PauliOperator>(
+        "(0.174073,0) Z2 Z3 + (0.1202,0) Z1 Z3 + (0.165607,0) Z1 Z2 + "
+        "(0.165607,0) Z0 Z3 + (0.1202,0) Z0 Z2 + (-0.0454063,0) Y0 Y1 X2 X3 + "
+        "(-0.220041,0) Z3 + (-0.106477,0) + (0.17028,0) Z0 + (-0.220041,0) Z2 "
+        "+ (0.17028,0) Z1 + (-0.0454063,0) X0 X1 Y2 Y3 + (0.0454063,0) X0 Y1 "
+        "Y2 X3 + (0.168336,0) Z0 Z1 + (0.0454063,0) Y0 X1 X2 Y3");
+
+    // Repeated calls share one prepared problem
+    for (auto t0 : {0.0, 0.5}) {
+      auto buffer = xacc::qalloc(4);
+      auto vqe = xacc::getAlgorithm("vqe-energy",
+                                    {std::make_pair("ansatz", ruccsd),
+                                     std::make_pair("accelerator", acc),
+                                     std::make_pair("observable", observable),
+                                     std::make_pair("parameters", std::vector<double>{t0})});
+      vqe->execute(buffer);
+
+      auto vqe2 = xacc::getAlgorithm("vqe",
+                                    {std::make_pair("ansatz", ruccsd),
+                                     std::make_pair("accelerator", acc),
+                                     std::make_pair("observable", observable)});
+      auto buffer2 = xacc::qalloc(4);
+      EXPECT_NEAR(vqe2->execute(buffer2, {t0})[0],
+                  mpark::get<double>(buffer->getInformation("opt-val")), 1e-8);
+    }
+  }
+}
+
+TEST(VQETester, checkAnsatzEdit) {
+  if (xacc::hasAccelerator("tnqvm")) {
+    auto acc = xacc::getAccelerator("tnqvm", {std::make_pair("vqe-mode",true)});
+    auto compiler = xacc::getCompiler("xasm");
+    auto ruccsd = compiler->compile(rucc, nullptr)->getComposite("f");
+    auto edited = compiler->compile(rucc, nullptr)->getComposite("f");
+
+    std::shared_ptr<Observable> observable = std::make_shared<xacc::quantum::PauliOperator>(
+        "(0.174073,0) Z2 Z3 + (0.1202,0) Z1 Z3 + (0.165607,0) Z1 Z2 + "
+        "(0.165607,0) Z0 Z3 + (0.1202,0) Z0 Z2 + (-0.0454063,0) Y0 Y1 X2 X3 + "
+        "(-0.220041,0) Z3 + (-0.106477,0) + (0.17028,0) Z0 + (-0.220041,0) Z2 "
+        "+ (0.17028,0) Z1 + (-0.0454063,0) X0 X1 Y2 Y3 + (0.0454063,0) X0 Y1 "
+        "Y2 X3 + (0.168336,0) Z0 Z1 + (0.0454063,0) Y0 X1 X2 Y3");
+
+    auto energy = [&](std::shared_ptr<CompositeInstruction> ansatz) {
+      auto vqe = xacc::getAlgorithm("vqe",
+                                    {std::make_pair("ansatz", ansatz),
+                                     std::make_pair("accelerator", acc),
+                                     std::make_pair("observable", observable)});
+      auto buffer = xacc::qalloc(4);
+      return vqe->execute(buffer, {0.5})[0];
+    };
+    auto before = energy(ruccsd);
+
+    // Changing a gate in place, without adding or removing any,
+    // must not reuse the circuits prepared from the old ansatz
+    InstructionParameter angle(0.3);
+    ruccsd->getInstruction(2)->setParameter(0, angle);
+    edited->getInstruction(2)->setParameter(0, angle);
+    auto after = energy(ruccsd);
+    EXPECT_NEAR(energy(edited), after, 1e-8);
+    EXPECT_GT(std::fabs(after - before), 1e-3);
+  }
+}
+
+TEST(VQETester, checkShotBudget) {
+  if (xacc::hasAccelerator("tnqvm") && xacc::hasAccelerator("local-ibm")) {
+    auto exact = xacc::getAccelerator("tnqvm", {std::make_pair("vqe-mode",true)});
+    auto sampled = xacc::getAccelerator("local-ibm", {std::make_pair("shots", 1024),
+                                                      std::make_pair("u-p-depol", 0.0),
+                                                      std::make_pair("cx-p-depol", 0.0)});
+    auto compiler = xacc::getCompiler("xasm");
+    auto ir = compiler->compile(rucc, nullptr);
+    auto ruccsd = ir->getComposite("f");
+
+    std::shared_ptr<Observable> observable = std::make_shared<xacc::quantum::PauliOperator>(
+        "(0.174073,0) Z2 Z3 + (0.1202,0) Z1 Z3 + (0.165607,0) Z1 Z2 + "
+        "(0.165607,0) Z0 Z3 + (0.1202,0) Z0 Z2 + (-0.0454063,0) Y0 Y1 X2 X3 + "
+        "(-0.220041,0) Z3 + (-0.106477,0) + (0.17028,0) Z0 + (-0.220041,0) Z2 "
+        "+ (0.17028,0) Z1 + (-0.0454063,0) X0 X1 Y2 Y3 + (0.0454063,0) X0 Y1 "
+        "Y2 X3 + (0.168336,0) Z0 Z1 + (0.0454063,0) Y0 X1 X2 Y3");
+
+    auto reference = xacc::qalloc(4);
+    xacc::getAlgorithm("vqe-energy",
+                       {std::make_pair("ansatz", ruccsd),
+                        std::make_pair("accelerator", exact),
+                        std::make_pair("observable", observable),
+                        std::make_pair("parameters", std::vector<double>{0.5})})
+        ->execute(reference);
+
+    // The budget is split between the 14 term circuits
+    const int budget = 140000;
+    auto buffer = xacc::qalloc(4);
+    xacc::getAlgorithm("vqe-energy",
+                       {std::make_pair("ansatz", ruccsd),
+                        std::make_pair("accelerator", sampled),
+                        std::make_pair("observable", observable),
+                        std::make_pair("shot-budget", budget),
+                        std::make_pair("shot-allocation", "variance"),
+                        std::make_pair("parameters", std::vector<double>{0.5})})
+        ->execute(buffer);
+
+    int total = 0;
+    for (auto &child : buffer->getChildren()) {
+      total += mpark::get<int>(child->getInformation("shots"));
+    }
+    EXPECT_EQ(14, buffer->nChildren());
+    EXPECT_EQ(budget, total);
+    EXPECT_NEAR(mpark::get<double>(reference->getInformation("opt-val")),
+                mpark::get<double>(buffer->getInformation("opt-val")), 2e-2);
+  }
+}
+
+TEST(VQETester, checkGroupMeasurements) {
+  if (xacc::hasAccelerator("tnqvm") && xacc::hasAccelerator("local-ibm")) {
+    auto exact = xacc::getAccelerator("tnqvm", {std::make_pair("vqe-mode",true)});
+    auto sampled = xacc::getAccelerator("local-ibm", {std::make_pair("shots", 20000),
+                                                      std::make_pair("u-p-depol", 0.0),
+                                                      std::make_pair("cx-p-depol", 0.0)});
+    auto compiler = xacc::getCompiler("xasm");
+    auto ir = compiler->compile(rucc, nullptr);
+    auto ruccsd = ir->getComposite("f");
+
+    std::shared_ptr<Observable> observable = std::make_shared<xacc::quantum::PauliOperator>(
+        "(0.174073,0) Z2 Z3 + (0.1202,0) Z1 Z3 + (0.165607,0) Z1 Z2 + "
+        "(0.165607,0) Z0 Z3 + (0.1202,0) Z0 Z2 + (-0.0454063,0) Y0 Y1 X2 X3 + "
+        "(-0.220041,0) Z3 + (-0.106477,0) + (0.17028,0) Z0 + (-0.220041,0) Z2 "
+        "+ (0.17028,0) Z1 + (-0.0454063,0) X0 X1 Y2 Y3 + (0.0454063,0) X0 Y1 "
+        "Y2 X3 + (0.168336,0) Z0 Z1 + (0.0454063,0) Y0 X1 X2 Y3");
+
+    auto energy = [&](std::shared_ptr<Accelerator> acc, const bool grouped) {
+      auto buffer = xacc::qalloc(4);
+      xacc::getAlgorithm("vqe-energy",
+                         {std::make_pair("ansatz", ruccsd),
+                          std::make_pair("accelerator", acc),
+                          std::make_pair("observable", observable),
+                          std::make_pair("group-measurements", grouped),
+                          std::make_pair("parameters", std::vector<double>{0.5})})
+          ->execute(buffer);
+      return mpark::get<double>(buffer->getInformation("opt-val"));
+    };
+
+    // The qubit-wise commuting terms share circuits
+    // without changing the energy
+    EXPECT_NEAR(energy(exact, false), energy(sampled, true), 3e-2);
+  }
+}
+
+TEST(VQETester, checkSummaryHistory) {
+  if (xacc::hasAccelerator("tnqvm")) {
+    auto acc = xacc::getAccelerator("tnqvm", {std::make_pair("vqe-mode",true)});
+    auto compiler = xacc::getCompiler("xasm");
+    auto ir = compiler->compile(rucc, nullptr);
+    auto ruccsd = ir->getComposite("f");
+
+    std::shared_ptr<Observable> observable = std::make_shared<xacc::quantum::PauliOperator>(
+        "(0.174073,0) Z2 Z3 + (0.1202,0) Z1 Z3 + (0.165607,0) Z1 Z2 + "
+        "(0.165607,0) Z0 Z3 + (0.1202,0) Z0 Z2 + (-0.0454063,0) Y0 Y1 X2 X3 + "
+        "(-0.220041,0) Z3 + (-0.106477,0) + (0.17028,0) Z0 + (-0.220041,0) Z2 "
+        "+ (0.17028,0) Z1 + (-0.0454063,0) X0 X1 Y2 Y3 + (0.0454063,0) X0 Y1 "
+        "Y2 X3 + (0.168336,0) Z0 Z1 + (0.0454063,0) Y0 X1 X2 Y3");
+
+    auto buffer = xacc::qalloc(4);
+    auto vqe = xacc::getAlgorithm("vqe-energy",
+                                  {std::make_pair("ansatz", ruccsd),
+                                   std::make_pair("accelerator", acc),
+                                   std::make_pair("observable", observable),
+                                   std::make_pair("history", "summary"),
+                                   std::make_pair("parameters", std::vector<double>{0.5})});
+    vqe->execute(buffer);
+
+    // No children, one row per iteration instead
+    EXPECT_EQ(0, buffer->nChildren());
+    auto energies = mpark::get<std::vector<double>>(buffer->getInformation("history-energy"));
+    EXPECT_EQ(1, energies.size());
+    EXPECT_NEAR(energies[0], mpark::get<double>(buffer->getInformation("opt-val")), 1e-12);
+    auto terms = mpark::get<std::vector<std::string>>(buffer->getInformation("history-terms"));
+    EXPECT_EQ(14, terms.size());
+    auto expvals = mpark::get<std::vector<double>>(buffer->getInformation("history-term-exp-val-z"));
+    EXPECT_EQ(terms.size(), expvals.size());
+  }
+}
+
 int main(int argc, char **argv) {
   xacc::Initialize(argc, argv);
   ::testing::InitGoogleTest(&argc, argv);
@@ -15,13 +15,492 @@
 #include "Observable.hpp"
 #include "xacc.hpp"
 
+#include <cmath>
 #include <memory>
 #include <iomanip>
+#include <list>
+#include <mutex>
+#include <regex>
 
 using namespace xacc;
 
+namespace {
+// Z parity (0 or 1) of the given qubits in a measured bit string of
+// buffer, where qubit q is at position size - 1 - q
+int zParity(const std::string &bitString,
+            const std::vector<std::size_t> &qubits,
+            std::shared_ptr<AcceleratorBuffer> buffer) {
+  int parity = 0;
+  for (auto q : qubits) {
+    if (q >= bitString.size()) {
+      xacc::error("VQE: qubit " + std::to_string(q) +
+                  " was not measured, the bit strings of " + buffer->name() +
+                  " have " + std::to_string(bitString.size()) + " bits.");
+    }
+    parity ^= bitString[bitString.size() - 1 - q] == '1';
+  }
+  return parity;
+}
+
+// Z parity expectation of the given qubits
+double zExpectation(std::shared_ptr<AcceleratorBuffer> buffer,
+                    const std::vector<std::size_t> &qubits) {
+  auto counts = buffer->getMeasurementCounts();
+  if (counts.empty()) {
+    return buffer->getExpectationValueZ();
+  }
+
+  double aver = 0.0, total = 0.0;
+  for (auto &kv : counts) {
+    aver += zParity(kv.first, qubits, buffer) ? -kv.second : kv.second;
+    total += kv.second;
+  }
+  return aver / total;
+}
+
+// Hash of the gates of kernel (names, qubits, parameters and whether
+// they are enabled), to notice edits made to an ansatz in place
+std::size_t contentHash(std::shared_ptr<CompositeInstruction> kernel) {
+  std::size_t seed = 0;
+  auto combine = [&](const std::size_t h) {
+    seed ^= h + 0x9e3779b97f4a7c15 + (seed << 6) + (seed >> 2);
+  };
+  InstructionIterator iter(kernel);
+  while (iter.hasNext()) {
+    auto inst = iter.next();
+    if (inst->isComposite()) {
+      continue;
+    }
+    combine(std::hash<std::string>()(inst->name()));
+    combine(inst->isEnabled());
+    for (auto b : inst->bits()) {
+      combine(b);
+    }
+    for (auto &p : inst->getParameters()) {
+      combine(p.which());
+      combine(mpark::visit(
+          [](const auto &v) {
+            return std::hash<typename std::decay<decltype(v)>::type>()(v);
+          },
+          p));
+    }
+  }
+  return seed;
+}
+
+// The parameter shift rule is exact when every variable is the angle,
+// or the negated angle, of a single Rx, Ry or Rz. Shifting a negated
+// variable by +pi/2 shifts its angle by -pi/2, so the rule as applied
+// to the variables already carries the sign of the derivative. Returns
+// the first variable of kernel that is used any other way, or an empty
+// string if there is none.
+std::string unshiftableVariable(std::shared_ptr<CompositeInstruction> kernel) {
+  auto variables = kernel->getVariables();
+  std::map<std::string, int> uses;
+  std::regex identifier("[A-Za-z_][A-Za-z0-9_]*");
+  // e.g. t0, -t0 or -1 * t0 (the form of the exp and uccsd generators)
+  std::regex signedIdentifier(
+      "\\s*[+-]?\\s*(?:1(?:\\.0*)?\\s*\\*\\s*)?([A-Za-z_][A-Za-z0-9_]*)\\s*");
+  InstructionIterator iter(kernel);
+  while (iter.hasNext()) {
+    auto inst = iter.next();
+    if (inst->isComposite() || !inst->isParameterized()) {
+      continue;
+    }
+    for (int i = 0; i < inst->nParameters(); i++) {
+      auto p = inst->getParameter(i);
+      if (!p.isVariable()) {
+        continue;
+      }
+      auto expression = p.toString();
+      std::smatch match;
+      if (std::regex_match(expression, match, signedIdentifier) &&
+          std::find(variables.begin(), variables.end(), match[1].str()) !=
+              variables.end()) {
+        auto variable = match[1].str();
+        if (++uses[variable] > 1 ||
+            (inst->name() != "Rx" && inst->name() != "Ry" &&
+             inst->name() != "Rz")) {
+          return variable;
+        }
+        continue;
+      }
+      for (std::sregex_iterator it(expression.begin(), expression.end(),
+                                   identifier),
+           end;
+           it != end; ++it) {
+        if (std::find(variables.begin(), variables.end(), it->str()) !=
+            variables.end()) {
+          return it->str();
+        }
+      }
+    }
+  }
+  return "";
+}
+} // namespace
+
 namespace xacc {
 namespace algorithm {
+PreparedVQE::PreparedVQE(std::shared_ptr<Observable> obs,
+                         std::shared_ptr<CompositeInstruction> kernel,
+                         const bool groupMeasurements)
+    : observable(obs), ansatz(kernel), observableVersion(obs->version()),
+      ansatzVariables(kernel->getVariables()),
+      nAnsatzInstructions(kernel->nInstructions()),
+      ansatzHash(contentHash(kernel)), grouped(groupMeasurements) {
+
+  if (!observableVersion) {
+    observableString = obs->toString();
+  }
+
+  if (grouped) {
+    observed = obs->observeGrouped(kernel);
+    for (auto &g : observed.groups) {
+      boundGroups.push_back(g->bind());
+    }
+    groupSizes.assign(observed.groups.size(), 0);
+    for (auto g : observed.termToGroup) {
+      if (g >= 0) {
+        groupSizes[g]++;
+      }
+    }
+    return;
+  }
+
+  // Terms whose circuit adds nothing to the
+  // ansatz are identities, sum their coefficients
+  for (auto &f : obs->observe(kernel)) {
+    std::complex<double> coeff = f->getCoefficient();
+
+    int nFunctionInstructions = 0;
+    if (f->getInstruction(0)->isComposite()) {
+      nFunctionInstructions = nAnsatzInstructions + f->nInstructions() - 1;
+    } else {
+      nFunctionInstructions = f->nInstructions();
+    }
+
+    if (nFunctionInstructions > nAnsatzInstructions) {
+      kernels.push_back(f);
+      boundKernels.push_back(f->bind());
+      coefficients.push_back(std::real(coeff));
+    } else {
+      identityCoeff += std::real(coeff);
+    }
+  }
+}
+
+bool PreparedVQE::matches(std::shared_ptr<Observable> obs,
+                          std::shared_ptr<CompositeInstruction> kernel,
+                          const bool groupMeasurements) const {
+  return grouped == groupMeasurements && observable.lock() == obs &&
+         ansatz.lock() == kernel &&
+         kernel->nInstructions() == nAnsatzInstructions &&
+         kernel->getVariables() == ansatzVariables &&
+         obs->version() == observableVersion &&
+         (observableVersion || obs->toString() == observableString) &&
+         contentHash(kernel) == ansatzHash;
+}
+
+std::shared_ptr<PreparedVQE>
+PreparedVQE::get(std::shared_ptr<Observable> obs,
+                 std::shared_ptr<CompositeInstruction> kernel,
+                 const bool groupMeasurements) {
+  // Keep the few most recently used problems
+  static std::list<std::shared_ptr<PreparedVQE>> cache;
+  static std::mutex cacheMutex;
+  const std::size_t maxCached = 8;
+
+  std::lock_guard<std::mutex> lock(cacheMutex);
+  for (auto it = cache.begin(); it != cache.end(); ++it) {
+    if ((*it)->matches(obs, kernel, groupMeasurements)) {
+      cache.splice(cache.begin(), cache, it);
+      return cache.front();
+    }
+  }
+
+  cache.push_front(
+      std::make_shared<PreparedVQE>(obs, kernel, groupMeasurements));
+  if (cache.size() > maxCached) {
+    cache.pop_back();
+  }
+  return cache.front();
+}
+
+std::vector<std::shared_ptr<CompositeInstruction>>
+PreparedVQE::evaluate(const std::vector<double> &x) {
+  std::vector<std::shared_ptr<CompositeInstruction>> fsToExec;
+  auto &circuits = grouped ? observed.groups : kernels;
+  auto &bound = grouped ? boundGroups : boundKernels;
+  for (int k = 0; k < circuits.size(); k++) {
+    fsToExec.push_back(bound[k] ? bound[k]->operator()(x)
+                                : circuits[k]->operator()(x));
+  }
+  return fsToExec;
+}
+
+double PreparedVQE::termSum(
+    const std::vector<std::shared_ptr<AcceleratorBuffer>>::const_iterator
+        results) const {
+  if (!grouped) {
+    double energy = identityCoeff;
+    for (int k = 0; k < coefficients.size(); k++) {
+      energy += coefficients[k] * results[k]->getExpectationValueZ();
+    }
+    return energy;
+  }
+
+  double energy = 0.0;
+  for (int i = 0; i < observed.termNames.size(); i++) {
+    auto g = observed.termToGroup[i];
+    energy += std::real(observed.coefficients[i]) *
+              (g >= 0 ? zExpectation(results[g], observed.termQubits[i]) : 1.0);
+  }
+  return energy;
+}
+
+std::vector<double> PreparedVQE::shotBounds() const {
+  if (!grouped) {
+    std::vector<double> bounds;
+    for (auto c : coefficients) {
+      bounds.push_back(std::fabs(c));
+    }
+    return bounds;
+  }
+
+  std::vector<double> bounds(observed.groups.size(), 0.0);
+  for (int i = 0; i < observed.termNames.size(); i++) {
+    auto g = observed.termToGroup[i];
+    if (g >= 0) {
+      bounds[g] += std::fabs(std::real(observed.coefficients[i]));
+    }
+  }
+  return bounds;
+}
+
+double PreparedVQE::deviation(const int k,
+                              std::shared_ptr<AcceleratorBuffer> result) const {
+  if (!grouped) {
+    auto expval = result->getExpectationValueZ();
+    return std::fabs(coefficients[k]) *
+           std::sqrt(std::max(0.0, 1.0 - expval * expval));
+  }
+
+  // The group's terms are measured on the same shots, so take
+  // the variance of their sum over the measured bit strings
+  auto counts = result->getMeasurementCounts();
+  if (counts.empty()) {
+    return -1.0;
+  }
+  double mean = 0.0, meanSquare = 0.0, total = 0.0;
+  for (auto &kv : counts) {
+    double value = 0.0;
+    for (int i = 0; i < observed.termNames.size(); i++) {
+      if (observed.termToGroup[i] != k) {
+        continue;
+      }
+      auto coeff = std::real(observed.coefficients[i]);
+      value += zParity(kv.first, observed.termQubits[i], result) ? -coeff
+                                                                 : coeff;
+    }
+    mean += kv.second * value;
+    meanSquare += kv.second * value * value;
+    total += kv.second;
+  }
+  mean /= total;
+  return std::sqrt(std::max(0.0, meanSquare / total - mean * mean));
+}
+
+double PreparedVQE::energy(std::shared_ptr<Accelerator> accelerator,
+                           const std::shared_ptr<AcceleratorBuffer> buffer,
+                           const std::vector<double> &x) {
+  std::vector<double> dx;
+  return energy(accelerator, buffer, x, dx);
+}
+
+double PreparedVQE::energy(std::shared_ptr<Accelerator> accelerator,
+                           const std::shared_ptr<AcceleratorBuffer> buffer,
+                           const std::vector<double> &x,
+                           std::vector<double> &dx) {
+  AlgorithmHistory history;
+  ShotAllocator allocator;
+  return energy(accelerator, buffer, x, dx, history, allocator);
+}
+
+double PreparedVQE::energy(std::shared_ptr<Accelerator> accelerator,
+                           const std::shared_ptr<AcceleratorBuffer> buffer,
+                           const std::vector<double> &x,
+                           std::vector<double> &dx,
+                           AlgorithmHistory &history,
+                           ShotAllocator &allocator) {
+  std::lock_guard<std::mutex> lock(evaluationMutex);
+  auto fsToExec = evaluate(x);
+  const auto nCircuits = fsToExec.size();
+
+  // Parameter shift gradient, every circuit at x +/- pi/2 e_i, submitted
+  // in the same execute call as the energy circuits. Each shifted circuit
+  // has its own binding, since all of them are executed together.
+  auto &circuits = grouped ? observed.groups : kernels;
+  while (shiftedBounds.size() < 2 * dx.size() * circuits.size()) {
+    auto &c = circuits[shiftedBounds.size() % circuits.size()];
+    shiftedBounds.push_back(c->bind());
+  }
+  auto bound = shiftedBounds.begin();
+  for (int i = 0; i < dx.size(); i++) {
+    for (auto shift : {xacc::constants::pi / 2., -xacc::constants::pi / 2.}) {
+      auto shifted = x;
+      shifted[i] += shift;
+      for (auto &c : circuits) {
+        auto evaled = *bound ? (*bound)->operator()(shifted)
+                             : c->operator()(shifted);
+        ++bound;
+        evaled->setName(c->name() + "_param_" + std::to_string(i) +
+                        (shift > 0 ? "_shift_plus" : "_shift_minus"));
+        fsToExec.push_back(evaled);
+      }
+    }
+  }
+
+  std::vector<int> shots;
+  if (allocator.enabled() && nCircuits > 0) {
+    if (allocator.size() != nCircuits) {
+      allocator.setBounds(shotBounds());
+    }
+    auto circuitShots = allocator.allocate();
+    for (int i = 0; i < fsToExec.size(); i += nCircuits) {
+      shots.insert(shots.end(), circuitShots.begin(), circuitShots.end());
+    }
+  }
+
+  std::vector<std::shared_ptr<AcceleratorBuffer>> buffers;
+  if (!fsToExec.empty()) {
+    auto tmpBuffer = xacc::qalloc(buffer->size());
+    if (shots.empty()) {
+      accelerator->execute(tmpBuffer, fsToExec);
+    } else {
+      accelerator->execute(tmpBuffer, fsToExec, shots);
+    }
+    buffers = tmpBuffer->getChildren();
+  }
+
+  if (!shots.empty()) {
+    for (int k = 0; k < nCircuits && k < buffers.size(); k++) {
+      buffers[k]->addExtraInfo("shots", shots[k]);
+      allocator.update(k, deviation(k, buffers[k]));
+    }
+  }
+
+  for (int i = 0; i < dx.size(); i++) {
+    auto plus = buffers.cbegin() + nCircuits * (2 * i + 1);
+    auto minus = plus + nCircuits;
+    dx[i] = 0.5 * (termSum(plus) - termSum(minus));
+  }
+
+  buffers.resize(nCircuits);
+  fsToExec.resize(nCircuits);
+  auto energy =
+      grouped
+          ? energyGrouped(accelerator, buffer, fsToExec, buffers, x, history)
+          : energyTerms(accelerator, buffer, fsToExec, buffers, x, history);
+
+  std::stringstream ss;
+  ss << "E(" << (x.empty() ? 0.0 : x[0]);
+  for (int i = 1; i < x.size(); i++)
+    ss << "," << x[i];
+  ss << ") = " << std::setprecision(12) << energy;
+  xacc::info(ss.str());
+  return energy;
+}
+
+double PreparedVQE::energyTerms(
+    std::shared_ptr<Accelerator> accelerator,
+    const std::shared_ptr<AcceleratorBuffer> buffer,
+    const std::vector<std::shared_ptr<CompositeInstruction>> &fsToExec,
+    const std::vector<std::shared_ptr<AcceleratorBuffer>> &buffers,
+    const std::vector<double> &x, AlgorithmHistory &history) {
+
+  double energy = identityCoeff;
+  std::vector<AcceleratorBufferChildPair> children;
+  if (history.keepsChildren()) {
+    auto idBuffer = xacc::qalloc(buffer->size());
+    idBuffer->addExtraInfo("coefficient", identityCoeff);
+    idBuffer->setName("I");
+    idBuffer->addExtraInfo("kernel", "I");
+    idBuffer->addExtraInfo("parameters", x);
+    idBuffer->addExtraInfo("exp-val-z", 1.0);
+    if (accelerator->name() == "ro-error")
+      idBuffer->addExtraInfo("ro-fixed-exp-val-z", 1.0);
+    children.push_back({"I", idBuffer});
+  }
+
+  std::vector<std::string> termNames;
+  std::vector<double> termValues;
+  if (!buffers.empty() &&
+      buffers[0]->hasExtraInfoKey("purified-energy")) { // FIXME Hack for now...
+    energy = buffers[0]->getInformation("purified-energy").as<double>();
+    for (auto &b : buffers) {
+      b->addExtraInfo("parameters", x);
+      children.push_back({b->name(), b});
+    }
+  } else {
+    for (int i = 0; i < buffers.size(); i++) {
+      auto expval = buffers[i]->getExpectationValueZ();
+      energy += expval * coefficients[i];
+      buffers[i]->addExtraInfo("coefficient", coefficients[i]);
+      buffers[i]->addExtraInfo("kernel", fsToExec[i]->name());
+      buffers[i]->addExtraInfo("exp-val-z", expval);
+      buffers[i]->addExtraInfo("parameters", x);
+      children.push_back({fsToExec[i]->name(), buffers[i]});
+      termNames.push_back(fsToExec[i]->name());
+      termValues.push_back(expval);
+    }
+  }
+
+  history.record(buffer, children, x, energy, termNames, termValues);
+  return energy;
+}
+
+double PreparedVQE::energyGrouped(
+    std::shared_ptr<Accelerator> accelerator,
+    const std::shared_ptr<AcceleratorBuffer> buffer,
+    const std::vector<std::shared_ptr<CompositeInstruction>> &fsToExec,
+    const std::vector<std::shared_ptr<AcceleratorBuffer>> &buffers,
+    const std::vector<double> &x, AlgorithmHistory &history) {
+
+  std::vector<std::map<std::string, double>> termExpVals(fsToExec.size()),
+      termCoeffs(fsToExec.size());
+  std::vector<double> termValues;
+  double energy = 0.0;
+  for (int i = 0; i < observed.termNames.size(); i++) {
+    auto coeff = std::real(observed.coefficients[i]);
+    auto g = observed.termToGroup[i];
+    double expval = 1.0;
+    if (g >= 0) {
+      if (groupSizes[g] > 1 && buffers[g]->getMeasurementCounts().empty()) {
+        xacc::error("VQE measurement grouping requires measurement counts, "
+                    "but " + accelerator->name() + " did not provide any.");
+      }
+      expval = zExpectation(buffers[g], observed.termQubits[i]);
+      termExpVals[g].insert({observed.termNames[i], expval});
+      termCoeffs[g].insert({observed.termNames[i], coeff});
+    }
+    energy += coeff * expval;
+    termValues.push_back(expval);
+  }
+
+  std::vector<AcceleratorBufferChildPair> children;
+  for (int g = 0; g < buffers.size(); g++) {
+    buffers[g]->addExtraInfo("kernel", fsToExec[g]->name());
+    buffers[g]->addExtraInfo("term-exp-val-z", termExpVals[g]);
+    buffers[g]->addExtraInfo("term-coefficients", termCoeffs[g]);
+    buffers[g]->addExtraInfo("parameters", x);
+    children.push_back({fsToExec[g]->name(), buffers[g]});
+  }
+
+  history.record(buffer, children, x, energy, observed.termNames, termValues);
+  return energy;
+}
+
 bool VQE::initialize(const HeterogeneousMap &parameters) {
   if (!parameters.keyExists<std::shared_ptr<Observable>>("observable")) {
     std::cout << "Obs was false\n";
@@ -52,6 +531,37 @@ bool VQE::initialize(const HeterogeneousMap &parameters) {
   kernel = parameters.get<std::shared_ptr<CompositeInstruction>>("ansatz");
   accelerator = parameters.get<std::shared_ptr<Accelerator>>("accelerator");
 
+  if (parameters.keyExists<bool>("group-measurements")) {
+    groupMeasurements = parameters.get<bool>("group-measurements");
+  }
+
+  gradient = parameters.stringExists("gradient")
+                 ? parameters.getString("gradient")
+                 : "none";
+  if (gradient != "parameter-shift" && gradient != "none") {
+    xacc::error("Invalid VQE gradient strategy " + gradient +
+                ", valid options are parameter-shift and none.");
+  }
+  if (gradient == "parameter-shift") {
+    auto variable = unshiftableVariable(kernel);
+    if (!variable.empty()) {
+      xacc::error("VQE gradient parameter-shift needs each variable to be "
+                  "the angle (or negated angle, e.g. -" + variable +
+                  ") of a single Rx, Ry or Rz, but " + variable +
+                  " is not. Other multiples and variables shared between "
+                  "gates are not supported.");
+    }
+  }
+
+  history = AlgorithmHistory(parameters, "energy");
+  shotAllocator = ShotAllocator(parameters);
+  if (shotAllocator.enabled() && !accelerator->supportsPerCircuitShots()) {
+    xacc::warning("Accelerator " + accelerator->name() +
+                  " cannot run circuits with different shots, ignoring "
+                  "shot-budget.");
+    shotAllocator = ShotAllocator();
+  }
+
   return true;
 }
 
@@ -60,84 +570,26 @@ const std::vector<std::string> VQE::requiredParameters() const {
 }
 
 void VQE::execute(const std::shared_ptr<AcceleratorBuffer> buffer) const {
+  // Observe, bind and extract coefficients once, every
+  // iteration only rebinds the ansatz parameters
+  auto prepared =
+      std::make_shared<PreparedVQE>(observable, kernel, groupMeasurements);
+  auto iterations = history;
+  auto allocator = shotAllocator;
 
-  // void VQE::execute(xacc::Observable &observable, Optimizer &optimizer) {
-  auto kernels = observable->observe(kernel);
-
-  // Here we just need to make a lambda kernel
-  // to optimize that makes calls to the targeted QPU.
+  // Gradient based optimizers pass a non-empty dx
   OptFunction f(
       [&, this](const std::vector<double> &x, std::vector<double> &dx) {
-        std::vector<double> coefficients;
-        std::vector<std::string> kernelNames;
-        std::vector<std::shared_ptr<CompositeInstruction>> fsToExec;
-
-        double identityCoeff = 0.0;
-        for (auto &f : kernels) {
-          kernelNames.push_back(f->name());
-          std::complex<double> coeff = f->getCoefficient();
-
-          int nFunctionInstructions = 0;
-          if (f->getInstruction(0)->isComposite()) {
-            nFunctionInstructions =
-                kernel->nInstructions() + f->nInstructions() - 1;
-          } else {
-            nFunctionInstructions = f->nInstructions();
-          }
-
-          if (nFunctionInstructions > kernel->nInstructions()) {
-            fsToExec.push_back(f->operator()(x));
-            coefficients.push_back(std::real(coeff));
-          } else {
-            identityCoeff += std::real(coeff);
-          }
-        }
-
-        auto tmpBuffer = xacc::qalloc(buffer->size());
-        accelerator->execute(tmpBuffer, fsToExec);
-        auto buffers = tmpBuffer->getChildren();
-
-        double energy = identityCoeff;
-        auto idBuffer = xacc::qalloc(buffer->size());
-        idBuffer->addExtraInfo("coefficient", identityCoeff);
-        idBuffer->setName("I");
-        idBuffer->addExtraInfo("kernel", "I");
-        idBuffer->addExtraInfo("parameters", x);
-        idBuffer->addExtraInfo("exp-val-z", 1.0);
-        if (accelerator->name() == "ro-error")
-            idBuffer->addExtraInfo("ro-fixed-exp-val-z", 1.0);
-        buffer->appendChild("I", idBuffer);
-
-        if (buffers[0]->hasExtraInfoKey(
-                "purified-energy")) { // FIXME Hack for now...
-          energy = buffers[0]->getInformation("purified-energy").as<double>();
-          for (auto &b : buffers) {
-            b->addExtraInfo("parameters", initial_params);
-            buffer->appendChild(b->name(), b);
-          }
-        } else {
-          for (int i = 0; i < buffers.size(); i++) {
-            auto expval = buffers[i]->getExpectationValueZ();
-            energy += expval * coefficients[i];
-            buffers[i]->addExtraInfo("coefficient", coefficients[i]);
-            buffers[i]->addExtraInfo("kernel", fsToExec[i]->name());
-            buffers[i]->addExtraInfo("exp-val-z", expval);
-            buffers[i]->addExtraInfo("parameters", x);
-            buffer->appendChild(fsToExec[i]->name(), buffers[i]);
-          }
-        }
-
-        std::stringstream ss;
-        ss << "E(" << x[0];
-        for (int i = 1; i < x.size(); i++)
-          ss << "," << x[i];
-        ss << ") = " << std::setprecision(12) << energy;
-        xacc::info(ss.str());
-        return energy;
+        std::vector<double> noGradient;
+        return prepared->energy(accelerator, buffer, x,
+                                gradient == "parameter-shift" ? dx
+                                                              : noGradient,
+                                iterations, allocator);
       },
       kernel->nVariables());
 
   auto result = optimizer->optimize(f);
+  iterations.flush(buffer);
 
   buffer->addExtraInfo("opt-val", ExtraInfo(result.first));
   buffer->addExtraInfo("opt-params", ExtraInfo(result.second));
@@ -147,71 +599,40 @@ void VQE::execute(const std::shared_ptr<AcceleratorBuffer> buffer) const {
 std::vector<double>
 VQE::execute(const std::shared_ptr<AcceleratorBuffer> buffer,
              const std::vector<double> &x) {
-  auto kernels = observable->observe(kernel);
-  std::vector<double> coefficients;
-  std::vector<std::string> kernelNames;
-  std::vector<std::shared_ptr<CompositeInstruction>> fsToExec;
-
-  double identityCoeff = 0.0;
-  for (auto &f : kernels) {
-    kernelNames.push_back(f->name());
-    std::complex<double> coeff = f->getCoefficient();
-
-    int nFunctionInstructions = 0;
-    if (f->getInstruction(0)->isComposite()) {
-      nFunctionInstructions = kernel->nInstructions() + f->nInstructions() - 1;
-    } else {
-      nFunctionInstructions = f->nInstructions();
-    }
+  auto prepared = PreparedVQE::get(observable, kernel, groupMeasurements);
+  std::vector<double> dx;
+  auto energy =
+      prepared->energy(accelerator, buffer, x, dx, history, shotAllocator);
+  history.flush(buffer);
+  return {energy};
+}
 
-    if (nFunctionInstructions > kernel->nInstructions()) {
-      fsToExec.push_back(f->operator()(x));
-      coefficients.push_back(std::real(coeff));
-    } else {
-      identityCoeff += std::real(coeff);
-    }
+bool VQEEnergy::initialize(const HeterogeneousMap &parameters) {
+  if (!VQE::initialize(parameters)) {
+    return false;
   }
-
-  auto tmpBuffer = xacc::qalloc(buffer->size());
-  accelerator->execute(tmpBuffer, fsToExec);
-  auto buffers = tmpBuffer->getChildren();
-
-  double energy = identityCoeff;
-  auto idBuffer = xacc::qalloc(buffer->size());
-  idBuffer->addExtraInfo("coefficient", identityCoeff);
-  idBuffer->setName("I");
-  idBuffer->addExtraInfo("kernel", "I");
-  idBuffer->addExtraInfo("parameters", x);
-  idBuffer->addExtraInfo("exp-val-z", 1.0);
-  if (accelerator->name() == "ro-error")
-    idBuffer->addExtraInfo("ro-fixed-exp-val-z", 1.0);
-  buffer->appendChild("I", idBuffer);
-
-  if (buffers[0]->hasExtraInfoKey("purified-energy")) { // FIXME Hack for now...
-    energy = buffers[0]->getInformation("purified-energy").as<double>();
-    for (auto &b : buffers) {
-      b->addExtraInfo("parameters", initial_params);
-      buffer->appendChild(b->name(), b);
-    }
+  if (parameters.keyExists<std::vector<double>>("parameters")) {
+    initial_params = parameters.get<std::vector<double>>("parameters");
   } else {
-    for (int i = 0; i < buffers.size(); i++) {
-      auto expval = buffers[i]->getExpectationValueZ();
-      energy += expval * coefficients[i];
-      buffers[i]->addExtraInfo("coefficient", coefficients[i]);
-      buffers[i]->addExtraInfo("kernel", fsToExec[i]->name());
-      buffers[i]->addExtraInfo("exp-val-z", expval);
-      buffers[i]->addExtraInfo("parameters", x);
-      buffer->appendChild(fsToExec[i]->name(), buffers[i]);
-    }
+    initial_params.assign(kernel->nVariables(), 0.0);
   }
+  return true;
+}
 
-  std::stringstream ss;
-  ss << "E(" << x[0];
-  for (int i = 1; i < x.size(); i++)
-    ss << "," << x[i];
-  ss << ") = " << std::setprecision(12) << energy;
-  xacc::info(ss.str());
-  return {energy};
+const std::vector<std::string> VQEEnergy::requiredParameters() const {
+  return {"observable", "accelerator", "ansatz", "parameters"};
+}
+
+void VQEEnergy::execute(const std::shared_ptr<AcceleratorBuffer> buffer) const {
+  auto prepared = PreparedVQE::get(observable, kernel, groupMeasurements);
+  auto iterations = history;
+  auto allocator = shotAllocator;
+  std::vector<double> dx;
+  auto energy = prepared->energy(accelerator, buffer, initial_params, dx,
+                                 iterations, allocator);
+  iterations.flush(buffer);
+  buffer->addExtraInfo("opt-val", ExtraInfo(energy));
+  buffer->addExtraInfo("opt-params", ExtraInfo(initial_params));
 }
 
 } // namespace algorithm
@@ -14,9 +14,123 @@
 #define XACC_ALGORITHM_VQE_HPP_
 
 #include "Algorithm.hpp"
+#include "AlgorithmHistory.hpp"
+#include "ShotAllocator.hpp"
+
+#include <mutex>
 
 namespace xacc {
 namespace algorithm {
+
+// A VQE problem observed once, with identity terms and coefficients
+// extracted and every measured circuit bound, so that an energy
+// evaluation only rebinds the ansatz parameters and executes.
+//
+// The bound circuits are updated in place by each evaluation, so
+// concurrent energy() calls on the same PreparedVQE (e.g. from two
+// VQE instances sharing it through get()) run one at a time.
+class PreparedVQE {
+public:
+  PreparedVQE(std::shared_ptr<Observable> observable,
+              std::shared_ptr<CompositeInstruction> ansatz,
+              const bool groupMeasurements);
+
+  // The prepared problem for these objects, shared between VQE
+  // instances (e.g. repeated vqe-energy calls) while they are unchanged
+  static std::shared_ptr<PreparedVQE>
+  get(std::shared_ptr<Observable> observable,
+      std::shared_ptr<CompositeInstruction> ansatz,
+      const bool groupMeasurements);
+
+  // True if prepared from these (unmodified) objects. The observable
+  // is compared by Observable::version(), or by its string form if
+  // it does not track modifications, the ansatz by a hash of its gates.
+  bool matches(std::shared_ptr<Observable> observable,
+               std::shared_ptr<CompositeInstruction> ansatz,
+               const bool groupMeasurements) const;
+
+  // Execute on the accelerator and return the energy at x, appending
+  // the measured buffers as children of buffer
+  double energy(std::shared_ptr<Accelerator> accelerator,
+                const std::shared_ptr<AcceleratorBuffer> buffer,
+                const std::vector<double> &x);
+
+  // Also fill dx with the parameter shift gradient,
+  // (E(x + pi/2 e_i) - E(x - pi/2 e_i)) / 2. It is exact when each
+  // variable is the bare angle of a single Rx, Ry or Rz gate.
+  double energy(std::shared_ptr<Accelerator> accelerator,
+                const std::shared_ptr<AcceleratorBuffer> buffer,
+                const std::vector<double> &x, std::vector<double> &dx);
+
+  // Record the measured buffers of this evaluation with history
+  // instead of appending them all to buffer, and if enabled split
+  // the shots between circuits with allocator (every shifted copy
+  // of a circuit gets the same shots as the circuit)
+  double energy(std::shared_ptr<Accelerator> accelerator,
+                const std::shared_ptr<AcceleratorBuffer> buffer,
+                const std::vector<double> &x, std::vector<double> &dx,
+                AlgorithmHistory &history, ShotAllocator &allocator);
+
+  // Upper bound of the single shot standard deviation of each
+  // circuit's energy contribution, the sum of its |coefficients|
+  std::vector<double> shotBounds() const;
+
+protected:
+  std::weak_ptr<Observable> observable;
+  std::weak_ptr<CompositeInstruction> ansatz;
+  std::uint64_t observableVersion = 0;
+  std::string observableString;
+  std::vector<std::string> ansatzVariables;
+  int nAnsatzInstructions = 0;
+  std::size_t ansatzHash = 0;
+  bool grouped = false;
+
+  // One circuit per non-identity term
+  std::vector<std::shared_ptr<CompositeInstruction>> kernels;
+  std::vector<std::shared_ptr<BoundCompositeInstruction>> boundKernels;
+  std::vector<double> coefficients;
+  double identityCoeff = 0.0;
+
+  // Or one circuit per group of qubit-wise commuting terms
+  ObservedGroups observed;
+  std::vector<std::shared_ptr<BoundCompositeInstruction>> boundGroups;
+  std::vector<int> groupSizes;
+
+  // Bindings for the shifted circuits of the parameter shift gradient,
+  // shiftedBounds[(2 * i + s) * nCircuits + k] evaluates circuit k at
+  // x + pi/2 e_i (s = 0) or x - pi/2 e_i (s = 1)
+  std::vector<std::shared_ptr<BoundCompositeInstruction>> shiftedBounds;
+
+  // Held for the whole of an energy evaluation
+  std::mutex evaluationMutex;
+
+  // The measured circuits evaluated at x
+  std::vector<std::shared_ptr<CompositeInstruction>>
+  evaluate(const std::vector<double> &x);
+
+  // Single shot standard deviation of the energy contribution
+  // of circuit k, measured in result, or -1 if not known
+  double deviation(const int k,
+                   std::shared_ptr<AcceleratorBuffer> result) const;
+
+  // Energy from the results of one evaluation of every circuit
+  double termSum(const std::vector<std::shared_ptr<AcceleratorBuffer>>::
+                     const_iterator results) const;
+
+  double energyTerms(
+      std::shared_ptr<Accelerator> accelerator,
+      const std::shared_ptr<AcceleratorBuffer> buffer,
+      const std::vector<std::shared_ptr<CompositeInstruction>> &fsToExec,
+      const std::vector<std::shared_ptr<AcceleratorBuffer>> &buffers,
+      const std::vector<double> &x, AlgorithmHistory &history);
+  double energyGrouped(
+      std::shared_ptr<Accelerator> accelerator,
+      const std::shared_ptr<AcceleratorBuffer> buffer,
+      const std::vector<std::shared_ptr<CompositeInstruction>> &fsToExec,
+      const std::vector<std::shared_ptr<AcceleratorBuffer>> &buffers,
+      const std::vector<double> &x, AlgorithmHistory &history);
+};
+
 class VQE : public Algorithm {
 protected:
   std::shared_ptr<Observable> observable;
@@ -24,6 +138,14 @@ protected:
   std::shared_ptr<CompositeInstruction> kernel;
   std::shared_ptr<Accelerator> accelerator;
   std::vector<double> initial_params;
+  bool groupMeasurements = false;
+  // none or parameter-shift, used when the optimizer asks for gradients
+  std::string gradient = "none";
+  // What each iteration keeps on the buffer, see AlgorithmHistory
+  AlgorithmHistory history;
+  // Splits shot-budget between the measured circuits, if given and
+  // the accelerator supports per-circuit shots
+  ShotAllocator shotAllocator;
 
   HeterogeneousMap parameters;
 
@@ -38,6 +160,19 @@ public:
   const std::string description() const override { return ""; }
   DEFINE_ALGORITHM_CLONE(VQE)
 };
+
+// Evaluate the VQE energy once, at the given parameters, storing
+// it as opt-val. The prepared problem is reused across instances.
+class VQEEnergy : public VQE {
+public:
+  bool initialize(const HeterogeneousMap &parameters) override;
+  const std::vector<std::string> requiredParameters() const override;
+
+  void execute(const std::shared_ptr<AcceleratorBuffer> buffer) const override;
+  const std::string name() const override { return "vqe-energy"; }
+  const std::string description() const override { return ""; }
+  DEFINE_ALGORITHM_CLONE(VQEEnergy)
+};
 } // namespace algorithm
 } // namespace xacc
 #endif
\ No newline at end of file
@@ -49,8 +49,17 @@ bool Exp::expand(const HeterogeneousMap &parameters) {
   if (pauli_or_fermion == "fermion") {
     auto fermionStr = parameters.getString("fermion");
     auto op = std::make_shared<FermionOperator>(fermionStr);
+    std::string transformName = "jw";
+    if (parameters.stringExists("transform")) {
+      transformName = parameters.getString("transform");
+    }
+    HeterogeneousMap transformOptions;
+    if (parameters.keyExists<int>("n_qubits")) {
+      transformOptions.insert("n_qubits", parameters.get<int>("n_qubits"));
+    }
     terms = std::dynamic_pointer_cast<PauliOperator>(
-                xacc::getService<ObservableTransform>("jw")->transform(op))
+                xacc::getService<ObservableTransform>(transformName)
+                    ->transform(op, transformOptions))
                 ->getTerms();
   } else {
     auto pauliStr = parameters.getString("pauli");
@@ -66,7 +75,7 @@ bool Exp::expand(const HeterogeneousMap &parameters) {
     Term spinInst = inst.second;
 
     // Get the individual pauli terms
-    auto termsMap = std::get<2>(spinInst);
+    auto termsMap = spinInst.ops();
 
     std::vector<std::pair<int, std::string>> terms;
     for (auto &kv : termsMap) {
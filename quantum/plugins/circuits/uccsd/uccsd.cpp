@@ -167,10 +167,16 @@ bool UCCSD::expand(const xacc::HeterogeneousMap &runtimeOptions) {
     count++;
   }
 
-  auto jw = xacc::getService<ObservableTransform>("jw");
+  // The fermion to qubit encoding, must match the one used for the observable
+  std::string transformName = "jw";
+  if (runtimeOptions.stringExists("transform")) {
+    transformName = runtimeOptions.getString("transform");
+  }
+  auto transform = xacc::getService<ObservableTransform>(transformName);
 
-  auto compositeResult =
-      jw->transform(std::shared_ptr<Observable>(&myOp, [](Observable *) {}));
+  auto compositeResult = transform->transform(
+      std::shared_ptr<Observable>(&myOp, [](Observable *) {}),
+      {std::make_pair("n_qubits", nQubits)});
 
   std::unordered_map<std::string, Term> terms =
       std::dynamic_pointer_cast<PauliOperator>(compositeResult)->getTerms();
@@ -184,7 +190,7 @@ bool UCCSD::expand(const xacc::HeterogeneousMap &runtimeOptions) {
     Term spinInst = inst.second;
 
     // Get the individual pauli terms
-    auto termsMap = std::get<2>(spinInst);
+    auto termsMap = spinInst.ops();
 
     std::vector<std::pair<int, std::string>> terms;
     for (auto &kv : termsMap) {
@@ -224,8 +230,8 @@ bool UCCSD::expand(const xacc::HeterogeneousMap &runtimeOptions) {
       if (i == terms.size() - 1) {
         // FIXME DONT FORGET DIVIDE BY 2
         std::stringstream ss;
-        ss << 2 * std::imag(std::get<0>(spinInst)) << " * "
-           << std::get<1>(spinInst);
+        ss << 2 * std::imag(spinInst.coeff()) << " * "
+           << spinInst.var();
         auto rz = gateRegistry->createInstruction(
             "Rz", std::vector<std::size_t>{qbitIdx});
 
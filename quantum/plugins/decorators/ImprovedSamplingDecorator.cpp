@@ -40,7 +40,7 @@ void ImprovedSamplingDecorator::execute(
   auto counts = buffer->getMeasurementCounts();
 
   for (int i = 1; i < nRuns; i++) {
-    auto cloned = buffer->clone();
+    auto cloned = buffer->clone(false);
     cloned->clearMeasurements();
     decoratedAccelerator->execute(cloned, function);
 
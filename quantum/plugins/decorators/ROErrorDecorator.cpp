@@ -95,25 +95,22 @@ void ROErrorDecorator::execute(
 
   // Get the number of shots first
   int nShots = 0;
-  auto tmpCounts = buffer->getMeasurementCounts();
-  for (auto &kv : tmpCounts) {
+  for (auto &kv : buffer->getPackedMeasurementCounts()) {
     nShots += kv.second;
   }
 
-  auto counts = buffer->getMeasurementCounts();
+  auto fSupports = supports(function);
+  std::vector<int> bits(fSupports.begin(), fSupports.end());
 
   auto fixedExp = 0.0;
-  for (auto &kv : counts) {
+  for (auto &kv : buffer->getMarginalCounts(bits)) {
     auto prod = 1.0;
-    std::string bitString = kv.first;
-    auto count = kv.second;
-    for (auto j : supports(function)) {
-      prod *= (std::pow(-1, (int)(bitString[buffer->size() - j - 1] - '0')) -
-               piminus[j]) /
-              (1.0 - piplus[j]);
+    for (std::size_t k = 0; k < bits.size(); k++) {
+      auto j = bits[k];
+      prod *= ((kv.first.bit(k) ? -1 : 1) - piminus[j]) / (1.0 - piplus[j]);
     }
 
-    fixedExp += ((double)count / (double)nShots) * prod;
+    fixedExp += ((double)kv.second / (double)nShots) * prod;
   }
 
   buffer->addExtraInfo("ro-fixed-exp-val-z", ExtraInfo(fixedExp));
@@ -203,36 +200,31 @@ void ROErrorDecorator::execute(
 
   // Get the number of shots first
   int nShots = 0;
-  std::map<std::string, int> tmpCounts;
   for (auto &b : buffers) {
-    if (!b->getMeasurementCounts().empty()) {
-      tmpCounts = b->getMeasurementCounts();
+    if (!b->getPackedMeasurementCounts().empty()) {
+      for (auto &kv : b->getPackedMeasurementCounts()) {
+        nShots += kv.second;
+      }
       break;
     }
   }
-  for (auto &kv : tmpCounts) {
-    nShots += kv.second;
-  }
   int counter = 0;
   for (auto &b : buffers) {
-    auto counts = b->getMeasurementCounts();
     auto functionName = b->name();
     auto f = nameToFunction[functionName];
     auto fSupports = supportSets[functionName];
-    auto exp_val = b->getExpectationValueZ();
+    std::vector<int> bits(fSupports.begin(), fSupports.end());
     auto fixedExp = 0.0;
-    for (auto &kv : counts) {
+    // Only the measured bits matter, so work on the marginal counts
+    for (auto &kv : b->getMarginalCounts(bits)) {
       auto prod = 1.0;
-      std::string bitString = kv.first;
-      auto count = kv.second;
-      for (auto &j : fSupports) {
+      for (std::size_t k = 0; k < bits.size(); k++) {
+        auto j = bits[k];
         auto denom = (1.0 - piplus[j]);
-        auto numerator =
-            (bitString[bitString.length() - 1 - j] == '1' ? -1 : 1) -
-            piminus[j];
+        auto numerator = (kv.first.bit(k) ? -1 : 1) - piminus[j];
         prod *= (numerator / denom);
       }
-      fixedExp += ((double)count / (double)nShots) * prod;
+      fixedExp += ((double)kv.second / (double)nShots) * prod;
     }
     if (fixedExp > 1.0) {
       fixedExp = 1.0;
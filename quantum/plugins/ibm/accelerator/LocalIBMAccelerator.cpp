@@ -54,6 +54,13 @@ void LocalIBMAccelerator::execute(
 void LocalIBMAccelerator::execute(
     std::shared_ptr<AcceleratorBuffer> buffer,
     const std::vector<std::shared_ptr<CompositeInstruction>> functions) {
+  execute(buffer, functions, std::vector<int>(functions.size(), shots));
+}
+
+void LocalIBMAccelerator::execute(
+    std::shared_ptr<AcceleratorBuffer> buffer,
+    const std::vector<std::shared_ptr<CompositeInstruction>> functions,
+    const std::vector<int> &circuitShots) {
 
   std::vector<std::string> names;
   json j;
@@ -108,6 +115,8 @@ void LocalIBMAccelerator::execute(
     config["coupling_map"] = "None";
     config["seed"] = "None";
     config["layout"] = "None";
+    // The circuit config overrides the qobj config
+    config["shots"] = circuitShots[kernelCounter];
 
     circuit["compiled_circuit"]["config"] = config;
 
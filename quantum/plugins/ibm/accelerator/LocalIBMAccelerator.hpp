@@ -64,6 +64,13 @@ public:
   execute(std::shared_ptr<AcceleratorBuffer> buffer,
           const std::vector<std::shared_ptr<CompositeInstruction>> functions) override;
 
+  // Every circuit carries its own shots in a single qobj
+  bool supportsPerCircuitShots() override { return true; }
+  void
+  execute(std::shared_ptr<AcceleratorBuffer> buffer,
+          const std::vector<std::shared_ptr<CompositeInstruction>> functions,
+          const std::vector<int> &shots) override;
+
   const std::string defaultPlacementTransformation() override {
       return "default-placement";
   }
@@ -0,0 +1,180 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "StateVector.hpp"
+
+#include <algorithm>
+
+namespace {
+// Below this many qubits threading costs more than it saves
+constexpr std::size_t parallelThreshold = 14;
+constexpr std::size_t maxQubits = 32;
+
+// Insert a zero bit at position b of i
+inline std::int64_t insertZero(const std::int64_t i, const std::size_t b) {
+  const std::int64_t low = i & ((std::int64_t(1) << b) - 1);
+  return ((i >> b) << (b + 1)) | low;
+}
+
+// std::complex operator* checks for inf/nan (a libgcc call per
+// product without -ffast-math), which dominates the gate kernels
+inline std::complex<double> mul(const std::complex<double> &a,
+                                const std::complex<double> &b) {
+  return {a.real() * b.real() - a.imag() * b.imag(),
+          a.real() * b.imag() + a.imag() * b.real()};
+}
+} // namespace
+
+namespace xacc {
+namespace quantum {
+
+StateVector::StateVector(const std::size_t n) : nQubits(n) {
+  if (nQubits > maxQubits) {
+    xacc::error("statevector can simulate at most " +
+                std::to_string(maxQubits) + " qubits, " +
+                std::to_string(nQubits) + " requested.");
+  }
+  reset();
+}
+
+void StateVector::reset() {
+  amplitudes.assign(std::size_t(1) << nQubits, 0.0);
+  amplitudes[0] = 1.0;
+}
+
+void StateVector::apply(const GateOp &op) {
+  if (op.measure) {
+    return;
+  }
+  if (op.target >= nQubits || op.control >= (int)nQubits) {
+    xacc::error("statevector gate on qubit " + std::to_string(op.target) +
+                " out of range for " + std::to_string(nQubits) + " qubits.");
+  }
+
+  const auto m00 = op.m[0], m01 = op.m[1], m10 = op.m[2], m11 = op.m[3];
+  const bool diagonal = m01 == 0.0 && m10 == 0.0;
+  const std::size_t t = op.target;
+  const std::int64_t tBit = std::int64_t(1) << t;
+  auto amps = amplitudes.data();
+
+  if (op.control < 0) {
+    const std::int64_t pairs = std::int64_t(amplitudes.size()) >> 1;
+    if (diagonal) {
+#pragma omp parallel for if (nQubits >= parallelThreshold)
+      for (std::int64_t i = 0; i < pairs; i++) {
+        const auto i0 = insertZero(i, t);
+        amps[i0] = mul(m00, amps[i0]);
+        amps[i0 | tBit] = mul(m11, amps[i0 | tBit]);
+      }
+    } else {
+#pragma omp parallel for if (nQubits >= parallelThreshold)
+      for (std::int64_t i = 0; i < pairs; i++) {
+        const auto i0 = insertZero(i, t), i1 = i0 | tBit;
+        const auto a0 = amps[i0], a1 = amps[i1];
+        amps[i0] = mul(m00, a0) + mul(m01, a1);
+        amps[i1] = mul(m10, a0) + mul(m11, a1);
+      }
+    }
+    return;
+  }
+
+  // Controlled, only the quarter of the state with the control set moves
+  const std::size_t c = op.control;
+  const std::int64_t cBit = std::int64_t(1) << c;
+  const std::size_t low = std::min(c, t), high = std::max(c, t);
+  const std::int64_t quads = std::int64_t(amplitudes.size()) >> 2;
+#pragma omp parallel for if (nQubits >= parallelThreshold)
+  for (std::int64_t i = 0; i < quads; i++) {
+    const auto i0 = insertZero(insertZero(i, low), high) | cBit,
+               i1 = i0 | tBit;
+    const auto a0 = amps[i0], a1 = amps[i1];
+    amps[i0] = mul(m00, a0) + mul(m01, a1);
+    amps[i1] = mul(m10, a0) + mul(m11, a1);
+  }
+}
+
+void StateVector::apply(const std::vector<GateOp> &ops,
+                        const std::size_t begin, const std::size_t end) {
+  for (std::size_t i = begin; i < end; i++) {
+    apply(ops[i]);
+  }
+}
+
+double StateVector::probabilityOne(const std::size_t q) const {
+  const std::int64_t dim = amplitudes.size();
+  const std::int64_t qBit = std::int64_t(1) << q;
+  auto amps = amplitudes.data();
+  double p = 0.0;
+#pragma omp parallel for reduction(+ : p) if (nQubits >= parallelThreshold)
+  for (std::int64_t i = 0; i < dim; i++) {
+    if (i & qBit) {
+      p += std::norm(amps[i]);
+    }
+  }
+  return p;
+}
+
+void StateVector::collapse(const std::size_t q, const int outcome,
+                           const double p) {
+  const std::int64_t dim = amplitudes.size();
+  const std::int64_t qBit = std::int64_t(1) << q;
+  const double scale = 1.0 / std::sqrt(p);
+  auto amps = amplitudes.data();
+#pragma omp parallel for if (nQubits >= parallelThreshold)
+  for (std::int64_t i = 0; i < dim; i++) {
+    amps[i] = (((i & qBit) != 0) == (outcome == 1)) ? amps[i] * scale : 0.0;
+  }
+}
+
+double StateVector::expectationZ(const std::uint64_t mask) const {
+  const std::int64_t dim = amplitudes.size();
+  auto amps = amplitudes.data();
+  double e = 0.0;
+#pragma omp parallel for reduction(+ : e) if (nQubits >= parallelThreshold)
+  for (std::int64_t i = 0; i < dim; i++) {
+    const auto p = std::norm(amps[i]);
+    e += __builtin_popcountll(i & mask) & 1 ? -p : p;
+  }
+  return e;
+}
+
+std::map<std::uint64_t, int>
+StateVector::sample(const int shots, std::mt19937_64 &rng) const {
+  // Sorted uniform draws let one sweep of the cumulative
+  // distribution assign every shot
+  std::uniform_real_distribution<double> uniform(0.0, 1.0);
+  std::vector<double> draws(shots);
+  for (auto &d : draws) {
+    d = uniform(rng);
+  }
+  std::sort(draws.begin(), draws.end());
+
+  std::map<std::uint64_t, int> counts;
+  // Rounding must never push a shot onto a zero amplitude
+  std::uint64_t last = amplitudes.size() - 1;
+  while (last > 0 && std::norm(amplitudes[last]) == 0.0) {
+    last--;
+  }
+  double cumulative = 0.0;
+  std::uint64_t i = 0;
+  for (auto d : draws) {
+    while (i < last && cumulative + std::norm(amplitudes[i]) <= d) {
+      cumulative += std::norm(amplitudes[i]);
+      i++;
+    }
+    counts[i]++;
+  }
+  return counts;
+}
+
+} // namespace quantum
+} // namespace xacc
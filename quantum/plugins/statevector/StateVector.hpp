@@ -0,0 +1,62 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#ifndef QUANTUM_GATE_ACCELERATORS_STATEVECTOR_HPP_
+#define QUANTUM_GATE_ACCELERATORS_STATEVECTOR_HPP_
+
+#include "StateVectorVisitor.hpp"
+
+#include <cstdint>
+#include <map>
+#include <random>
+
+namespace xacc {
+namespace quantum {
+
+// A dense n qubit state, qubit q is bit q of the amplitude index.
+// Gate kernels and reductions run in parallel with OpenMP
+// (when available) once the state is large enough to pay for it.
+class StateVector {
+public:
+  StateVector(const std::size_t nQubits = 0);
+
+  std::size_t size() const { return nQubits; }
+  void reset();
+
+  void apply(const GateOp &op);
+  void apply(const std::vector<GateOp> &ops, const std::size_t begin,
+             const std::size_t end);
+
+  // Probability of measuring 1 on qubit q
+  double probabilityOne(const std::size_t q) const;
+  // Project qubit q onto outcome, which has probability p
+  void collapse(const std::size_t q, const int outcome, const double p);
+
+  // <Z...Z> on the qubits set in mask
+  double expectationZ(const std::uint64_t mask) const;
+
+  // Sample basis states, returning counts keyed by amplitude index
+  std::map<std::uint64_t, int> sample(const int shots,
+                                      std::mt19937_64 &rng) const;
+
+  const std::vector<std::complex<double>> &getAmplitudes() const {
+    return amplitudes;
+  }
+
+protected:
+  std::size_t nQubits;
+  std::vector<std::complex<double>> amplitudes;
+};
+
+} // namespace quantum
+} // namespace xacc
+#endif
@@ -0,0 +1,220 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "StateVectorAccelerator.hpp"
+#include "InstructionIterator.hpp"
+
+#include <algorithm>
+
+namespace {
+using xacc::quantum::GateOp;
+
+// Number of leading ops a and b share, at most limit
+std::size_t sharedPrefix(const std::vector<GateOp> &a,
+                         const std::vector<GateOp> &b,
+                         const std::size_t limit) {
+  const auto n = std::min(limit, std::min(a.size(), b.size()));
+  std::size_t i = 0;
+  while (i < n && a[i] == b[i]) {
+    i++;
+  }
+  return i;
+}
+} // namespace
+
+namespace xacc {
+namespace quantum {
+
+StateVectorAccelerator::Program
+StateVectorAccelerator::lower(std::shared_ptr<CompositeInstruction> program) {
+  auto visitor = std::make_shared<StateVectorVisitor>();
+  InstructionIterator it(program);
+  while (it.hasNext()) {
+    auto nextInst = it.next();
+    if (nextInst->isEnabled() && !nextInst->isComposite()) {
+      nextInst->accept(visitor);
+    }
+  }
+  auto &ops = visitor->getOperations();
+
+  Program lowered;
+  std::size_t firstMeasure = ops.size();
+  bool terminal = true;
+  std::vector<bool> isMeasured;
+  for (std::size_t i = 0; i < ops.size(); i++) {
+    auto &op = ops[i];
+    auto touches = [&](const std::size_t q) {
+      return q < isMeasured.size() && isMeasured[q];
+    };
+    if (op.measure) {
+      firstMeasure = std::min(firstMeasure, i);
+      if (!touches(op.target)) {
+        if (isMeasured.size() <= op.target) {
+          isMeasured.resize(op.target + 1, false);
+        }
+        isMeasured[op.target] = true;
+        lowered.measured.push_back(op.target);
+      }
+    } else if (touches(op.target) ||
+               (op.control >= 0 && touches(op.control))) {
+      terminal = false;
+    }
+  }
+
+  if (terminal) {
+    // Measurements commute to the end
+    for (auto &op : ops) {
+      if (!op.measure) {
+        lowered.gates.push_back(op);
+      }
+    }
+  } else {
+    lowered.gates.assign(ops.begin(), ops.begin() + firstMeasure);
+    lowered.tail.assign(ops.begin() + firstMeasure, ops.end());
+  }
+  return lowered;
+}
+
+void StateVectorAccelerator::measure(std::shared_ptr<AcceleratorBuffer> buffer,
+                                     const Program &program,
+                                     const StateVector &state) {
+  std::uint64_t mask = 0;
+  for (auto q : program.measured) {
+    mask |= std::uint64_t(1) << q;
+  }
+
+  if (vqeMode && program.tail.empty()) {
+    buffer->addExtraInfo("exp-val-z", state.expectationZ(mask));
+    return;
+  }
+  if (program.measured.empty()) {
+    return;
+  }
+
+  auto toBitString = [&](const std::uint64_t index) {
+    std::string bitString(buffer->size(), '0');
+    for (auto q : program.measured) {
+      if ((index >> q) & 1) {
+        bitString[buffer->size() - 1 - q] = '1';
+      }
+    }
+    return bitString;
+  };
+
+  // Unmeasured qubits are dropped, so different sampled indices
+  // can give the same bit string
+  std::map<std::uint64_t, int> counts;
+  if (program.tail.empty()) {
+    for (auto &kv : state.sample(shots, rng)) {
+      counts[kv.first & mask] += kv.second;
+    }
+    for (auto &kv : counts) {
+      buffer->appendMeasurement(toBitString(kv.first), kv.second);
+    }
+    return;
+  }
+
+  // Mid-circuit measurements, collapse the state shot by shot
+  if (vqeMode) {
+    xacc::warning("statevector: circuit " + buffer->name() +
+                  " measures qubits mid-circuit, sampling it instead of "
+                  "computing exp-val-z exactly.");
+  }
+  std::uniform_real_distribution<double> uniform(0.0, 1.0);
+  for (int shot = 0; shot < shots; shot++) {
+    StateVector collapsed = state;
+    std::uint64_t outcomes = 0;
+    for (auto &op : program.tail) {
+      if (!op.measure) {
+        collapsed.apply(op);
+        continue;
+      }
+      auto p1 = collapsed.probabilityOne(op.target);
+      auto outcome = uniform(rng) < p1 ? 1 : 0;
+      collapsed.collapse(op.target, outcome, outcome ? p1 : 1.0 - p1);
+      outcomes &= ~(std::uint64_t(1) << op.target);
+      outcomes |= std::uint64_t(outcome) << op.target;
+    }
+    counts[outcomes]++;
+  }
+  for (auto &kv : counts) {
+    buffer->appendMeasurement(toBitString(kv.first), kv.second);
+  }
+}
+
+void StateVectorAccelerator::execute(
+    std::shared_ptr<AcceleratorBuffer> buffer,
+    const std::shared_ptr<CompositeInstruction> program) {
+  auto lowered = lower(program);
+  StateVector state(buffer->size());
+  state.apply(lowered.gates, 0, lowered.gates.size());
+  measure(buffer, lowered, state);
+}
+
+void StateVectorAccelerator::execute(
+    std::shared_ptr<AcceleratorBuffer> buffer,
+    const std::vector<std::shared_ptr<CompositeInstruction>> programs) {
+  std::vector<Program> lowered;
+  for (auto &p : programs) {
+    lowered.push_back(lower(p));
+  }
+
+  // Keep a checkpoint state after the gates the current program
+  // shares with the next one, so a run of programs with a common
+  // prefix (an ansatz followed by different measurement bases)
+  // only simulates that prefix once
+  StateVector checkpoint(buffer->size());
+  std::size_t checkpointLength = 0;
+  const std::vector<GateOp> *checkpointGates = nullptr;
+  for (std::size_t k = 0; k < programs.size(); k++) {
+    auto &gates = lowered[k].gates;
+    if (checkpointGates &&
+        sharedPrefix(*checkpointGates, gates, checkpointLength) <
+            checkpointLength) {
+      checkpoint.reset();
+      checkpointLength = 0;
+    }
+    auto next = k + 1 < programs.size()
+                    ? sharedPrefix(gates, lowered[k + 1].gates, gates.size())
+                    : 0;
+    if (next > checkpointLength) {
+      checkpoint.apply(gates, checkpointLength, next);
+      checkpointLength = next;
+    }
+    checkpointGates = &gates;
+
+    StateVector state = checkpoint;
+    state.apply(gates, checkpointLength, gates.size());
+
+    auto child = std::make_shared<AcceleratorBuffer>(programs[k]->name(),
+                                                     buffer->size());
+    measure(child, lowered[k], state);
+    buffer->appendChild(programs[k]->name(), child);
+  }
+}
+
+const std::vector<std::complex<double>>
+StateVectorAccelerator::getAcceleratorState(
+    std::shared_ptr<CompositeInstruction> program) {
+  auto lowered = lower(program);
+  std::size_t nQubits = 0;
+  for (auto &op : lowered.gates) {
+    nQubits = std::max(nQubits, op.target + 1);
+    nQubits = std::max(nQubits, (std::size_t)(op.control + 1));
+  }
+  StateVector state(nQubits);
+  state.apply(lowered.gates, 0, lowered.gates.size());
+  return state.getAmplitudes();
+}
+
+} // namespace quantum
+} // namespace xacc
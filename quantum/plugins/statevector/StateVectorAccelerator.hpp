@@ -0,0 +1,91 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#ifndef QUANTUM_GATE_ACCELERATORS_STATEVECTORACCELERATOR_HPP_
+#define QUANTUM_GATE_ACCELERATORS_STATEVECTORACCELERATOR_HPP_
+
+#include "Accelerator.hpp"
+#include "StateVector.hpp"
+
+namespace xacc {
+namespace quantum {
+
+// A local, dependency free statevector simulator. It is configured with
+//
+//   shots    - number of samples per circuit (default 1024)
+//   vqe-mode - if true, no sampling, each circuit's exp-val-z is the exact
+//              <Z...Z> over its measured qubits
+//   seed     - seed for sampling, for reproducible counts
+//
+// A vector of circuits sharing a common prefix (like the measurement
+// circuits of one observable) simulates the shared gates once.
+class StateVectorAccelerator : public Accelerator {
+public:
+  void initialize(const HeterogeneousMap &params = {}) override {
+    updateConfiguration(params);
+  }
+  void updateConfiguration(const HeterogeneousMap &config) override {
+    if (config.keyExists<int>("shots")) {
+      shots = config.get<int>("shots");
+    }
+    if (config.keyExists<bool>("vqe-mode")) {
+      vqeMode = config.get<bool>("vqe-mode");
+    }
+    if (config.keyExists<int>("seed")) {
+      rng.seed(config.get<int>("seed"));
+    }
+  }
+  const std::vector<std::string> configurationKeys() override {
+    return {"shots", "vqe-mode", "seed"};
+  }
+
+  const std::string name() const override { return "statevector"; }
+  const std::string description() const override {
+    return "Multithreaded statevector simulator.";
+  }
+
+  void execute(std::shared_ptr<AcceleratorBuffer> buffer,
+               const std::shared_ptr<CompositeInstruction> program) override;
+  void execute(std::shared_ptr<AcceleratorBuffer> buffer,
+               const std::vector<std::shared_ptr<CompositeInstruction>>
+                   programs) override;
+
+  const std::vector<std::complex<double>>
+  getAcceleratorState(std::shared_ptr<CompositeInstruction> program) override;
+
+  StateVectorAccelerator() : Accelerator(), rng(std::random_device()()) {}
+  virtual ~StateVectorAccelerator() {}
+
+protected:
+  // A program is simulated as a unitary part followed by
+  // a tail, the tail is only non-empty if a measured qubit
+  // is acted on again and so must be simulated shot by shot
+  struct Program {
+    std::vector<GateOp> gates;
+    std::vector<GateOp> tail;
+    std::vector<std::size_t> measured;
+  };
+  Program lower(std::shared_ptr<CompositeInstruction> program);
+
+  // Measure a simulated program into buffer
+  void measure(std::shared_ptr<AcceleratorBuffer> buffer,
+               const Program &program, const StateVector &state);
+
+  int shots = 1024;
+  bool vqeMode = false;
+  std::mt19937_64 rng;
+};
+
+} // namespace quantum
+} // namespace xacc
+
+#endif
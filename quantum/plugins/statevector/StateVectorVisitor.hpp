@@ -0,0 +1,154 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#ifndef QUANTUM_GATE_ACCELERATORS_STATEVECTORVISITOR_HPP_
+#define QUANTUM_GATE_ACCELERATORS_STATEVECTORVISITOR_HPP_
+
+#include "AllGateVisitor.hpp"
+#include "xacc.hpp"
+
+#include <array>
+#include <cmath>
+#include <complex>
+
+namespace xacc {
+namespace quantum {
+
+// Every gate the simulator applies is a 2x2 unitary
+// m = {m00, m01, m10, m11} on a target qubit, optionally
+// controlled on a second qubit. Measure is kept as its own op.
+struct GateOp {
+  std::size_t target = 0;
+  int control = -1;
+  bool measure = false;
+  std::array<std::complex<double>, 4> m;
+
+  bool operator==(const GateOp &other) const {
+    return target == other.target && control == other.control &&
+           measure == other.measure && m == other.m;
+  }
+  bool operator!=(const GateOp &other) const { return !(*this == other); }
+};
+
+// Lower XACC IR to a list of GateOps
+class StateVectorVisitor : public AllGateVisitor {
+protected:
+  using cd = std::complex<double>;
+  constexpr static double pi = xacc::constants::pi;
+  std::vector<GateOp> ops;
+
+  double angle(Instruction &inst, const std::size_t idx) {
+    auto p = inst.getParameter(idx);
+    if (p.which() == 0) {
+      return p.as<int>();
+    } else if (p.which() == 1) {
+      return p.as<double>();
+    }
+    xacc::error("statevector cannot simulate " + inst.name() +
+                " with unevaluated parameter " + p.toString() + ".");
+    return 0.0;
+  }
+
+  void add(const std::size_t target,
+           const std::array<std::complex<double>, 4> &m,
+           const int control = -1) {
+    GateOp op;
+    op.target = target;
+    op.control = control;
+    op.m = m;
+    ops.push_back(op);
+  }
+
+  static std::array<cd, 4> rz(const double theta) {
+    return {std::exp(cd(0, -theta / 2)), 0.0, 0.0, std::exp(cd(0, theta / 2))};
+  }
+
+public:
+  const std::string name() const override { return "statevector-visitor"; }
+  const std::string description() const override {
+    return "Map XACC IR to statevector gate operations.";
+  }
+
+  const std::vector<GateOp> &getOperations() const { return ops; }
+
+  void visit(Hadamard &h) override {
+    const double r = 1.0 / std::sqrt(2.0);
+    add(h.bits()[0], {r, r, r, -r});
+  }
+  void visit(X &x) override { add(x.bits()[0], {0.0, 1.0, 1.0, 0.0}); }
+  void visit(Y &y) override {
+    add(y.bits()[0], {0.0, cd(0, -1), cd(0, 1), 0.0});
+  }
+  void visit(Z &z) override { add(z.bits()[0], {1.0, 0.0, 0.0, -1.0}); }
+  void visit(S &s) override { add(s.bits()[0], {1.0, 0.0, 0.0, cd(0, 1)}); }
+  void visit(Sdg &s) override {
+    add(s.bits()[0], {1.0, 0.0, 0.0, cd(0, -1)});
+  }
+  void visit(T &t) override {
+    add(t.bits()[0], {1.0, 0.0, 0.0, std::exp(cd(0, pi / 4))});
+  }
+  void visit(Tdg &t) override {
+    add(t.bits()[0], {1.0, 0.0, 0.0, std::exp(cd(0, -pi / 4))});
+  }
+  void visit(Identity &i) override {}
+
+  void visit(Rz &r) override { add(r.bits()[0], rz(angle(r, 0))); }
+  void visit(Rx &r) override {
+    auto theta = angle(r, 0);
+    auto c = std::cos(theta / 2), s = std::sin(theta / 2);
+    add(r.bits()[0], {c, cd(0, -s), cd(0, -s), c});
+  }
+  void visit(Ry &r) override {
+    auto theta = angle(r, 0);
+    auto c = std::cos(theta / 2), s = std::sin(theta / 2);
+    add(r.bits()[0], {c, -s, s, c});
+  }
+  void visit(U &u) override {
+    auto theta = angle(u, 0), phi = angle(u, 1), lambda = angle(u, 2);
+    auto c = std::cos(theta / 2), s = std::sin(theta / 2);
+    add(u.bits()[0], {c, -std::exp(cd(0, lambda)) * s,
+                      std::exp(cd(0, phi)) * s,
+                      std::exp(cd(0, phi + lambda)) * c});
+  }
+
+  void visit(CNOT &cn) override {
+    add(cn.bits()[1], {0.0, 1.0, 1.0, 0.0}, cn.bits()[0]);
+  }
+  void visit(CY &cy) override {
+    add(cy.bits()[1], {0.0, cd(0, -1), cd(0, 1), 0.0}, cy.bits()[0]);
+  }
+  void visit(CZ &cz) override {
+    add(cz.bits()[1], {1.0, 0.0, 0.0, -1.0}, cz.bits()[0]);
+  }
+  void visit(CH &ch) override {
+    const double r = 1.0 / std::sqrt(2.0);
+    add(ch.bits()[1], {r, r, r, -r}, ch.bits()[0]);
+  }
+  void visit(CRZ &crz) override {
+    add(crz.bits()[1], rz(angle(crz, 0)), crz.bits()[0]);
+  }
+  void visit(CPhase &cp) override {
+    add(cp.bits()[1], {1.0, 0.0, 0.0, std::exp(cd(0, angle(cp, 0)))},
+        cp.bits()[0]);
+  }
+
+  void visit(Measure &m) override {
+    GateOp op;
+    op.target = m.bits()[0];
+    op.measure = true;
+    ops.push_back(op);
+  }
+};
+
+} // namespace quantum
+} // namespace xacc
+#endif
@@ -0,0 +1,186 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include <gtest/gtest.h>
+
+#include "StateVectorAccelerator.hpp"
+#include "Circuit.hpp"
+#include "xacc.hpp"
+
+using namespace xacc;
+using namespace xacc::quantum;
+
+namespace {
+// The deuteron ansatz followed by a measurement basis change
+std::shared_ptr<Circuit> deuteron(const std::string &name, const double theta,
+                                  const std::string &basis) {
+  auto circuit = std::make_shared<Circuit>(name);
+  circuit->addInstruction(std::make_shared<X>(0));
+  circuit->addInstruction(std::make_shared<Ry>(1, theta));
+  circuit->addInstruction(std::make_shared<CNOT>(1, 0));
+  for (std::size_t q = 0; q < 2; q++) {
+    if (basis[q] == '-') {
+      continue;
+    } else if (basis[q] == 'X') {
+      circuit->addInstruction(std::make_shared<Hadamard>(q));
+    } else if (basis[q] == 'Y') {
+      circuit->addInstruction(std::make_shared<Rx>(q, 1.57079632679489661923));
+    }
+    circuit->addInstruction(std::make_shared<Measure>(q));
+  }
+  return circuit;
+}
+} // namespace
+
+TEST(StateVectorAcceleratorTester, checkBell) {
+  StateVectorAccelerator acc;
+  HeterogeneousMap options{std::make_pair("shots", 1000),
+                           std::make_pair("seed", 7)};
+  acc.initialize(options);
+
+  auto bell = std::make_shared<Circuit>("bell");
+  bell->addInstruction(std::make_shared<Hadamard>(0));
+  bell->addInstruction(std::make_shared<CNOT>(0, 1));
+  bell->addInstruction(std::make_shared<Measure>(0));
+  bell->addInstruction(std::make_shared<Measure>(1));
+
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  acc.execute(buffer, bell);
+  auto counts = buffer->getMeasurementCounts();
+  EXPECT_EQ(2, counts.size());
+  EXPECT_EQ(1000, counts["00"] + counts["11"]);
+  EXPECT_NEAR(0.5, counts["00"] / 1000.0, 0.1);
+}
+
+TEST(StateVectorAcceleratorTester, checkPartialMeasurement) {
+  StateVectorAccelerator acc;
+  HeterogeneousMap options{std::make_pair("shots", 1000),
+                           std::make_pair("seed", 7)};
+  acc.initialize(options);
+
+  // Measuring only qubit 1 of a Bell pair next to a qubit in
+  // |+>, each outcome comes from two sampled basis states
+  auto bell = std::make_shared<Circuit>("bell");
+  bell->addInstruction(std::make_shared<Hadamard>(0));
+  bell->addInstruction(std::make_shared<CNOT>(0, 1));
+  bell->addInstruction(std::make_shared<Hadamard>(2));
+  bell->addInstruction(std::make_shared<Measure>(1));
+
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 3);
+  acc.execute(buffer, bell);
+  auto counts = buffer->getMeasurementCounts();
+  EXPECT_EQ(2, counts.size());
+  EXPECT_EQ(1000, counts["000"] + counts["010"]);
+  EXPECT_NEAR(0.5, counts["000"] / 1000.0, 0.1);
+}
+
+TEST(StateVectorAcceleratorTester, checkVqeMode) {
+  StateVectorAccelerator acc;
+  HeterogeneousMap options{std::make_pair("vqe-mode", true)};
+  acc.initialize(options);
+
+  // <H> = 5.907 - 2.1433 X0X1 - 2.1433 Y0Y1 + .21829 Z0 - 6.125 Z1
+  const double theta = 0.5943;
+  std::vector<std::shared_ptr<CompositeInstruction>> programs{
+      deuteron("X0X1", theta, "XX"), deuteron("Y0Y1", theta, "YY"),
+      deuteron("Z0", theta, "Z-"), deuteron("Z1", theta, "-Z")};
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  acc.execute(buffer, programs);
+
+  std::vector<double> coeffs{-2.1433, -2.1433, .21829, -6.125};
+  auto children = buffer->getChildren();
+  EXPECT_EQ(4, children.size());
+  double energy = 5.907;
+  for (int i = 0; i < 4; i++) {
+    EXPECT_TRUE(children[i]->getMeasurementCounts().empty());
+    energy += coeffs[i] * children[i]->getExpectationValueZ();
+  }
+  EXPECT_NEAR(-1.74886, energy, 1e-4);
+}
+
+TEST(StateVectorAcceleratorTester, checkSharedPrefix) {
+  StateVectorAccelerator acc;
+  HeterogeneousMap options{std::make_pair("vqe-mode", true)};
+  acc.initialize(options);
+
+  // Runs sharing an ansatz, broken up by a different one
+  std::vector<std::shared_ptr<CompositeInstruction>> programs{
+      deuteron("a", 0.1, "XX"), deuteron("b", 0.1, "YY"),
+      deuteron("c", 0.7, "XX"), deuteron("d", 0.1, "-Z"),
+      deuteron("e", 0.1, "Z-")};
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  acc.execute(buffer, programs);
+
+  auto children = buffer->getChildren();
+  for (int i = 0; i < programs.size(); i++) {
+    auto single = std::make_shared<AcceleratorBuffer>("q", 2);
+    acc.execute(single, programs[i]);
+    EXPECT_NEAR(single->getExpectationValueZ(),
+                children[i]->getExpectationValueZ(), 1e-12);
+  }
+}
+
+TEST(StateVectorAcceleratorTester, checkMidCircuitMeasurement) {
+  StateVectorAccelerator acc;
+  HeterogeneousMap options{std::make_pair("shots", 200)};
+  acc.initialize(options);
+
+  // Without the collapse H H would always give 0
+  auto circuit = std::make_shared<Circuit>("mid");
+  circuit->addInstruction(std::make_shared<Hadamard>(0));
+  circuit->addInstruction(std::make_shared<Measure>(0));
+  circuit->addInstruction(std::make_shared<Hadamard>(0));
+  circuit->addInstruction(std::make_shared<Measure>(0));
+
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  acc.execute(buffer, circuit);
+  auto counts = buffer->getMeasurementCounts();
+  EXPECT_EQ(2, counts.size());
+  EXPECT_EQ(200, counts["00"] + counts["01"]);
+  EXPECT_TRUE(counts["00"] > 0 && counts["01"] > 0);
+}
+
+TEST(StateVectorAcceleratorTester, checkGHZ) {
+  StateVectorAccelerator acc;
+  HeterogeneousMap options{std::make_pair("shots", 100)};
+  acc.initialize(options);
+
+  const std::size_t n = 16;
+  auto ghz = std::make_shared<Circuit>("ghz");
+  ghz->addInstruction(std::make_shared<Hadamard>(0));
+  for (std::size_t q = 1; q < n; q++) {
+    ghz->addInstruction(std::make_shared<CNOT>(q - 1, q));
+  }
+  for (std::size_t q = 0; q < n; q++) {
+    ghz->addInstruction(std::make_shared<Measure>(q));
+  }
+
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", n);
+  acc.execute(buffer, ghz);
+  for (auto &kv : buffer->getMeasurementCounts()) {
+    EXPECT_TRUE(kv.first == std::string(n, '0') ||
+                kv.first == std::string(n, '1'));
+  }
+
+  auto state = acc.getAcceleratorState(ghz);
+  EXPECT_EQ(1 << n, state.size());
+  EXPECT_NEAR(1.0 / std::sqrt(2.0), std::real(state[0]), 1e-12);
+  EXPECT_NEAR(1.0 / std::sqrt(2.0), std::real(state.back()), 1e-12);
+}
+
+int main(int argc, char **argv) {
+  xacc::Initialize(argc, argv);
+  ::testing::InitGoogleTest(&argc, argv);
+  auto ret = RUN_ALL_TESTS();
+  xacc::Finalize();
+  return ret;
+}
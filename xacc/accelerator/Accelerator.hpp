@@ -77,6 +77,20 @@ public:
                        const std::vector<std::shared_ptr<CompositeInstruction>>
                            CompositeInstructions) = 0;
 
+  // True if the execute overload below runs each program with its own
+  // number of shots. Accelerators that override it return true.
+  virtual bool supportsPerCircuitShots() { return false; }
+
+  // Execute a vector of programs, each with its own number of shots.
+  // By default the shots are ignored and every program runs with the
+  // Accelerator's configured shots, leaving its configuration untouched.
+  virtual void execute(std::shared_ptr<AcceleratorBuffer> buffer,
+                       const std::vector<std::shared_ptr<CompositeInstruction>>
+                           CompositeInstructions,
+                       const std::vector<int> &shots) {
+    execute(buffer, CompositeInstructions);
+  }
+
   virtual void cancel(){};
 
   virtual std::vector<std::pair<int, int>> getConnectivity() {
@@ -13,6 +13,9 @@
 #include "AcceleratorBuffer.hpp"
 #include "xacc.hpp"
 
+#include <algorithm>
+#include <atomic>
+#include <cmath>
 #include <numeric>
 
 #define RAPIDJSON_HAS_STDSTRING 1
@@ -23,10 +26,62 @@ using namespace rapidjson;
 
 namespace xacc {
 
+PackedBitString::PackedBitString(const std::string &bitStr)
+    : width(bitStr.size()), words((bitStr.size() + 63) / 64, 0) {
+  for (int i = 0; i < width; i++) {
+    const char c = bitStr[width - 1 - i];
+    if (c == '1') {
+      words[i / 64] |= std::uint64_t(1) << (i % 64);
+    } else if (c != '0') {
+      xacc::error("Invalid measurement bit string '" + bitStr +
+                  "', only 0 and 1 are allowed.");
+    }
+  }
+}
+
+PackedBitString::PackedBitString(const std::vector<std::uint64_t> &data,
+                                 const int nBits)
+    : width(nBits), words((nBits + 63) / 64, 0) {
+  for (std::size_t w = 0; w < words.size() && w < data.size(); w++) {
+    words[w] = data[w];
+  }
+  if (width % 64 != 0) {
+    words.back() &= (std::uint64_t(1) << (width % 64)) - 1;
+  }
+}
+
+const int PackedBitString::parity() const {
+  std::uint64_t x = 0;
+  for (auto w : words) {
+    x ^= w;
+  }
+  return __builtin_popcountll(x) & 1;
+}
+
+const std::string PackedBitString::toString() const {
+  std::string bitStr(width, '0');
+  for (int i = 0; i < width; i++) {
+    if (bit(i)) {
+      bitStr[width - 1 - i] = '1';
+    }
+  }
+  return bitStr;
+}
+
+std::size_t PackedBitStringHash::operator()(const PackedBitString &b) const {
+  std::size_t h = std::hash<int>()(b.size());
+  for (auto w : b.data()) {
+    h ^= std::hash<std::uint64_t>()(w) + 0x9e3779b97f4a7c15ULL + (h << 6) +
+         (h >> 2);
+  }
+  return h;
+}
+
 bool CheckEqualVisitor::operator()(const int &i) const {
   return mpark::get<int>(extraInfo) == i;
 }
 bool CheckEqualVisitor::operator()(const double &i) const {
+  // Exact, unlike the doubles in vectors and pairs below
   return mpark::get<double>(extraInfo) == i;
 }
 bool CheckEqualVisitor::operator()(const std::string &i) const {
@@ -158,6 +213,133 @@ void ToJsonVisitor<T>::operator()(
 
 template class ToJsonVisitor<PrettyWriter<StringBuffer>>;
 
+namespace {
+std::atomic<std::uint64_t> extraInfoGeneration(0);
+
+// Hashes an ExtraInfo for the child index. A scalar double (and the
+// values of a map<string, double>) must match exactly, while doubles
+// in a vector or pair compare equal to within 1e-12. All of them
+// hash by the 1e-6 wide cell they fall in, and a value near a cell
+// edge also yields the neighbouring cell, so both comparisons find
+// their matches.
+// The first hash is where the value is stored, the others are
+// extra buckets an equal value may be stored under.
+class IndexHashVisitor {
+protected:
+  static constexpr std::size_t maxHashes = 64;
+  std::vector<std::size_t> hashes;
+
+  void add(const std::size_t v) {
+    for (auto &h : hashes) {
+      h ^= v + 0x9e3779b97f4a7c15ULL + (h << 6) + (h >> 2);
+    }
+  }
+  void add(const int i) { add(std::hash<int>()(i)); }
+  void add(const std::string &str) { add(std::hash<std::string>()(str)); }
+  void add(const double d) {
+    // Doubles from 8192 up are more than 1e-12 apart, so
+    // equal ones are identical
+    if (std::fabs(std::fabs(d) - 8192.0) < 1e-10) {
+      overflow = true;
+    }
+    if (!std::isfinite(d) || std::fabs(d) >= 8192.0) {
+      add(std::hash<double>()(d));
+      return;
+    }
+    const double x = d * 1e6, cell = std::floor(x);
+    double neighbour = cell;
+    if (x - cell < 1e-4) {
+      neighbour = cell - 1;
+    } else if (cell + 1 - x < 1e-4) {
+      neighbour = cell + 1;
+    }
+    if (neighbour != cell) {
+      if (hashes.size() >= maxHashes) {
+        overflow = true;
+      } else {
+        std::vector<std::size_t> others(hashes);
+        for (auto &h : others) {
+          h ^= std::hash<std::int64_t>()(std::int64_t(neighbour)) + 0x9e3779b97f4a7c15ULL +
+               (h << 6) + (h >> 2);
+        }
+        add(std::hash<std::int64_t>()(std::int64_t(cell)));
+        hashes.insert(hashes.end(), others.begin(), others.end());
+        return;
+      }
+    }
+    add(std::hash<std::int64_t>()(std::int64_t(cell)));
+  }
+  void add(const std::vector<int> &v) {
+    add(v.size());
+    for (auto &x : v) {
+      add(x);
+    }
+  }
+  void add(const std::pair<double, double> &p) {
+    add(p.first);
+    add(p.second);
+  }
+
+public:
+  // Too many cells to try, equal values may be in any bucket
+  bool overflow = false;
+
+  IndexHashVisitor(const ExtraInfo &i) : hashes{i.index()} {}
+
+  const std::vector<std::size_t> &get() const { return hashes; }
+
+  void operator()(const int &i) { add(i); }
+  void operator()(const double &d) { add(d); }
+  void operator()(const std::string &str) { add(str); }
+  template <typename T> void operator()(const std::vector<T> &v) {
+    add(v.size());
+    for (auto &x : v) {
+      add(x);
+    }
+  }
+  template <typename K, typename V> void operator()(const std::map<K, V> &m) {
+    add(m.size());
+    for (auto &kv : m) {
+      add(kv.first);
+      add(kv.second);
+    }
+  }
+};
+
+bool infoEqual(const ExtraInfo &i, const ExtraInfo &j) {
+  return i.index() == j.index() && mpark::visit(CheckEqualVisitor(i), j);
+}
+
+// Positions in index.groups of the groups whose value equals i
+std::vector<std::size_t> findGroups(const ChildInfoIndex &index,
+                                    const ExtraInfo &i) {
+  std::vector<std::size_t> found;
+  IndexHashVisitor vis(i);
+  mpark::visit(vis, i);
+  if (vis.overflow) {
+    for (std::size_t g = 0; g < index.groups.size(); g++) {
+      if (infoEqual(i, index.groups[g].first)) {
+        found.push_back(g);
+      }
+    }
+    return found;
+  }
+  for (auto h : vis.get()) {
+    auto bucket = index.buckets.find(h);
+    if (bucket == index.buckets.end()) {
+      continue;
+    }
+    for (auto g : bucket->second) {
+      if (infoEqual(i, index.groups[g].first) &&
+          std::find(found.begin(), found.end(), g) == found.end()) {
+        found.push_back(g);
+      }
+    }
+  }
+  return found;
+}
+} // namespace
+
 AcceleratorBuffer::AcceleratorBuffer(const int N) : bufferId(""), nBits(N) {}
 
 AcceleratorBuffer::AcceleratorBuffer(const std::string &str, const int N)
@@ -171,16 +353,19 @@ bool AcceleratorBuffer::addExtraInfo(const std::string infoName, ExtraInfo i,
   if (info.count(infoName) && predicate(info[infoName])) {
     if (predicate(info[infoName])) {
       info[infoName] = i;
+      extraInfoGeneration++;
       return true;
     }
     return false;
   } else {
     info.insert({infoName, i});
+    extraInfoGeneration++;
     return true;
   }
 }
 
 void AcceleratorBuffer::addExtraInfo(const std::string infoName, ExtraInfo i) {
+  extraInfoGeneration++;
   if (info.count(infoName)) {
     // overwrite
     info[infoName] = i;
@@ -245,21 +430,51 @@ bool AcceleratorBuffer::hasExtraInfoKey(const std::string infoName) {
   return info.count(infoName);
 }
 
+ChildInfoIndex &AcceleratorBuffer::indexChildren(const std::string &infoName) {
+  auto &index = childIndices[infoName];
+  if (index.generation != extraInfoGeneration ||
+      index.nIndexed > children.size()) {
+    index = ChildInfoIndex();
+    index.generation = extraInfoGeneration;
+  }
+
+  // Only children appended since the last query are added
+  for (; index.nIndexed < children.size(); index.nIndexed++) {
+    auto &child = children[index.nIndexed].second;
+    if (!child->hasExtraInfoKey(infoName)) {
+      continue;
+    }
+    auto value = child->getInformation(infoName);
+    auto found = findGroups(index, value);
+    if (!found.empty()) {
+      index.groups[found.front()].second.push_back(index.nIndexed);
+    } else {
+      IndexHashVisitor vis(value);
+      mpark::visit(vis, value);
+      index.buckets[vis.get().front()].push_back(index.groups.size());
+      index.groups.push_back({value, {index.nIndexed}});
+    }
+  }
+  return index;
+}
+
 std::vector<std::shared_ptr<AcceleratorBuffer>>
 AcceleratorBuffer::getChildren(const std::string infoName, ExtraInfo i) {
 
   std::vector<std::shared_ptr<AcceleratorBuffer>> childrenWithExtraInfo;
 
-  for (auto &child : children) {
-    if (child.second->hasExtraInfoKey(infoName)) {
-      auto childExtraInfo = child.second->getInformation(infoName);
-      if (i.index() == childExtraInfo.index()) {
-        auto isEqual = mpark::visit(CheckEqualVisitor(i), childExtraInfo);
-        if (isEqual) {
-          childrenWithExtraInfo.push_back(child.second);
-        }
-      }
-    }
+  auto &index = indexChildren(infoName);
+  auto found = findGroups(index, i);
+  std::vector<std::size_t> positions;
+  for (auto g : found) {
+    auto &members = index.groups[g].second;
+    positions.insert(positions.end(), members.begin(), members.end());
+  }
+  if (found.size() > 1) {
+    std::sort(positions.begin(), positions.end());
+  }
+  for (auto p : positions) {
+    childrenWithExtraInfo.push_back(children[p].second);
   }
 
   return childrenWithExtraInfo;
@@ -268,31 +483,15 @@ AcceleratorBuffer::getChildren(const std::string infoName, ExtraInfo i) {
 std::vector<ExtraInfo> AcceleratorBuffer::getAllUnique(const std::string name) {
   std::vector<ExtraInfo> allExtraInfoAtName;
 
-  for (auto &child : children) {
-    if (child.second->hasExtraInfoKey(name)) {
-      auto childExtraInfo = child.second->getInformation(name);
-      allExtraInfoAtName.push_back(childExtraInfo);
-    }
+  for (auto &group : indexChildren(name).groups) {
+    allExtraInfoAtName.push_back(group.first);
   }
 
-  if (allExtraInfoAtName.empty()) {
-    return allExtraInfoAtName;
-  } else if (allExtraInfoAtName[0].index() < 3) {
-    // these are int, double, or strings, so its fairly simple
+  if (!allExtraInfoAtName.empty() && allExtraInfoAtName[0].index() < 3) {
+    // these are int, double, or strings, so sort them
     std::sort(allExtraInfoAtName.begin(), allExtraInfoAtName.end());
-    auto it = std::unique(allExtraInfoAtName.begin(), allExtraInfoAtName.end());
-    allExtraInfoAtName.erase(it, allExtraInfoAtName.end());
-    return allExtraInfoAtName;
-  } else {
-    // if they are the vectors, use a custom equality predicate
-    auto last =
-        std::unique(allExtraInfoAtName.begin(), allExtraInfoAtName.end(),
-                    [](const ExtraInfo &i, const ExtraInfo &j) -> bool {
-                      return mpark::visit(CheckEqualVisitor(i), j);
-                    });
-    allExtraInfoAtName.erase(last, allExtraInfoAtName.end());
-    return allExtraInfoAtName;
   }
+  return allExtraInfoAtName;
 }
 
 /**
@@ -314,39 +513,55 @@ const std::string AcceleratorBuffer::name() const { return bufferId; }
  */
 void AcceleratorBuffer::resetBuffer() {
   //   measurements.clear();
-  bitStringToCounts.clear();
+  clearMeasurements();
   children.clear();
+  childIndices.clear();
   info.clear();
+  extraInfoGeneration++;
 }
 
 void AcceleratorBuffer::appendMeasurement(const std::string &measurement) {
-
-  bitStringToCounts[measurement]++;
+  packedCounts[PackedBitString(measurement)]++;
+  countsViewValid = false;
 }
 
 void AcceleratorBuffer::appendMeasurement(const std::string measurement,
                                           const int count) {
-  bitStringToCounts[measurement] = count;
-
+  packedCounts[PackedBitString(measurement)] = count;
+  countsViewValid = false;
   return;
 }
 
 double
 AcceleratorBuffer::computeMeasurementProbability(const std::string &bitStr) {
-  return (double)bitStringToCounts[bitStr] /
-         std::accumulate(
-             bitStringToCounts.begin(), bitStringToCounts.end(), 0,
-             [](int value, const std::map<std::string, int>::value_type &p) {
-               return value + p.second;
-             });
-}
-
-std::shared_ptr<AcceleratorBuffer> AcceleratorBuffer::clone() {
-  std::stringstream s;
-  print(s);
-  std::istringstream is(s.str());
-  auto cloned = std::make_shared<AcceleratorBuffer>();
-  cloned->load(is);
+  auto it = packedCounts.find(PackedBitString(bitStr));
+  if (it == packedCounts.end()) {
+    return 0.0;
+  }
+  return (double)it->second /
+         std::accumulate(packedCounts.begin(), packedCounts.end(), 0,
+                         [](int value, const PackedCounts::value_type &p) {
+                           return value + p.second;
+                         });
+}
+
+std::shared_ptr<AcceleratorBuffer>
+AcceleratorBuffer::clone(const bool withChildren) {
+  // Copy members directly, ExtraInfo holds values so the
+  // clone shares no state with this buffer
+  auto cloned = std::make_shared<AcceleratorBuffer>(bufferId, nBits);
+  cloned->packedCounts = packedCounts;
+  cloned->bitStringToCounts = bitStringToCounts;
+  cloned->countsViewValid = countsViewValid;
+  cloned->info = info;
+  cloned->cacheFile = cacheFile;
+  cloned->bit2IndexMap = bit2IndexMap;
+  if (withChildren) {
+    cloned->children.reserve(children.size());
+    for (auto &c : children) {
+      cloned->children.push_back({c.first, c.second->clone()});
+    }
+  }
   return cloned;
 }
 
@@ -361,33 +576,108 @@ std::shared_ptr<AcceleratorBuffer> AcceleratorBuffer::clone() {
  */
 const double AcceleratorBuffer::getExpectationValueZ() {
   double aver = 0.0;
-  auto has_even_parity = [](unsigned int x) -> int {
-    unsigned int count = 0, i, b = 1;
-    for (i = 0; i < 32; i++) {
-      if (x & (b << i)) {
-        count++;
+  if (packedCounts.empty() && this->hasExtraInfoKey("exp-val-z")) {
+    aver = mpark::get<double>(getInformation("exp-val-z"));
+  } else {
+    int total = 0;
+    for (auto &kv : packedCounts) {
+      total += kv.second;
+      aver += kv.first.parity() ? -kv.second : kv.second;
+    }
+    if (total > 0) {
+      aver /= total;
+    }
+  }
+  return aver;
+}
+
+PackedCounts AcceleratorBuffer::getMarginalCounts(const std::vector<int> &bits) {
+  PackedCounts marginal;
+  std::vector<std::uint64_t> words((bits.size() + 63) / 64);
+  for (auto &kv : packedCounts) {
+    std::fill(words.begin(), words.end(), 0);
+    for (std::size_t k = 0; k < bits.size(); k++) {
+      if (bits[k] < 0 || bits[k] >= kv.first.size()) {
+        xacc::error("Cannot marginalize onto bit " + std::to_string(bits[k]) +
+                    ", outcomes of buffer " + name() + " have " +
+                    std::to_string(kv.first.size()) + " bits.");
+      }
+      if (kv.first.bit(bits[k])) {
+        words[k / 64] |= std::uint64_t(1) << (k % 64);
       }
     }
-    if ((count % 2)) {
-      return 0;
+    marginal[PackedBitString(words, bits.size())] += kv.second;
+  }
+  return marginal;
+}
+
+std::vector<double> AcceleratorBuffer::getExpectationValuesZ(
+    const std::vector<std::vector<int>> &zBits) {
+  // Each Z string as a mask over the packed words, a repeated
+  // bit cancels since Z Z = I
+  std::vector<std::vector<std::uint64_t>> masks;
+  for (auto &z : zBits) {
+    std::vector<std::uint64_t> mask;
+    for (auto b : z) {
+      if (b < 0) {
+        xacc::error("Invalid bit " + std::to_string(b) + " in Z string.");
+      }
+      if (std::size_t(b / 64) >= mask.size()) {
+        mask.resize(b / 64 + 1, 0);
+      }
+      mask[b / 64] ^= std::uint64_t(1) << (b % 64);
     }
-    return 1;
-  };
+    masks.push_back(mask);
+  }
 
-  if (bitStringToCounts.empty() && this->hasExtraInfoKey("exp-val-z")) {
-    aver = mpark::get<double>(getInformation("exp-val-z"));
-  } else {
-    for (auto &kv : bitStringToCounts) {
-      int i = std::stoi(kv.first, nullptr, 2);
-      auto par = has_even_parity(i);
-      auto p = computeMeasurementProbability(kv.first);
-      if (!par) {
-        p = -p;
+  std::vector<double> exps(masks.size(), 0.0);
+  int total = 0;
+  for (auto &kv : packedCounts) {
+    auto &words = kv.first.data();
+    total += kv.second;
+    for (std::size_t i = 0; i < masks.size(); i++) {
+      std::uint64_t x = 0;
+      for (std::size_t w = 0; w < masks[i].size() && w < words.size(); w++) {
+        x ^= masks[i][w] & words[w];
       }
-      aver += p;
+      exps[i] += __builtin_popcountll(x) & 1 ? -kv.second : kv.second;
     }
   }
-  return aver;
+  if (total > 0) {
+    for (auto &e : exps) {
+      e /= total;
+    }
+  }
+  return exps;
+}
+
+std::vector<double> AcceleratorBuffer::getProbabilities() {
+  if (nBits > 24) {
+    xacc::error("AcceleratorBuffer.getProbabilities supports at most 24 "
+                "bits, buffer " +
+                name() + " has " + std::to_string(nBits) + ".");
+  }
+  std::vector<double> probs(std::size_t(1) << nBits, 0.0);
+  int total = 0;
+  for (auto &kv : packedCounts) {
+    auto &words = kv.first.data();
+    const std::uint64_t idx = words.empty() ? 0 : words[0];
+    if (idx >= probs.size() ||
+        std::any_of(words.begin() + std::min<std::size_t>(words.size(), 1),
+                    words.end(), [](std::uint64_t w) { return w != 0; })) {
+      xacc::error("Outcome " + kv.first.toString() +
+                  " does not fit in buffer " + name() + " of " +
+                  std::to_string(nBits) + " bits.");
+    }
+    probs[idx] += kv.second;
+    total += kv.second;
+  }
+  if (total > 0) {
+    for (auto &p : probs) {
+      p /= total;
+    }
+  }
+  return probs;
 }
 
 void AcceleratorBuffer::setExpectationValueZ(const double exp) {
@@ -403,13 +693,20 @@ void AcceleratorBuffer::setExpectationValueZ(const double exp) {
  */
 const std::vector<std::string> AcceleratorBuffer::getMeasurements() {
   std::vector<std::string> strs;
-  for (auto m : bitStringToCounts) {
+  for (auto &m : getMeasurementCounts()) {
     strs.push_back(m.first);
   }
   return strs;
 }
 
 std::map<std::string, int> AcceleratorBuffer::getMeasurementCounts() {
+  if (!countsViewValid) {
+    bitStringToCounts.clear();
+    for (auto &kv : packedCounts) {
+      bitStringToCounts.insert({kv.first.toString(), kv.second});
+    }
+    countsViewValid = true;
+  }
   return bitStringToCounts;
 }
 
@@ -452,7 +749,7 @@ void AcceleratorBuffer::print(std::ostream &stream) {
   if (!cacheFile) {
     writer.Key("Measurements");
     writer.StartObject();
-    for (auto &kv : bitStringToCounts) {
+    for (auto &kv : getMeasurementCounts()) {
       writer.Key(kv.first);
       writer.Int(kv.second);
     }
@@ -16,6 +16,8 @@
 #include <string>
 #include <sstream>
 #include <iostream>
+#include <cstdint>
+#include <unordered_map>
 #include "Utils.hpp"
 #include "heterogeneous.hpp"
 
@@ -102,6 +104,51 @@ protected:
   }
 };
 
+// A measured bit string packed 64 bits to a word. Bit i of the
+// packed value is character size() - 1 - i of the string, so for
+// a string spanning the whole buffer bit i is qubit i.
+class PackedBitString {
+protected:
+  int width = 0;
+  std::vector<std::uint64_t> words;
+
+public:
+  PackedBitString() = default;
+  PackedBitString(const std::string &bitStr);
+  // Take the low nBits bits of the given words
+  PackedBitString(const std::vector<std::uint64_t> &data, const int nBits);
+
+  const int size() const { return width; }
+  const std::vector<std::uint64_t> &data() const { return words; }
+  bool bit(const int i) const { return (words[i / 64] >> (i % 64)) & 1; }
+  // 1 if an odd number of bits are set, 0 otherwise
+  const int parity() const;
+  const std::string toString() const;
+
+  bool operator==(const PackedBitString &other) const {
+    return width == other.width && words == other.words;
+  }
+};
+
+struct PackedBitStringHash {
+  std::size_t operator()(const PackedBitString &b) const;
+};
+
+using PackedCounts = std::unordered_map<PackedBitString, int, PackedBitStringHash>;
+
+// Children grouped by the value they hold at one ExtraInfo
+// key, built on demand by AcceleratorBuffer::getChildren
+struct ChildInfoIndex {
+  // Every ExtraInfo change on any buffer bumps a global
+  // generation, an index built at an older one is stale
+  std::uint64_t generation = 0;
+  std::size_t nIndexed = 0;
+  // Distinct values in order of first appearance, each with
+  // the positions of the children holding it
+  std::vector<std::pair<ExtraInfo, std::vector<std::size_t>>> groups;
+  std::unordered_map<std::size_t, std::vector<std::size_t>> buckets;
+};
+
 // The AcceleratorBuffer serves as the mediator between
 // clients and backend execution. It represents a buffer of
 // bits on the targeted Accelerator backend. At its core, it exposes
@@ -118,13 +165,20 @@ protected:
 class AcceleratorBuffer {
 
 protected:
+  // Counts are stored packed, the string keyed map is
+  // only a view built the first time it is asked for
+  PackedCounts packedCounts;
   std::map<std::string, int> bitStringToCounts;
+  bool countsViewValid = true;
   std::string bufferId;
   int nBits;
   std::vector<AcceleratorBufferChildPair> children;
   std::map<std::string, ExtraInfo> info;
   bool cacheFile = false;
   std::map<int, int> bit2IndexMap;
+  std::map<std::string, ChildInfoIndex> childIndices;
+
+  ChildInfoIndex &indexChildren(const std::string &infoName);
 
 public:
   AcceleratorBuffer() {}
@@ -148,7 +202,9 @@ public:
   ExtraInfo getInformation(const std::string name);
   std::map<std::string, ExtraInfo> getInformation();
 
-  std::shared_ptr<AcceleratorBuffer> clone();
+  // Deep copy of this buffer, leaving out the children
+  // if withChildren is false
+  std::shared_ptr<AcceleratorBuffer> clone(const bool withChildren = true);
 
   std::map<int, int> getBitMap() { return bit2IndexMap; }
 
@@ -166,6 +222,7 @@ public:
 
   void removeChild(const std::size_t idx) {
       children.erase(children.begin()+idx);
+      childIndices.clear();
   }
 
   const int size() const;
@@ -183,14 +240,37 @@ public:
 
   virtual const std::vector<std::string> getMeasurements();
   virtual std::map<std::string, int> getMeasurementCounts();
+  const PackedCounts &getPackedMeasurementCounts() const {
+    return packedCounts;
+  }
+  // Counts summed over all bits but the given ones, bit k
+  // of a marginal outcome is bit bits[k] of the full outcome
+  virtual PackedCounts getMarginalCounts(const std::vector<int> &bits);
+  // <Z...Z> on each of the given sets of bits, computed
+  // in a single pass over the counts
+  virtual std::vector<double>
+  getExpectationValuesZ(const std::vector<std::vector<int>> &zBits);
+  // Outcome probabilities indexed by the outcome's value,
+  // for buffers of at most 24 bits
+  virtual std::vector<double> getProbabilities();
   virtual void clearMeasurements() {
     // measurements.clear();
+    packedCounts.clear();
     bitStringToCounts.clear();
+    countsViewValid = true;
   }
   virtual void setMeasurements(std::map<std::string, int> counts) {
     clearMeasurements();
+    for (auto &kv : counts) {
+      packedCounts[PackedBitString(kv.first)] = kv.second;
+    }
     bitStringToCounts = counts;
   }
+  void setPackedMeasurements(const PackedCounts &counts) {
+    clearMeasurements();
+    packedCounts = counts;
+    countsViewValid = packedCounts.empty();
+  }
 
   virtual void print();
   const std::string toString();
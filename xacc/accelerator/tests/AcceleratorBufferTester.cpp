@@ -216,6 +216,138 @@ TEST(AcceleratorBufferTester, checkEmptyParametersBug) {
 
   b.print();
 }
+TEST(AcceleratorBufferTester, checkClone) {
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  buffer->addExtraInfo("vqe-energy", ExtraInfo(-1.749));
+  buffer->appendMeasurement("01", 10);
+  auto child = std::make_shared<AcceleratorBuffer>("Z0", 2);
+  child->addExtraInfo("parameters", ExtraInfo(std::vector<double>{0.5}));
+  child->appendMeasurement("00", 3);
+  buffer->appendChild("Z0", child);
+
+  auto cloned = buffer->clone();
+  std::stringstream expected, actual;
+  buffer->print(expected);
+  cloned->print(actual);
+  EXPECT_EQ(expected.str(), actual.str());
+
+  // Nothing is shared with the original
+  cloned->getChildren()[0]->appendMeasurement("11", 1);
+  cloned->addExtraInfo("vqe-energy", ExtraInfo(0.0));
+  EXPECT_EQ(1, buffer->getChildren()[0]->getMeasurementCounts().size());
+  EXPECT_NEAR(-1.749, buffer->getInformation("vqe-energy").as<double>(), 1e-12);
+
+  auto top = buffer->clone(false);
+  EXPECT_EQ(0, top->nChildren());
+  EXPECT_EQ(10, top->getMeasurementCounts()["01"]);
+}
+
+TEST(AcceleratorBufferTester, checkPackedCounts) {
+  // Wider than a 64 bit word, and past the old 32 bit limit
+  AcceleratorBuffer b("q", 70);
+  const std::string odd = "1" + std::string(69, '0');
+  const std::string even = "1" + std::string(68, '0') + "1";
+  b.appendMeasurement(odd, 1);
+  b.appendMeasurement(even, 3);
+  b.appendMeasurement(even);
+  EXPECT_NEAR(0.6, b.getExpectationValueZ(), 1e-12);
+  EXPECT_NEAR(0.8, b.computeMeasurementProbability(even), 1e-12);
+  EXPECT_EQ(0.0, b.computeMeasurementProbability(std::string(70, '0')));
+
+  auto counts = b.getMeasurementCounts();
+  EXPECT_EQ(2, counts.size());
+  EXPECT_EQ(1, counts[odd]);
+  EXPECT_EQ(4, counts[even]);
+
+  // Leading zeros survive the round trip through the packed store
+  b.setMeasurements({{"001", 2}, {"010", 2}});
+  b.appendMeasurement("011", 4);
+  EXPECT_NEAR(0.0, b.getExpectationValueZ(), 1e-12);
+  std::vector<std::string> expected{"001", "010", "011"};
+  EXPECT_EQ(expected, b.getMeasurements());
+
+  PackedBitString p("0110");
+  EXPECT_TRUE(p.bit(1) && p.bit(2) && !p.bit(0) && !p.bit(3));
+  EXPECT_EQ(0, p.parity());
+  EXPECT_EQ("0110", p.toString());
+
+  // Bits past the width are dropped
+  PackedCounts packed{{PackedBitString({0xF6}, 4), 5}};
+  b.setPackedMeasurements(packed);
+  EXPECT_EQ(5, b.getMeasurementCounts()["0110"]);
+  EXPECT_NEAR(1.0, b.getExpectationValueZ(), 1e-12);
+}
+
+TEST(AcceleratorBufferTester, checkMarginalsAndZStrings) {
+  // Qubit q is character 2 - q
+  AcceleratorBuffer b("q", 3);
+  b.appendMeasurement("000", 4);
+  b.appendMeasurement("011", 2);
+  b.appendMeasurement("101", 1);
+  b.appendMeasurement("110", 1);
+
+  auto marginal = b.getMarginalCounts({2, 0});
+  EXPECT_EQ(4, marginal.size());
+  EXPECT_EQ(4, marginal[PackedBitString("00")]);
+  // Marginal bit 0 is qubit 2 and bit 1 is qubit 0
+  EXPECT_EQ(2, marginal[PackedBitString("10")]);
+  EXPECT_EQ(1, marginal[PackedBitString("11")]);
+  EXPECT_EQ(1, marginal[PackedBitString("01")]);
+
+  auto exps = b.getExpectationValuesZ({{0}, {1, 2}, {0, 1, 2}, {}, {1, 1}});
+  EXPECT_NEAR(0.25, exps[0], 1e-12);
+  EXPECT_NEAR(0.25, exps[1], 1e-12);
+  EXPECT_NEAR(b.getExpectationValueZ(), exps[2], 1e-12);
+  EXPECT_NEAR(1.0, exps[3], 1e-12);
+  EXPECT_NEAR(1.0, exps[4], 1e-12);
+
+  auto probs = b.getProbabilities();
+  std::vector<double> expected{.5, 0., 0., .25, 0., .125, .125, 0.};
+  EXPECT_EQ(8, probs.size());
+  for (int i = 0; i < 8; i++) {
+    EXPECT_NEAR(expected[i], probs[i], 1e-12);
+  }
+}
+
+TEST(AcceleratorBufferTester, checkChildIndex) {
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  for (int i = 0; i < 30; i++) {
+    auto child = std::make_shared<AcceleratorBuffer>("c" + std::to_string(i), 2);
+    child->addExtraInfo("parameters",
+                        ExtraInfo(std::vector<double>{0.1 * (i % 10), 1.0}));
+    child->addExtraInfo("kernel", ExtraInfo(std::string(i % 2 ? "Z0" : "X0")));
+    buffer->appendChild(child->name(), child);
+  }
+
+  auto params = ExtraInfo(std::vector<double>{0.3, 1.0});
+  auto matches = buffer->getChildren("parameters", params);
+  EXPECT_EQ(3, matches.size());
+  EXPECT_EQ("c3", matches[0]->name());
+  EXPECT_EQ("c23", matches[2]->name());
+  EXPECT_EQ(10, buffer->getAllUnique("parameters").size());
+  EXPECT_EQ(15, buffer->getChildren("kernel", ExtraInfo("Z0")).size());
+
+  // Equal to within 1e-12 across a hash cell edge
+  auto close = ExtraInfo(std::vector<double>{0.3 + 5e-13, 1.0 - 5e-13});
+  EXPECT_EQ(3, buffer->getChildren("parameters", close).size());
+
+  // Children appended or changed after the index was built
+  auto extra = std::make_shared<AcceleratorBuffer>("extra", 2);
+  extra->addExtraInfo("parameters", params);
+  buffer->appendChild("extra", extra);
+  EXPECT_EQ(4, buffer->getChildren("parameters", params).size());
+  matches[0]->addExtraInfo("parameters", ExtraInfo(std::vector<double>{2.0}));
+  EXPECT_EQ(3, buffer->getChildren("parameters", params).size());
+  EXPECT_EQ(11, buffer->getAllUnique("parameters").size());
+  buffer->removeChild(buffer->nChildren() - 1);
+  EXPECT_EQ(2, buffer->getChildren("parameters", params).size());
+
+  auto kernels = buffer->getAllUnique("kernel");
+  EXPECT_EQ(2, kernels.size());
+  EXPECT_EQ("X0", kernels[0].as<std::string>());
+  EXPECT_TRUE(buffer->getChildren("missing", params).empty());
+}
+
 int main(int argc, char **argv) {
   ::testing::InitGoogleTest(&argc, argv);
   return RUN_ALL_TESTS();
@@ -0,0 +1,111 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "AlgorithmHistory.hpp"
+#include "xacc.hpp"
+
+#include <numeric>
+
+namespace xacc {
+
+AlgorithmHistory::AlgorithmHistory(const HeterogeneousMap &options,
+                                   const std::string name)
+    : valueName(name) {
+  if (options.stringExists("history")) {
+    historyMode = options.getString("history");
+  }
+  if (historyMode != "full" && historyMode != "none" &&
+      historyMode != "summary" && historyMode != "ring") {
+    xacc::error("Invalid history option " + historyMode +
+                ", valid options are full, none, summary and ring.");
+  }
+
+  if (options.keyExists<int>("history-size")) {
+    ringSize = options.get<int>("history-size");
+    if (ringSize < 1) {
+      xacc::error("Invalid history-size " + std::to_string(ringSize) +
+                  ", must be at least 1.");
+    }
+  }
+}
+
+void AlgorithmHistory::record(
+    std::shared_ptr<AcceleratorBuffer> buffer,
+    const std::vector<AcceleratorBufferChildPair> &children,
+    const std::vector<double> &x, const double value,
+    const std::vector<std::string> &termNames,
+    const std::vector<double> &termVals) {
+
+  if (historyMode == "summary") {
+    parameters.insert(parameters.end(), x.begin(), x.end());
+    values.push_back(value);
+    if (terms.empty()) {
+      terms = termNames;
+    }
+    termValues.insert(termValues.end(), termVals.begin(), termVals.end());
+    return;
+  }
+
+  if (!keepsChildren()) {
+    return;
+  }
+
+  for (auto &c : children) {
+    buffer->appendChild(c.first, c.second);
+  }
+
+  if (historyMode == "ring") {
+    ringCounts.push_back(children.size());
+    if (ringCounts.size() > (std::size_t)ringSize) {
+      // Our children are the last ones appended, drop the oldest iteration
+      auto kept = std::accumulate(ringCounts.begin(), ringCounts.end(),
+                                  std::size_t(0));
+      auto first = buffer->nChildren() - kept;
+      for (std::size_t i = 0; i < ringCounts.front(); i++) {
+        buffer->removeChild(first);
+      }
+      ringCounts.pop_front();
+    }
+  }
+}
+
+void AlgorithmHistory::appendInfo(std::shared_ptr<AcceleratorBuffer> buffer,
+                                  const std::string key,
+                                  const std::vector<double> &data) {
+  std::vector<double> all;
+  if (buffer->hasExtraInfoKey(key)) {
+    all = buffer->getInformation(key).as<std::vector<double>>();
+  }
+  all.insert(all.end(), data.begin(), data.end());
+  buffer->addExtraInfo(key, all);
+}
+
+void AlgorithmHistory::flush(std::shared_ptr<AcceleratorBuffer> buffer) {
+  if (historyMode != "summary" || values.empty()) {
+    return;
+  }
+
+  appendInfo(buffer, "history-parameters", parameters);
+  appendInfo(buffer, "history-" + valueName, values);
+  if (!terms.empty()) {
+    if (!buffer->hasExtraInfoKey("history-terms")) {
+      buffer->addExtraInfo("history-terms", terms);
+    }
+    appendInfo(buffer, "history-term-exp-val-z", termValues);
+  }
+
+  parameters.clear();
+  values.clear();
+  termValues.clear();
+}
+
+} // namespace xacc
@@ -0,0 +1,78 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#ifndef XACC_ALGORITHM_HISTORY_HPP_
+#define XACC_ALGORITHM_HISTORY_HPP_
+
+#include "AcceleratorBuffer.hpp"
+#include "heterogeneous.hpp"
+
+#include <deque>
+
+namespace xacc {
+
+// The AlgorithmHistory decides what an iterative algorithm keeps
+// on its result buffer for every iteration, set with the history option:
+//
+//   full    - append every iteration's child buffers (the default)
+//   none    - keep nothing
+//   summary - keep no children, only dense per-iteration arrays,
+//             history-parameters (row-major, one row of x per iteration),
+//             history-<valueName>, and if there are terms
+//             history-terms and history-term-exp-val-z (row-major,
+//             one row of term expectations per iteration)
+//   ring    - append children but keep only those of the last
+//             history-size iterations (default 10)
+class AlgorithmHistory {
+public:
+  AlgorithmHistory() = default;
+  AlgorithmHistory(const HeterogeneousMap &options,
+                   const std::string name = "value");
+
+  const std::string mode() const { return historyMode; }
+  // True if children of an iteration will be kept on the buffer
+  bool keepsChildren() const {
+    return historyMode == "full" || historyMode == "ring";
+  }
+
+  // Record one iteration, with its child buffers, parameters x, the
+  // objective value, and optionally named term expectation values
+  void record(std::shared_ptr<AcceleratorBuffer> buffer,
+              const std::vector<AcceleratorBufferChildPair> &children,
+              const std::vector<double> &x, const double value,
+              const std::vector<std::string> &termNames = {},
+              const std::vector<double> &termValues = {});
+
+  // Write the summary arrays recorded so far to buffer, appending
+  // to any already there
+  void flush(std::shared_ptr<AcceleratorBuffer> buffer);
+
+protected:
+  std::string historyMode = "full";
+  std::string valueName = "value";
+  int ringSize = 10;
+
+  // ring, number of children appended for each kept iteration
+  std::deque<std::size_t> ringCounts;
+
+  // summary, recorded since the last flush
+  std::vector<double> parameters;
+  std::vector<double> values;
+  std::vector<std::string> terms;
+  std::vector<double> termValues;
+
+  void appendInfo(std::shared_ptr<AcceleratorBuffer> buffer,
+                  const std::string key, const std::vector<double> &data);
+};
+
+} // namespace xacc
+#endif
@@ -0,0 +1,103 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include "ShotAllocator.hpp"
+#include "xacc.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <numeric>
+
+namespace xacc {
+
+ShotAllocator::ShotAllocator(const HeterogeneousMap &options) {
+  if (options.keyExists<int>("shot-budget")) {
+    budget = options.get<int>("shot-budget");
+  }
+  if (options.keyExists<int>("min-shots")) {
+    minShots = options.get<int>("min-shots");
+  }
+  if (options.stringExists("shot-allocation")) {
+    allocation = options.getString("shot-allocation");
+  }
+
+  if (allocation != "uniform" && allocation != "weighted" &&
+      allocation != "variance") {
+    xacc::error("Invalid shot-allocation " + allocation +
+                ", valid options are uniform, weighted and variance.");
+  }
+  if (budget < 0 || minShots < 1) {
+    xacc::error("Invalid shot-budget or min-shots, " + std::to_string(budget) +
+                ", " + std::to_string(minShots) + ".");
+  }
+}
+
+void ShotAllocator::setBounds(const std::vector<double> &b) {
+  bounds = b;
+  sigmas = b;
+}
+
+void ShotAllocator::update(const std::size_t k, const double sigma) {
+  // Average with the previous estimate, a single noisy (or
+  // zero, from few shots) estimate should not starve a circuit.
+  // A negative sigma is unknown and keeps the previous estimate.
+  if (allocation == "variance" && std::isfinite(sigma) && sigma >= 0.0) {
+    sigmas[k] = 0.5 * (sigmas[k] + std::min(sigma, bounds[k]));
+  }
+}
+
+std::vector<int> ShotAllocator::allocate() const {
+  const int n = sigmas.size();
+  if (n == 0) {
+    return {};
+  }
+  if (budget < n * minShots) {
+    xacc::error("shot-budget " + std::to_string(budget) + " is too small for " +
+                std::to_string(n) + " circuits with min-shots " +
+                std::to_string(minShots) + ".");
+  }
+
+  std::vector<double> weights(n, 1.0);
+  if (allocation == "weighted") {
+    weights = bounds;
+  } else if (allocation == "variance") {
+    weights = sigmas;
+  }
+  auto total = std::accumulate(weights.begin(), weights.end(), 0.0);
+  if (total <= 0.0) {
+    weights.assign(n, 1.0);
+    total = n;
+  }
+
+  // minShots each, the rest in proportion to the weights,
+  // rounding by largest remainder
+  const int free = budget - n * minShots;
+  std::vector<int> shots(n, minShots);
+  std::vector<std::pair<double, int>> remainders;
+  int assigned = 0;
+  for (int k = 0; k < n; k++) {
+    auto share = free * weights[k] / total;
+    auto whole = (int)std::floor(share);
+    shots[k] += whole;
+    assigned += whole;
+    remainders.push_back({share - whole, k});
+  }
+  std::sort(remainders.begin(), remainders.end(),
+            [](const std::pair<double, int> &a,
+               const std::pair<double, int> &b) { return a.first > b.first; });
+  for (int i = 0; i < free - assigned && i < n; i++) {
+    shots[remainders[i].second]++;
+  }
+  return shots;
+}
+
+} // namespace xacc
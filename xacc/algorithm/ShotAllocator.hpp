@@ -0,0 +1,64 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#ifndef XACC_ALGORITHM_SHOTALLOCATOR_HPP_
+#define XACC_ALGORITHM_SHOTALLOCATOR_HPP_
+
+#include "heterogeneous.hpp"
+
+#include <vector>
+
+namespace xacc {
+
+// The ShotAllocator splits a total shot budget across the circuits
+// measured for one estimate sum_k E_k. The variance of the estimate,
+// sum_k sigma_k^2 / n_k, is minimized for a fixed budget by
+// n_k proportional to sigma_k, where sigma_k is the single shot
+// standard deviation of E_k (|c_k| sqrt(1 - <P_k>^2) for a term c_k P_k).
+//
+// It is configured with
+//
+//   shot-budget     - total shots per estimate, allocation is off without it
+//   shot-allocation - uniform, weighted (by the a priori bound, e.g. |c_k|)
+//                     or variance (the default, re-estimating sigma_k from
+//                     previous measurements)
+//   min-shots       - the fewest shots any circuit gets (default 10)
+class ShotAllocator {
+public:
+  ShotAllocator() = default;
+  ShotAllocator(const HeterogeneousMap &options);
+
+  bool enabled() const { return budget > 0; }
+  const std::string strategy() const { return allocation; }
+  std::size_t size() const { return sigmas.size(); }
+
+  // Start over with these upper bounds of each circuit's sigma,
+  // used until a circuit has been measured
+  void setBounds(const std::vector<double> &bounds);
+
+  // Record the sigma measured for circuit k, ignored if negative
+  // (not known, e.g. the accelerator returned no counts)
+  void update(const std::size_t k, const double sigma);
+
+  // Shots for each circuit, summing to the budget
+  std::vector<int> allocate() const;
+
+protected:
+  int budget = 0;
+  int minShots = 10;
+  std::string allocation = "variance";
+  std::vector<double> bounds;
+  std::vector<double> sigmas;
+};
+
+} // namespace xacc
+#endif
@@ -0,0 +1,102 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include <gtest/gtest.h>
+
+#include "AlgorithmHistory.hpp"
+using namespace xacc;
+
+namespace {
+// Record n iterations of two children each, with parameters {i, -i}
+void run(AlgorithmHistory &history, std::shared_ptr<AcceleratorBuffer> buffer,
+         const int n) {
+  for (int i = 0; i < n; i++) {
+    std::vector<AcceleratorBufferChildPair> children;
+    for (auto term : {"Z0", "Z1"}) {
+      auto child = std::make_shared<AcceleratorBuffer>(term, 2);
+      child->addExtraInfo("iteration", i);
+      children.push_back({term, child});
+    }
+    history.record(buffer, children, {(double)i, -(double)i}, 10.0 * i,
+                   {"Z0", "Z1"}, {0.5 * i, -0.5 * i});
+  }
+  history.flush(buffer);
+}
+} // namespace
+
+TEST(AlgorithmHistoryTester, checkFull) {
+  AlgorithmHistory history;
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  run(history, buffer, 5);
+  EXPECT_EQ("full", history.mode());
+  EXPECT_EQ(10, buffer->nChildren());
+  EXPECT_EQ(5, buffer->getChildren("Z0").size());
+  EXPECT_FALSE(buffer->hasExtraInfoKey("history-energy"));
+}
+
+TEST(AlgorithmHistoryTester, checkNone) {
+  HeterogeneousMap options{std::make_pair("history", "none")};
+  AlgorithmHistory history(options);
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  run(history, buffer, 5);
+  EXPECT_EQ(0, buffer->nChildren());
+  EXPECT_TRUE(buffer->listExtraInfoKeys().empty());
+}
+
+TEST(AlgorithmHistoryTester, checkRing) {
+  HeterogeneousMap options{std::make_pair("history", "ring"),
+                           std::make_pair("history-size", 3)};
+  AlgorithmHistory history(options);
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  buffer->appendChild("existing", std::make_shared<AcceleratorBuffer>(2));
+  run(history, buffer, 7);
+
+  auto children = buffer->getChildren();
+  EXPECT_EQ(7, children.size());
+  EXPECT_EQ("existing", buffer->getChildrenNames()[0]);
+  for (int i = 1; i < children.size(); i++) {
+    EXPECT_EQ(4 + (i - 1) / 2,
+              children[i]->getInformation("iteration").as<int>());
+  }
+}
+
+TEST(AlgorithmHistoryTester, checkSummary) {
+  HeterogeneousMap options{std::make_pair("history", "summary")};
+  AlgorithmHistory history(options, "energy");
+  auto buffer = std::make_shared<AcceleratorBuffer>("q", 2);
+  run(history, buffer, 3);
+  // A second run appends to the same arrays
+  run(history, buffer, 1);
+
+  EXPECT_EQ(0, buffer->nChildren());
+  auto energies =
+      buffer->getInformation("history-energy").as<std::vector<double>>();
+  EXPECT_EQ(std::vector<double>({0.0, 10.0, 20.0, 0.0}), energies);
+  auto params =
+      buffer->getInformation("history-parameters").as<std::vector<double>>();
+  EXPECT_EQ(8, params.size());
+  EXPECT_EQ(2.0, params[4]);
+  EXPECT_EQ(-2.0, params[5]);
+  auto terms =
+      buffer->getInformation("history-terms").as<std::vector<std::string>>();
+  EXPECT_EQ(std::vector<std::string>({"Z0", "Z1"}), terms);
+  auto expvals = buffer->getInformation("history-term-exp-val-z")
+                     .as<std::vector<double>>();
+  EXPECT_EQ(8, expvals.size());
+  EXPECT_EQ(0.5, expvals[2]);
+  EXPECT_EQ(-0.5, expvals[3]);
+}
+
+int main(int argc, char **argv) {
+  ::testing::InitGoogleTest(&argc, argv);
+  return RUN_ALL_TESTS();
+}
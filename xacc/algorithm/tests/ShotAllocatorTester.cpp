@@ -0,0 +1,77 @@
+/*******************************************************************************
+ * Copyright (c) 2019 UT-Battelle, LLC.
+ * All rights reserved. This program and the accompanying materials
+ * are made available under the terms of the Eclipse Public License v1.0
+ * and Eclipse Distribution License v1.0 which accompanies this
+ * distribution. The Eclipse Public License is available at
+ * http://www.eclipse.org/legal/epl-v10.html and the Eclipse Distribution
+ *License is available at https://eclipse.org/org/documents/edl-v10.php
+ *
+ * Contributors:
+ *   Alexander J. McCaskey - initial API and implementation
+ *******************************************************************************/
+#include <gtest/gtest.h>
+
+#include "ShotAllocator.hpp"
+#include <numeric>
+using namespace xacc;
+
+TEST(ShotAllocatorTester, checkDisabled) {
+  ShotAllocator allocator;
+  EXPECT_FALSE(allocator.enabled());
+}
+
+TEST(ShotAllocatorTester, checkUniform) {
+  HeterogeneousMap options{std::make_pair("shot-budget", 1000),
+                           std::make_pair("shot-allocation", "uniform")};
+  ShotAllocator allocator(options);
+  allocator.setBounds({0.1, 1.0, 0.5});
+  auto shots = allocator.allocate();
+  EXPECT_EQ(1000, std::accumulate(shots.begin(), shots.end(), 0));
+  for (auto n : shots) {
+    EXPECT_TRUE(n == 333 || n == 334);
+  }
+}
+
+TEST(ShotAllocatorTester, checkWeighted) {
+  HeterogeneousMap options{std::make_pair("shot-budget", 1030),
+                           std::make_pair("shot-allocation", "weighted")};
+  ShotAllocator allocator(options);
+  allocator.setBounds({1.0, 3.0, 0.0});
+  auto shots = allocator.allocate();
+  // 10 each, the remaining 1000 split 1:3
+  EXPECT_EQ(std::vector<int>({260, 760, 10}), shots);
+}
+
+TEST(ShotAllocatorTester, checkVariance) {
+  HeterogeneousMap options{std::make_pair("shot-budget", 2020),
+                           std::make_pair("min-shots", 10)};
+  ShotAllocator allocator(options);
+  EXPECT_EQ("variance", allocator.strategy());
+  allocator.setBounds({1.0, 1.0});
+  EXPECT_EQ(std::vector<int>({1010, 1010}), allocator.allocate());
+
+  // The second circuit turns out to be nearly deterministic
+  for (int i = 0; i < 20; i++) {
+    allocator.update(0, 1.0);
+    allocator.update(1, 0.0);
+  }
+  auto shots = allocator.allocate();
+  EXPECT_EQ(2020, shots[0] + shots[1]);
+  EXPECT_TRUE(shots[0] > 2000);
+  EXPECT_TRUE(shots[1] >= 10);
+
+  // Unknown deviations keep the previous estimates
+  allocator.update(1, -1.0);
+  EXPECT_EQ(shots, allocator.allocate());
+
+  // Measured deviations never exceed the bound
+  allocator.update(1, 100.0);
+  shots = allocator.allocate();
+  EXPECT_TRUE(shots[0] > shots[1]);
+}
+
+int main(int argc, char **argv) {
+  ::testing::InitGoogleTest(&argc, argv);
+  return RUN_ALL_TESTS();
+}
@@ -68,6 +68,20 @@ using InstPtr = std::shared_ptr<Instruction>;
 // but we map that term to a set of measurement instructions. Therefore,
 // we also expose a coefficient complex value on the CompositeInstruction.
 
+// A BoundCompositeInstruction is the result of binding a parameterized
+// CompositeInstruction once for repeated evaluation. Flattening the tree
+// and analyzing the variable parameters happens at bind time, so
+// operator()() only overwrites the dependent parameter values in place.
+// The returned CompositeInstruction is owned by the binding and is
+// updated by every subsequent call.
+class CompositeInstruction;
+class BoundCompositeInstruction {
+public:
+  virtual std::shared_ptr<CompositeInstruction>
+  operator()(const std::vector<double> &params) = 0;
+  virtual ~BoundCompositeInstruction() {}
+};
+
 class CompositeInstruction : public Instruction, public Persistable {
 public:
 
@@ -123,6 +137,19 @@ public:
   virtual std::shared_ptr<CompositeInstruction>
   operator()(const std::vector<double> &params) = 0;
 
+  // Bind this CompositeInstruction for repeated evaluation. Returns
+  // nullptr if not supported, in which case clients should use operator()().
+  virtual std::shared_ptr<BoundCompositeInstruction> bind() { return nullptr; }
+
+  // Evaluate like operator()(), reusing a binding cached on this
+  // CompositeInstruction where supported. Like a binding, it may then
+  // return the same CompositeInstruction on every call, updated in place,
+  // so a result is only valid until the next call.
+  virtual std::shared_ptr<CompositeInstruction>
+  evaluateCached(const std::vector<double> &params) {
+    return operator()(params);
+  }
+
   virtual const std::string accelerator_signature() = 0;
   virtual void set_accelerator_signature(const std::string signature) = 0;
 
@@ -13,16 +13,63 @@
 #ifndef XACC_IR_OBSERVABLE_HPP_
 #define XACC_IR_OBSERVABLE_HPP_
 #include "CompositeInstruction.hpp"
+#include "InstructionIterator.hpp"
 #include "Utils.hpp"
 
+#include <atomic>
+#include <cstdint>
+
 namespace xacc {
 
+// ObservedGroups describes an Observable measured with a set of shared
+// measurement circuits. Term i has name termNames[i] and coefficient
+// coefficients[i], and is measured by groups[termToGroup[i]]. Its
+// expectation value is the Z parity of the measured bits on
+// termQubits[i]. Identity terms have termToGroup[i] == -1.
+struct ObservedGroups {
+  std::vector<std::shared_ptr<CompositeInstruction>> groups;
+  std::vector<std::string> termNames;
+  std::vector<std::complex<double>> coefficients;
+  std::vector<int> termToGroup;
+  std::vector<std::vector<std::size_t>> termQubits;
+};
+
 class Observable : public Identifiable {
 public:
 
   virtual std::vector<std::shared_ptr<CompositeInstruction>>
   observe(std::shared_ptr<CompositeInstruction> CompositeInstruction) = 0;
 
+  // Observe with terms sharing measurement circuits where possible.
+  // The default gives every term its own circuit, subclasses may
+  // partition terms into commuting groups.
+  virtual ObservedGroups
+  observeGrouped(std::shared_ptr<CompositeInstruction> function) {
+    ObservedGroups observed;
+    for (auto &f : observe(function)) {
+      std::vector<std::size_t> qubits;
+      InstructionIterator it(f);
+      while (it.hasNext()) {
+        auto inst = it.next();
+        if (!inst->isComposite() && inst->name() == "Measure") {
+          qubits.push_back(inst->bits()[0]);
+        }
+      }
+      std::sort(qubits.begin(), qubits.end());
+
+      observed.termNames.push_back(f->name());
+      observed.coefficients.push_back(f->getCoefficient());
+      observed.termQubits.push_back(qubits);
+      if (qubits.empty()) {
+        observed.termToGroup.push_back(-1);
+      } else {
+        observed.termToGroup.push_back(observed.groups.size());
+        observed.groups.push_back(f);
+      }
+    }
+    return observed;
+  }
+
   virtual const std::string toString() = 0;
   virtual void fromString(const std::string str) = 0;
   virtual const int nBits() = 0;
@@ -31,6 +78,20 @@ public:
       return;
   }
   virtual void fromOptions(const HeterogeneousMap& options) = 0;
+
+  // Identifies the current value of this Observable. Subclasses that
+  // track modifications return a value that changes whenever the
+  // Observable (or what observe() produces from it) changes, so that
+  // clients can cheaply tell whether derived data is stale.
+  // Returns 0 if modifications are not tracked.
+  virtual std::uint64_t version() { return 0; }
+
+protected:
+  // A value for version() that no other state has had
+  static std::uint64_t nextVersion() {
+    static std::atomic<std::uint64_t> counter(0);
+    return ++counter;
+  }
 };
 
 } // namespace xacc
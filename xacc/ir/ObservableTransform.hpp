@@ -19,6 +19,13 @@ class ObservableTransform : public Identifiable {
 public:
   virtual std::shared_ptr<Observable>
   transform(std::shared_ptr<Observable> obs) = 0;
+
+  // Transform with options, e.g. the number of modes (n_qubits)
+  // for encodings that depend on it
+  virtual std::shared_ptr<Observable>
+  transform(std::shared_ptr<Observable> obs, const HeterogeneousMap &options) {
+    return transform(obs);
+  }
 };
 
 } // namespace xacc
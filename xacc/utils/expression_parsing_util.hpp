@@ -13,12 +13,27 @@
 #ifndef XACC_EXPR_PARSING_HPP_
 #define XACC_EXPR_PARSING_HPP_
 
+#include <memory>
 #include <string>
 #include <vector>
 
 #include "Identifiable.hpp"
 
 namespace xacc {
+
+// A set of expressions compiled once against a fixed list of
+// variables. Variable values are bound with setValues(), after
+// which each compiled expression can be evaluated without re-parsing.
+class CompiledExpressions {
+public:
+  // Compile the expression, returning a handle for evaluate(),
+  // or -1 if the expression is not valid for these variables.
+  virtual int compile(const std::string expr) = 0;
+  virtual void setValues(const std::vector<double> &variableValues) = 0;
+  virtual double evaluate(const int handle) = 0;
+  virtual ~CompiledExpressions() {}
+};
+
 class ExpressionParsingUtil : public Identifiable {
 public:
   virtual bool validExpression(const std::string expr,
@@ -28,6 +43,13 @@ public:
                         const std::vector<std::string> variables,
                         const std::vector<double> variableValues,
                         double &ref) = 0;
+
+  // Return a compiled expression set for the given variables,
+  // or nullptr if this implementation does not support it.
+  virtual std::shared_ptr<CompiledExpressions>
+  compile(const std::vector<std::string> variables) {
+    return nullptr;
+  }
 };
 } // namespace xacc
 #endif
\ No newline at end of file
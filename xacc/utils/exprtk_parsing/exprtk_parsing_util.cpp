@@ -13,12 +13,53 @@
 #include "exprtk_parsing_util.hpp"
 
 #include "exprtk.hpp"
+#include <algorithm>
 using symbol_table_t = exprtk::symbol_table<double>;
 using expression_t = exprtk::expression<double>;
 using parser_t = exprtk::parser<double>;
 
 namespace xacc {
 
+// All expressions share one symbol table whose variables
+// reference values, so binding new values is a single copy.
+class ExprtkCompiledExpressions : public CompiledExpressions {
+protected:
+  std::vector<double> values;
+  symbol_table_t symbol_table;
+  std::vector<expression_t> expressions;
+  parser_t parser;
+
+public:
+  ExprtkCompiledExpressions(const std::vector<std::string> &variables)
+      : values(variables.size()) {
+    symbol_table.add_constants();
+    for (int i = 0; i < variables.size(); i++) {
+      symbol_table.add_variable(variables[i], values[i]);
+    }
+  }
+
+  int compile(const std::string exprStr) override {
+    expression_t expr;
+    expr.register_symbol_table(symbol_table);
+    if (!parser.compile(exprStr, expr)) {
+      return -1;
+    }
+    expressions.push_back(expr);
+    return expressions.size() - 1;
+  }
+
+  void setValues(const std::vector<double> &variableValues) override {
+    std::copy(variableValues.begin(),
+              variableValues.begin() +
+                  std::min(variableValues.size(), values.size()),
+              values.begin());
+  }
+
+  double evaluate(const int handle) override {
+    return expressions[handle].value();
+  }
+};
+
 bool ExprtkExpressionParsingUtil::validExpression(
     const std::string exprStr, const std::vector<std::string> variables) {
 
@@ -83,4 +124,9 @@ bool ExprtkExpressionParsingUtil::evaluate(
   return false;
 }
 
+std::shared_ptr<CompiledExpressions>
+ExprtkExpressionParsingUtil::compile(const std::vector<std::string> variables) {
+  return std::make_shared<ExprtkCompiledExpressions>(variables);
+}
+
 } // namespace xacc
\ No newline at end of file
@@ -25,6 +25,8 @@ public:
   bool evaluate(const std::string expr,
                 const std::vector<std::string> variables,
                 const std::vector<double> variableValues, double &ref) override;
+  std::shared_ptr<CompiledExpressions>
+  compile(const std::vector<std::string> variables) override;
   const std::string name() const override { return "exprtk"; }
   const std::string description() const override { return ""; }
 };